@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Construction benchmark: objects/second and bytes/object for the data
+classes built from parser-produced values, with full validation
+compared with trusted construction, plus the end-to-end load time of
+the examples in both modes.
+
+usage: python bench/construct.py
+"""
+
+import contextlib
+import io
+import logging
+import pathlib
+import sys
+import time
+import timeit
+import tracemalloc
+import typing
+
+import bwyd
+from bwyd.construct import trusted_construct
+from bwyd.dsl import PARSERS
+from bwyd.location import LineIndex, SourceLocation
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+N_OBJECTS: int = 100000
+
+
+def measure (
+    build: typing.Callable,
+    ) -> typing.Tuple[ float, float ]:
+    """
+Measure the throughput in objects/second and the retained size in
+bytes/object for one way of building a data class.
+    """
+    elapsed: float = min(timeit.repeat(build, number = N_OBJECTS, repeat = 5))
+
+    tracemalloc.start()
+    kept: list = [ build() for _ in range(N_OBJECTS) ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # leave out the list itself
+    size -= sys.getsizeof(kept)
+
+    return N_OBJECTS / elapsed, size / N_OBJECTS
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+
+    loc: SourceLocation = SourceLocation(LineIndex(""), 0, 0)
+    dep: bwyd.Dependency = bwyd.Dependency(loc = loc, symbol = "pot", text = "a large pot")
+    dur: bwyd.Duration = bwyd.Duration(amount = 20.0, units = "minute")
+    meas: bwyd.Measure = bwyd.Measure(amount = 250.0, units = "gram")
+
+    cases: typing.List[ typing.Tuple[ typing.Type, dict ] ] = [
+        ( bwyd.Measure, { "amount": 250.0, "units": "gram", }, ),
+        ( bwyd.Duration, { "amount": 20.0, "units": "minute", }, ),
+        ( bwyd.Dependency, { "loc": loc, "symbol": "pot", "text": "a large pot", }, ),
+        ( bwyd.OpAdd, { "loc": loc, "symbol": "salt", "measure": meas, "text": "", "entity": dep, }, ),
+        ( bwyd.OpAction, { "loc": loc, "tool": dep, "modifier": "stir", "until": "done", "duration": dur, }, ),  # pylint: disable=C0301
+    ]
+
+    print(f"{'class':>12} {'validated obj/s':>16} {'trusted obj/s':>14} {'validated B/obj':>16} {'trusted B/obj':>14}")  # pylint: disable=C0301
+
+    for cls, fields in cases:
+        val_rate, val_size = measure(lambda: cls(**fields))  # pylint: disable=W0640
+        tru_rate, tru_size = measure(lambda: trusted_construct(cls, dict(fields)))  # pylint: disable=W0640
+
+        print(f"{cls.__name__:>12} {val_rate:16,.0f} {tru_rate:14,.0f} {val_size:16.0f} {tru_size:14.0f}")  # pylint: disable=C0301
+
+    # end-to-end load of the examples, with each parser
+    paths: typing.List[ pathlib.Path ] = sorted(EXAMPLES_DIR.glob("*.bwyd")) * 10
+
+    for parser in PARSERS:
+        dsl: bwyd.Bwyd = bwyd.Bwyd(parser = parser)
+
+        for trusted in [ False, True ]:
+            timings: typing.List[ float ] = []
+
+            # validation reports unused tools on stdout
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(3):
+                    start: float = time.process_time()
+
+                    for bwyd_path in paths:
+                        dsl.load(bwyd_path, trusted = trusted)
+
+                    timings.append(time.process_time() - start)
+
+            print(f"load {len(paths)} modules, parser={parser}, trusted={trusted}: {min(timings) * 1000.0:.1f} ms")  # pylint: disable=C0301
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Conversion benchmark: humanizing the imperial conversions of many
+measures one at a time, compared with the batch API, with and without
+NumPy.
+
+usage: python bench/convert.py [n_copies]
+"""
+
+import logging
+import sys
+import time
+import typing
+
+import bwyd
+from bwyd import batch
+
+
+def best_of (
+    func: typing.Callable,
+    repeat: int = 3,
+    ) -> float:
+    """
+Best CPU time of several runs, in milliseconds.
+    """
+    timings: typing.List[ float ] = []
+
+    for _ in range(repeat):
+        start: float = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+
+    return min(timings) * 1000.0
+
+
+if __name__ == "__main__":
+    n_copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    logging.disable(logging.CRITICAL)
+
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    symbols: typing.List[ str ] = sorted(dsl.converter) * n_copies
+    units: typing.List[ typing.Optional[ str ] ] = [ "g", "ml", "kg", "l", ] * (len(symbols) // 4 + 1)
+    amounts: typing.List[ float ] = [ float(i % 1000) / 4.0 for i in range(len(symbols)) ]
+    units = units[:len(symbols)]
+
+    print(f"measures: {len(amounts)}")
+
+    print(f"{'per measure':>16}: {best_of(lambda: [ bwyd.Measure(amount = a, units = u).humanize_convert(s, True, dsl.converter) for a, u, s in zip(amounts, units, symbols) ]):10.1f} ms")  # pylint: disable=C0301
+    print(f"{'batch, numpy':>16}: {best_of(lambda: batch.humanize_convert_batch(amounts, units, symbols, dsl.converter)):10.1f} ms")  # pylint: disable=C0301
+
+    batch.np = None
+    print(f"{'batch, no numpy':>16}: {best_of(lambda: batch.humanize_convert_batch(amounts, units, symbols, dsl.converter)):10.1f} ms")  # pylint: disable=C0301
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON export benchmark: serializing the page models of a corpus through
+Python dictionaries and `json.dumps`, compared with serializing the
+typed output models straight to bytes.
+
+usage: python bench/export.py [n_copies]
+"""
+
+import contextlib
+import io
+import json
+import logging
+import pathlib
+import sys
+import time
+import typing
+
+import bwyd
+from bwyd.output import PAGE_LIST_ADAPTER
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def best_of (
+    func: typing.Callable,
+    repeat: int = 10,
+    ) -> float:
+    """
+Best CPU time of several runs, in milliseconds.
+    """
+    func()
+    timings: typing.List[ float ] = []
+
+    for _ in range(repeat):
+        start: float = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+
+    return min(timings) * 1000.0
+
+
+if __name__ == "__main__":
+    n_copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    logging.disable(logging.CRITICAL)
+
+    dsl: bwyd.Bwyd = bwyd.Bwyd(parser = "fast")
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    # validation reports unused tools on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        modules: typing.List[ bwyd.Module ] = [
+            dsl.load(bwyd_path)
+            for bwyd_path in sorted(EXAMPLES_DIR.glob("*.bwyd"))
+        ] * n_copies
+
+    pages: list = [ module.get_page_model() for module in modules ]
+    print(f"corpus: {len(modules)} modules")
+
+    print(f"{'dict + json.dumps':>24}: {best_of(lambda: json.dumps([ m.get_model() for m in modules ]).encode()):8.1f} ms")  # pylint: disable=C0301
+    print(f"{'export_json':>24}: {best_of(lambda: corpus.export_json(modules)):8.1f} ms")
+    print(f"{'encode only, dicts':>24}: {best_of(lambda: json.dumps([ p.model_dump() for p in pages ]).encode()):8.1f} ms")  # pylint: disable=C0301
+    print(f"{'encode only, typed':>24}: {best_of(lambda: PAGE_LIST_ADAPTER.dump_json(pages)):8.1f} ms")  # pylint: disable=C0301
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Humanization benchmark: the imperial conversions and durations which
+get humanized while rendering, plus the end-to-end rendering of the
+examples as a large corpus.
+
+usage: python bench/humanize.py [n_copies]
+"""
+
+import contextlib
+import io
+import logging
+import pathlib
+import sys
+import time
+import typing
+
+import bwyd
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def best_of (
+    func: typing.Callable,
+    repeat: int = 5,
+    ) -> float:
+    """
+Best CPU time of several runs, in milliseconds.
+    """
+    timings: typing.List[ float ] = []
+
+    for _ in range(repeat):
+        start: float = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+
+    return min(timings) * 1000.0
+
+
+if __name__ == "__main__":
+    n_copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    logging.disable(logging.CRITICAL)
+
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    measures: typing.List[ typing.Tuple[ bwyd.Measure, str ] ] = [
+        ( bwyd.Measure(amount = float(i), units = units), symbol, )
+        for i in range(1, 500)
+        for units, symbol in [ ( "g", "sugar", ), ( "g", "flour", ), ( "ml", "milk", ), ( "kg", "potato", ), ]
+    ]
+
+    durations: typing.List[ bwyd.Duration ] = [
+        bwyd.Duration(amount = float(i), units = units)
+        for i in range(1, 500)
+        for units in [ "second", "minute", "hour", ]
+    ]
+
+    # validation reports unused tools on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        modules: typing.List[ bwyd.Module ] = [
+            dsl.load(bwyd_path)
+            for bwyd_path in sorted(EXAMPLES_DIR.glob("*.bwyd"))
+        ] * n_copies
+
+    # warm up the lazy imports
+    modules[0].render_template()
+
+    print(f"{'humanize_convert x' + str(len(measures)):>24}: {best_of(lambda: [ m.humanize_convert(s, True, dsl.converter) for m, s in measures ]):8.1f} ms")  # pylint: disable=C0301
+    print(f"{'Duration.humanize x' + str(len(durations)):>24}: {best_of(lambda: [ d.humanize() for d in durations ]):8.1f} ms")  # pylint: disable=C0301
+    print(f"{'render x' + str(len(modules)):>24}: {best_of(lambda: [ m.render_template() for m in modules ], repeat = 3):8.1f} ms")  # pylint: disable=C0301
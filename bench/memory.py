@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory benchmark: peak RSS while holding a large synthetic corpus of
+parsed modules, with and without releasing their parse trees.
+
+usage: python bench/memory.py [n_copies]
+"""
+
+import pathlib
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import bwyd
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def stage_corpus (
+    dir_path: pathlib.Path,
+    n_copies: int,
+    ) -> int:
+    """
+Replicate the examples into a synthetic corpus.
+    """
+    count: int = 0
+
+    for i in range(n_copies):
+        for bwyd_path in EXAMPLES_DIR.glob("*.bwyd"):
+            shutil.copyfile(bwyd_path, dir_path / f"{bwyd_path.stem}_{i:04d}.bwyd")
+            count += 1
+
+    return count
+
+
+def measure (
+    dir_path: pathlib.Path,
+    release_parse_tree: bool,
+    ) -> None:
+    """
+Parse and hold the whole corpus, like `full.py` does for the discovery
+index, then report the peak RSS in MB.
+    """
+    corpus: bwyd.Corpus = bwyd.Bwyd().build_corpus()
+
+    modules: list = list(corpus.parse_modules(
+        dir_path,
+        release_parse_tree = release_parse_tree,
+    ))
+
+    peak_mb: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print(f"{len(modules)} {peak_mb:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(pathlib.Path(sys.argv[2]), sys.argv[3] == "release")
+        sys.exit(0)
+
+    n_copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        n_modules: int = stage_corpus(pathlib.Path(tmp_dir), n_copies)
+        print(f"corpus: {n_modules} modules")
+
+        # each variant runs in a fresh process, so peak RSS stays separate
+        for mode in [ "keep", "release" ]:
+            result: subprocess.CompletedProcess = subprocess.run(
+                [ sys.executable, __file__, "--measure", tmp_dir, mode ],
+                capture_output = True,
+                check = True,
+                text = True,
+            )
+
+            _, peak_mb = result.stdout.strip().splitlines()[-1].split()
+            print(f"{mode:>8} parse trees: peak RSS {peak_mb} MB")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Rendering pipeline benchmark: pages per second when rendering a copy
+of the examples as a larger corpus, serially and through the thread
+pool pipeline, then through a warm render cache, plus a check that
+all of them write the same bytes.
+
+usage: python bench/render.py [n_copies] [workers]
+"""
+
+import contextlib
+import hashlib
+import io
+import logging
+import pathlib
+import shutil
+import sys
+import tempfile
+import typing
+
+import bwyd
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def render_digest (
+    corpus: bwyd.Corpus,
+    dir_path: pathlib.Path,
+    workers: int,
+    *,
+    cache: typing.Optional[ bwyd.ModuleCache ] = None,
+    render_cache: typing.Optional[ bwyd.RenderCache ] = None,
+    repeat: int = 3,
+    ) -> typing.Tuple[ float, str ]:
+    """
+Best throughput of several runs, in pages per second, plus a digest of
+all the pages written.
+    """
+    rates: typing.List[ float ] = []
+
+    for _ in range(repeat):
+        for html_path in dir_path.glob("*.html"):
+            html_path.unlink()
+
+        report: bwyd.RenderReport = corpus.render_pages(
+            dir_path,
+            cache = cache,
+            render_cache = render_cache,
+            workers = workers,
+        )
+
+        rates.append(report.pages_per_sec())
+
+    digest = hashlib.sha256()
+
+    for html_path in sorted(dir_path.glob("*.html")):
+        digest.update(html_path.read_bytes())
+
+    return max(rates), digest.hexdigest()
+
+
+if __name__ == "__main__":
+    n_copies: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_workers: int = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    logging.disable(logging.CRITICAL)
+
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir)
+
+        for i in range(n_copies):
+            for bwyd_path in EXAMPLES_DIR.glob("*.bwyd"):
+                shutil.copyfile(bwyd_path, src_dir / f"{bwyd_path.stem}_{i}.bwyd")
+
+        cache: bwyd.ModuleCache = bwyd.ModuleCache(src_dir / ".cache")
+        render_cache: bwyd.RenderCache = bwyd.RenderCache(src_dir / ".pages")
+
+        # validation reports unused tools on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            # warm up the module cache, so that parsing stays cheap
+            corpus.render_pages(src_dir, cache = cache, workers = 1)
+
+            results: typing.Dict[ str, typing.Tuple[ float, str ] ] = {
+                f"workers {workers}": render_digest(corpus, src_dir, workers, cache = cache)
+                for workers in [ 1, n_workers ]
+            }
+
+            # warm up the render cache
+            corpus.render_pages(src_dir, cache = cache, render_cache = render_cache, workers = 1)
+            results["render cache"] = render_digest(corpus, src_dir, 1, cache = cache, render_cache = render_cache)
+
+    for name, ( rate, hexdigest, ) in results.items():
+        print(f"{name:>14}: {rate:8.1f} pages/sec  {hexdigest[:16]}")
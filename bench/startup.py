@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup benchmark: wall-clock time for `from bwyd import Bwyd` in a
+fresh interpreter, then for that plus loading one module, which is
+what users pay before any work gets done.
+
+usage: python bench/startup.py [repeat]
+"""
+
+import json
+import pathlib
+import subprocess
+import sys
+import typing
+
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+PROBE: str = """
+import contextlib, io, json, pathlib, time
+
+start = time.perf_counter()
+from bwyd import Bwyd
+import_elapsed = time.perf_counter() - start
+
+# validation reports unused tools on stdout
+with contextlib.redirect_stdout(io.StringIO()):
+    Bwyd().load(pathlib.Path({path!r}))
+
+load_elapsed = time.perf_counter() - start
+
+print(json.dumps([ import_elapsed, load_elapsed ]))
+"""
+
+
+def run_probe (
+    ) -> typing.List[ float ]:
+    """
+Import the package and load one module in a fresh interpreter, with a
+`LICENSE` so that its validation gets timed too.
+    """
+    code: str = PROBE.format(
+        path = str(EXAMPLES_DIR / "applesauce_muffins.bwyd"),
+    )
+
+    result: subprocess.CompletedProcess = subprocess.run(
+        [ sys.executable, "-c", code ],
+        capture_output = True,
+        check = True,
+        text = True,
+    )
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    repeat: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    probes: typing.List[ typing.List[ float ] ] = [ run_probe() for _ in range(repeat) ]
+
+    print(f"{'import':>14}: {min(probe[0] for probe in probes) * 1000.0:8.1f} ms")
+    print(f"{'import + load':>14}: {min(probe[1] for probe in probes) * 1000.0:8.1f} ms")
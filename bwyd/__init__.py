@@ -4,28 +4,115 @@
 """
 Package definitions for the Bwyd DSL.
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
+
+The public names get imported lazily on first access, so that
+`import bwyd` stays cheap for CLI jobs and the Jupyter kernel.
 """
 
-from .dsl import Bwyd, Corpus, Graph
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .assets import StaticAssets
+
+    from .cache import ModuleCache, RenderCache
+
+    from .compress import Precompressor
+
+    from .dsl import Bwyd, Corpus
+
+    from .error import BwydParserError
+
+    from .graph import Graph
+
+    from .kernel import BwydKernel
+
+    from .manifest import BuildManifest, BuildReport, ManifestEntry, RenderReport
+
+    from .measure import Conversion, Converter, Humanized, \
+        MeasureUnits, Measure, \
+        DurationUnits, Duration, \
+        Temperature
+
+    from .module import Module, ModuleAggregates
+
+    from .ops import Dependency, DependencyDict, Appliance, \
+        OpsTypes, OpNote, OpTransfer, OpAdd, OpAction, OpWait, OpStore, OpHeat, OpChill, OpBake
+
+    from .output import PageModel, SchemaOrgRecipe
+
+    from .resources import BWYD_NAMESPACE, BWYD_SVG, \
+        CONVERT_PATH, GRAMMAR_PATH, ICON_PATH, STYLESHEET_PATH, \
+        JINJA_PAGE_TEMPLATE, JINJA_INDEX_TEMPLATE, \
+        URL_PATTERN
+
+    from .structure import Post, Product, \
+        Activity, Focus, Closure
+
+
+_LAZY_IMPORTS: typing.Dict[ str, typing.List[ str ] ] = {
+    ".assets": [ "StaticAssets" ],
+    ".cache": [ "ModuleCache", "RenderCache" ],
+    ".compress": [ "Precompressor" ],
+    ".dsl": [ "Bwyd", "Corpus" ],
+    ".error": [ "BwydParserError" ],
+    ".graph": [ "Graph" ],
+    ".kernel": [ "BwydKernel" ],
+    ".manifest": [ "BuildManifest", "BuildReport", "ManifestEntry", "RenderReport" ],
+    ".measure": [
+        "Conversion", "Converter", "Humanized",
+        "MeasureUnits", "Measure",
+        "DurationUnits", "Duration",
+        "Temperature",
+    ],
+    ".module": [ "Module", "ModuleAggregates" ],
+    ".ops": [
+        "Dependency", "DependencyDict", "Appliance",
+        "OpsTypes", "OpNote", "OpTransfer", "OpAdd", "OpAction", "OpWait", "OpStore", "OpHeat", "OpChill", "OpBake",  # pylint: disable=C0301
+    ],
+    ".output": [ "PageModel", "SchemaOrgRecipe" ],
+    ".resources": [
+        "BWYD_NAMESPACE", "BWYD_SVG",
+        "CONVERT_PATH", "GRAMMAR_PATH", "ICON_PATH", "STYLESHEET_PATH",
+        "JINJA_PAGE_TEMPLATE", "JINJA_INDEX_TEMPLATE",
+        "URL_PATTERN",
+    ],
+    ".structure": [
+        "Post", "Product",
+        "Activity", "Focus", "Closure",
+    ],
+}
+
+_NAME_TO_MODULE: typing.Dict[ str, str ] = {
+    name: mod_name
+    for mod_name, names in _LAZY_IMPORTS.items()
+    for name in names
+}
+
+__all__ = list(_NAME_TO_MODULE.keys())
 
-from .error import BwydParserError
 
-from .kernel import BwydKernel
+def __getattr__ (
+    name: str,
+    ) -> typing.Any:
+    """
+Import the submodule which defines a public name, on first access.
+    """
+    if name not in _NAME_TO_MODULE:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .measure import Conversion, Converter, Humanized, \
-    MeasureUnits, Measure, \
-    DurationUnits, Duration, \
-    Temperature
+    value: typing.Any = getattr(importlib.import_module(_NAME_TO_MODULE[name], __name__), name)
 
-from .module import Module
+    # the Jinja2 templates are resolved on each access, not pinned here
+    if not name.startswith("JINJA_"):
+        globals()[name] = value
 
-from .ops import Dependency, DependencyDict, Appliance, \
-    OpsTypes, OpNote, OpTransfer, OpAdd, OpAction, OpWait, OpStore, OpHeat, OpChill, OpBake
+    return value
 
-from .resources import BWYD_NAMESPACE, BWYD_SVG, \
-    CONVERT_PATH, GRAMMAR_PATH, ICON_PATH, \
-    JINJA_PAGE_TEMPLATE, JINJA_INDEX_TEMPLATE, \
-    URL_PATTERN
 
-from .structure import Post, Product, \
-    Activity, Focus, Closure
+def __dir__ (
+    ) -> typing.List[ str ]:
+    """
+List the public names, including those not imported yet.
+    """
+    return sorted([ *globals().keys(), *__all__ ])
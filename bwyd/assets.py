@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Shared static assets for rendered pages: the icon and the stylesheet
+get written once, with content-hashed file names, instead of being
+inlined into every page.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import os
+import pathlib
+import typing
+
+from pydantic import BaseModel
+
+from .manifest import bytes_digest, write_if_changed
+from .resources import ICON_PATH, STYLESHEET_PATH
+
+
+# source files of the shared assets, by name
+ASSET_SOURCES: typing.Dict[ str, pathlib.Path ] = {
+    "icon": ICON_PATH,
+    "stylesheet": STYLESHEET_PATH,
+}
+
+
+class StaticAssets (BaseModel):  # pylint: disable=R0902
+    """
+A data class locating the shared assets which pages reference.
+
+The file names include a hash of their contents, so that browsers and
+CDNs may cache them indefinitely, and any change to an asset gets a new
+URL. Without a `base_url` each page references the assets through a
+path relative to its own directory.
+    """
+    dir_path: pathlib.Path
+    files: typing.Dict[ str, str ]
+    base_url: typing.Optional[ str ] = None
+
+
+    @classmethod
+    def write (
+        cls,
+        dir_path: pathlib.Path,
+        *,
+        base_url: typing.Optional[ str ] = None,
+        ) -> "StaticAssets":
+        """
+Write the shared assets into the given directory, leaving any which
+are already there untouched.
+        """
+        dir_path.mkdir(parents = True, exist_ok = True)
+        files: typing.Dict[ str, str ] = {}
+
+        for name, src_path in ASSET_SOURCES.items():
+            data: bytes = src_path.read_bytes()
+            file_name: str = f"{src_path.stem}.{bytes_digest(data)[:16]}{src_path.suffix}"
+
+            write_if_changed(dir_path / file_name, data)
+            files[name] = file_name
+
+        return cls(
+            dir_path = dir_path,
+            files = files,
+            base_url = base_url,
+        )
+
+
+    def get_url (
+        self,
+        name: str,
+        page_dir: pathlib.Path,
+        ) -> str:
+        """
+Accessor for the URL of one asset, as referenced from a page in the
+given directory.
+        """
+        file_name: str = self.files[name]
+
+        if self.base_url is not None:
+            return self.base_url.rstrip("/") + "/" + file_name
+
+        rel_path: str = os.path.relpath(self.dir_path.resolve() / file_name, page_dir.resolve())
+        return pathlib.Path(rel_path).as_posix()
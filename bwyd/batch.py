@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batched conversion and humanization of measures, e.g., across all of
+the ingredients in a corpus, with the numeric conversion and threshold
+logic vectorized in NumPy when it is installed.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import logging
+import typing
+
+from .measure import ImperialMode, ImperialPlan, \
+    Conversion, Converter, Measure, MeasureUnits, \
+    OUNCE_PER_POUND, TSP_PER_CUP, TBSP_PER_CUP, \
+    TSP_MAX_CUPS, TBSP_MAX_CUPS, CUP_MIN_VOLUME, POUND_MIN_MASS, \
+    MIXED_MIN_AMOUNT, ONE_DIGIT_MIN_AMOUNT, \
+    UNIT_FACTORS, humanize_fraction, pluralize
+
+# NumPy is optional: without it, the plans get applied per element
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore  # pylint: disable=C0103
+
+
+######################################################################
+## per-element formats, selected by the vectorized thresholds
+
+FMT_NONE: int = 0
+FMT_FRAC: int = 1
+FMT_MIXED: int = 2
+FMT_ROUND: int = 3
+
+UNIT_CODES: typing.List[ MeasureUnits ] = list(MeasureUnits)
+_TSP: int = UNIT_CODES.index(MeasureUnits.TEASPOON)
+_TBSP: int = UNIT_CODES.index(MeasureUnits.TABLESPOON)
+_CUP: int = UNIT_CODES.index(MeasureUnits.CUP)
+_POUND: int = UNIT_CODES.index(MeasureUnits.POUND)
+_OUNCE: int = UNIT_CODES.index(MeasureUnits.OUNCE)
+
+_MODE_CODES: typing.Dict[ ImperialMode, int ] = {
+    mode: code
+    for code, mode in enumerate(ImperialMode, start = 1)
+}
+
+
+def _format_human (
+    fmt: int,
+    amount: float,
+    digits: int,
+    denom_limit: int,
+    ) -> str:
+    """
+Format one humanized amount, given the format which the thresholds
+selected.
+    """
+    if fmt == FMT_FRAC:
+        return humanize_fraction(amount, digits, denom_limit)
+
+    if fmt == FMT_ROUND:
+        return str(round(amount, 2))
+
+    # mixed number
+    return Measure.fix_fraction(amount)
+
+
+######################################################################
+## batch API
+
+class _Plans:  # pylint: disable=R0903
+    """
+Imperial plans resolved once per distinct ( units, symbol ) pair in a
+batch, which also logs each warning once rather than per element.
+    """
+
+    def __init__ (
+        self,
+        converter: typing.Optional[ Converter ],
+        ) -> None:
+        """
+Constructor.
+        """
+        self.converter: typing.Optional[ Converter ] = converter
+        self.plans: typing.Dict[ tuple, typing.Optional[ ImperialPlan ] ] = {}
+
+
+    def get (
+        self,
+        units: typing.Optional[ str ],
+        symbol: str,
+        external: bool,
+        ) -> typing.Optional[ ImperialPlan ]:
+        """
+Accessor for the plan of one element.
+        """
+        key: tuple = ( units, symbol, external, )
+
+        if key not in self.plans:
+            plan: typing.Optional[ ImperialPlan ] = None
+
+            if self.converter is not None and units is not None:
+                conv: typing.Optional[ Conversion ] = self.converter.get(symbol)
+
+                if conv is None and not external:
+                    logging.warning(f"no conversion ratio for {symbol}")  # pylint: disable=W1203
+
+                plan = Measure.imperial_plan(units, conv)
+
+            self.plans[key] = plan
+
+        return self.plans[key]
+
+
+def convert_batch (
+    amounts: typing.Sequence[ float ],
+    units: typing.Sequence[ str ],
+    to_units: str,
+    *,
+    symbols: typing.Optional[ typing.Sequence[ str ] ] = None,
+    converter: typing.Optional[ Converter ] = None,
+    ) -> typing.Sequence[ float ]:
+    """
+Convert arrays of amounts in the given `units` into `to_units`, the
+batch equivalent of `Measure.convert()`. Mass and volume convert into
+each other through the conversion of each element's symbol, if given.
+
+Returns a NumPy array if available, otherwise a list; raises
+`ValueError` if any element has incompatible units.
+    """
+    factors: typing.Dict[ tuple, typing.Tuple[ float, float ] ] = {}
+    numers: typing.List[ float ] = []
+    denoms: typing.List[ float ] = []
+
+    for i, from_units in enumerate(units):
+        symbol: typing.Optional[ str ] = symbols[i] if symbols is not None else None
+        key: tuple = ( from_units, symbol, )
+
+        if key not in factors:
+            table = UNIT_FACTORS
+
+            if symbol is not None and converter is not None and symbol in converter:
+                table = converter[symbol].get_factors()
+
+            if ( from_units, to_units, ) not in table:
+                raise ValueError(f"cannot convert `{from_units}` into `{to_units}`")
+
+            factors[key] = table[( from_units, to_units, )]
+
+        numer, denom = factors[key]
+        numers.append(numer)
+        denoms.append(denom)
+
+    if np is not None:
+        return np.asarray(amounts, dtype = float) * np.asarray(numers) / np.asarray(denoms)
+
+    return [
+        amount * numer / denom
+        for amount, numer, denom in zip(amounts, numers, denoms)
+    ]
+
+
+def humanize_convert_batch (  # pylint: disable=R0914
+    amounts: typing.Sequence[ float ],
+    units: typing.Sequence[ typing.Optional[ str ] ],
+    symbols: typing.Sequence[ str ],
+    converter: typing.Optional[ Converter ],
+    *,
+    externals: typing.Optional[ typing.Sequence[ bool ] ] = None,
+    ) -> typing.List[ str ]:
+    """
+Denormalize arrays of measures into human-readable form, with an
+imperial conversion where available: the batch equivalent of calling
+`Measure.humanize_convert()` per element, with identical results.
+
+Plans get resolved once per distinct ( units, symbol ) pair, then the
+conversion and threshold selection run as vectorized array operations
+when NumPy is installed, so that only the final strings get formatted
+per element.
+    """
+    resolver: _Plans = _Plans(converter)
+
+    plans: typing.List[ typing.Optional[ ImperialPlan ] ] = [
+        resolver.get(units[i], symbols[i], externals[i] if externals is not None else False)
+        for i in range(len(amounts))
+    ]
+
+    if np is None:
+        return [
+            _humanize_scalar(amount, units[i], plans[i])
+            for i, amount in enumerate(amounts)
+        ]
+
+    fmts, humans, unit_codes, digits, limits = _select_vector(amounts, plans)
+    results: typing.List[ str ] = []
+
+    for i, amount in enumerate(amounts):
+        text: str = Measure.humanize_amount(amount, units[i])
+        fmt: int = int(fmts[i])
+
+        if fmt != FMT_NONE:
+            human_amount: float = float(humans[i])
+            human: str = _format_human(fmt, human_amount, int(digits[i]), int(limits[i]))
+            code: int = int(unit_codes[i])
+            unit_text: str = UNIT_CODES[code].value
+
+            if human_amount > 1.0 and human != "1" and code != _TSP:
+                unit_text = pluralize(unit_text)
+
+            text = f"{text} ({human} {unit_text})"
+
+        results.append(text)
+
+    return results
+
+
+######################################################################
+## threshold selection
+
+def _humanize_scalar (
+    amount: float,
+    units: typing.Optional[ str ],
+    plan: typing.Optional[ ImperialPlan ],
+    ) -> str:
+    """
+Fallback without NumPy: humanize one element, given its plan.
+    """
+    text: str = Measure.humanize_amount(amount, units)
+
+    if plan is None:
+        return text
+
+    return text + Measure.humanize_imperial(
+        amount * plan.numerator / plan.denominator,
+        plan,
+    ).denormalize()
+
+
+def _select_vector (  # pylint: disable=R0914
+    amounts: typing.Sequence[ float ],
+    plans: typing.List[ typing.Optional[ ImperialPlan ] ],
+    ) -> tuple:
+    """
+Vectorized conversion and threshold selection, which mirrors the
+branches of `Measure.humanize_imperial()` as array operations.
+    """
+    n_rows: int = len(amounts)
+    numer = np.ones(n_rows)
+    denom = np.ones(n_rows)
+    mode = np.zeros(n_rows, dtype = np.int8)
+    plan_units = np.zeros(n_rows, dtype = np.int8)
+
+    for i, plan in enumerate(plans):
+        if plan is not None:
+            numer[i] = plan.numerator
+            denom[i] = plan.denominator
+            mode[i] = _MODE_CODES[plan.mode]
+            plan_units[i] = UNIT_CODES.index(plan.units)
+
+    imper = np.asarray(amounts, dtype = float) * numer / denom
+
+    is_cup = mode == _MODE_CODES[ImperialMode.CUP]
+    is_volume = mode == _MODE_CODES[ImperialMode.VOLUME]
+    is_mass = mode == _MODE_CODES[ImperialMode.MASS]
+    is_generic = mode == _MODE_CODES[ImperialMode.GENERIC]
+
+    # small volumes get humanized the same way as cups
+    cup_like = is_cup | (is_volume & (imper < CUP_MIN_VOLUME))
+    generic = is_generic | (is_volume & ~cup_like)
+    tsp = cup_like & (imper <= TSP_MAX_CUPS)
+    tbsp = cup_like & ~tsp & (imper <= TBSP_MAX_CUPS)
+    cup = cup_like & ~tsp & ~tbsp
+
+    pound = is_mass & (imper >= POUND_MIN_MASS)
+    ounces = imper * OUNCE_PER_POUND
+    ounce = is_mass & ~pound & (ounces > MIXED_MIN_AMOUNT)
+    ounce_round = is_mass & ~pound & ~ounce
+
+    human = np.select(
+        [ tsp, tbsp, ounce | ounce_round, ],
+        [ imper * TSP_PER_CUP, imper * TBSP_PER_CUP, ounces, ],
+        default = imper,
+    )
+
+    unit_codes = np.select(
+        [ tsp, tbsp, cup, pound, ounce | ounce_round, ],
+        [ _TSP, _TBSP, _CUP, _POUND, _OUNCE, ],
+        default = plan_units,
+    )
+
+    spoon = tsp | tbsp
+    as_generic = generic | pound | ounce
+
+    fmts = np.select(
+        [
+            spoon & (human >= MIXED_MIN_AMOUNT),
+            spoon & (human >= ONE_DIGIT_MIN_AMOUNT),
+            spoon,
+            cup & (human >= 1.0),
+            cup,
+            as_generic & (human > MIXED_MIN_AMOUNT),
+            as_generic,
+            ounce_round,
+        ],
+        [
+            FMT_MIXED, FMT_FRAC, FMT_FRAC,
+            FMT_MIXED, FMT_FRAC,
+            FMT_MIXED, FMT_FRAC,
+            FMT_ROUND,
+        ],
+        default = FMT_NONE,
+    )
+
+    digits = np.where(spoon & (human >= ONE_DIGIT_MIN_AMOUNT), 1, 2)
+    limits = np.where(spoon, 8, 4)
+
+    return fmts, human, unit_codes, digits, limits
@@ -0,0 +1,506 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Persistent cache for interpreted Bwyd modules.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import pathlib
+import pickle
+import threading
+import typing
+
+from .manifest import stat_signature
+from .measure import Converter
+from .module import MINIFY_OPTIONS, Module
+from .resources import GRAMMAR_PATH, STYLESHEET_PATH
+
+
+# bump this whenever the pickled layout of `Module` changes
+CACHE_VERSION: int = 4
+
+# bump this whenever the layout of rendered pages changes outside of
+# the templates, e.g., in `Module.render_template()`
+RENDER_CACHE_VERSION: int = 1
+
+# heavy dependencies get imported on first use, to keep startup fast
+if typing.TYPE_CHECKING:
+    import jinja2
+
+
+######################################################################
+## content hashing
+
+def file_digest (
+    path: pathlib.Path,
+    ) -> str:
+    """
+Hash the contents of one file.
+    """
+    with open(path, "rb") as fp:
+        return hashlib.file_digest(fp, "sha256").hexdigest()
+
+
+def grammar_digest (
+    ) -> str:
+    """
+Hash the Bwyd grammar, so that cached modules get invalidated
+whenever the language changes.
+    """
+    return file_digest(GRAMMAR_PATH)
+
+
+def converter_digest (
+    converter: Converter,
+    ) -> str:
+    """
+Hash the contents of a unit converter, which serves as its version.
+    """
+    digest = hashlib.sha256()
+
+    for symbol in sorted(converter.keys()):
+        digest.update(converter[symbol].model_dump_json().encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+@functools.cache
+def minifier_version (
+    ) -> str:
+    """
+Version of the HTML minifier, since its output may change between
+releases.
+    """
+    try:
+        return importlib.metadata.version("minify_html")
+    except importlib.metadata.PackageNotFoundError:
+        return "none"
+
+
+def evict_lru (
+    cache_dir: pathlib.Path,
+    pattern: str,
+    max_bytes: int,
+    ) -> typing.Tuple[ int, int ]:
+    """
+Remove the least recently used entries which match `pattern` until the
+cache fits within `max_bytes`. Returns the number of entries removed,
+and the number of bytes which remain.
+    """
+    entries: typing.List[ typing.Tuple[ float, int, pathlib.Path ] ] = []
+    total_bytes: int = 0
+
+    for entry_path in cache_dir.glob(pattern):
+        try:
+            stat: os.stat_result = entry_path.stat()
+        except FileNotFoundError:
+            continue
+
+        entries.append(( stat.st_mtime, stat.st_size, entry_path, ))
+        total_bytes += stat.st_size
+
+    count: int = 0
+
+    for _, size, entry_path in sorted(entries, key = lambda entry: entry[0]):
+        if total_bytes <= max_bytes:
+            break
+
+        entry_path.unlink(missing_ok = True)
+        total_bytes -= size
+        count += 1
+
+    return count, total_bytes
+
+
+######################################################################
+## module cache
+
+class ModuleCache:
+    """
+An on-disk cache of interpreted Bwyd modules, keyed by the hashes of
+the source file contents, the grammar, and the unit converter.
+
+Each source file has one entry, named after its path, which stores the
+key it was built with ahead of the module. So a put replaces any stale
+entry in place, without scanning the cache directory, and the size of
+the cache gets tracked as a running total, which only needs scanning
+again when eviction is due.
+
+Entries are pickled, so only point this at a directory you trust.
+    """
+    SUFFIX: str = ".pkl"
+
+
+    def __init__ (
+        self,
+        cache_dir: pathlib.Path,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.cache_dir: pathlib.Path = cache_dir
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._total_bytes: typing.Optional[ int ] = None
+        self._base_memo: typing.Optional[ typing.Tuple[ tuple, Converter, str ] ] = None
+
+        self.cache_dir.mkdir(parents = True, exist_ok = True)
+
+
+    @classmethod
+    def _path_prefix (
+        cls,
+        path: pathlib.Path,
+        ) -> str:
+        """
+Private method to name the entries which belong to one source file.
+        """
+        return hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+    def compose_key (
+        self,
+        path: pathlib.Path,
+        converter: Converter,
+        ) -> str:
+        """
+Compose the cache key for one source file.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}".encode("utf-8"))
+        digest.update(file_digest(path).encode("utf-8"))
+        digest.update(self._base_digest(converter).encode("utf-8"))
+
+        return digest.hexdigest()
+
+
+    def _base_digest (
+        self,
+        converter: Converter,
+        ) -> str:
+        """
+Private method to hash the grammar and the unit converter together,
+once per converter rather than once per lookup. The hash gets computed
+again when the grammar's `stat()` signature changes, or when entries
+get added to the converter.
+        """
+        memo_key: tuple = ( stat_signature(GRAMMAR_PATH), len(converter), )
+        memo: typing.Optional[ typing.Tuple[ tuple, Converter, str ] ] = self._base_memo
+
+        if memo is None or memo[0] != memo_key or memo[1] is not converter:
+            digest = hashlib.sha256()
+            digest.update(grammar_digest().encode("utf-8"))
+            digest.update(converter_digest(converter).encode("utf-8"))
+
+            memo = ( memo_key, converter, digest.hexdigest(), )
+            self._base_memo = memo
+
+        return memo[2]
+
+
+    def _entry_path (
+        self,
+        path: pathlib.Path,
+        ) -> pathlib.Path:
+        """
+Private method to locate the cache entry for one source file.
+        """
+        return self.cache_dir / f"{self._path_prefix(path)}{self.SUFFIX}"
+
+
+    def get (
+        self,
+        path: pathlib.Path,
+        converter: Converter,
+        *,
+        slug: str | None = None,
+        ) -> typing.Optional[ Module ]:
+        """
+Return the cached interpretation of a source file, or `None` on a miss.
+        """
+        entry_path: pathlib.Path = self._entry_path(path)
+
+        try:
+            with open(entry_path, "rb") as fp:
+                # a stale entry gets replaced by the next put
+                if pickle.load(fp) != self.compose_key(path, converter):
+                    self.misses += 1
+                    return None
+
+                module: Module = pickle.load(fp)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as ex:  # pylint: disable=W0718
+            # stale or corrupted entry: drop it and treat as a miss
+            logging.warning(f"dropping unreadable cache entry {entry_path.name}: {ex}")  # pylint: disable=W1203
+            entry_path.unlink(missing_ok = True)
+            self.misses += 1
+            return None
+
+        # mark as recently used, for eviction, unless another thread
+        # evicted it meanwhile
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+
+        self.hits += 1
+
+        module.path = path
+        module.converter = converter
+
+        if slug is not None:
+            module.slug = slug
+
+        return module
+
+
+    def put (
+        self,
+        module: Module,
+        converter: Converter,
+        ) -> None:
+        """
+Store an interpreted module, replacing any previous entry for the
+same source file, then evict if the cache grew too large.
+        """
+        entry_path: pathlib.Path = self._entry_path(module.path)
+
+        # write atomically, so concurrent readers never see partial entries
+        tmp_suffix: str = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path: pathlib.Path = entry_path.with_suffix(tmp_suffix)
+        key: str = self.compose_key(module.path, converter)
+
+        with open(tmp_path, "wb") as fp:
+            pickle.dump(key, fp, protocol = pickle.HIGHEST_PROTOCOL)
+            pickle.dump(module, fp, protocol = pickle.HIGHEST_PROTOCOL)
+
+        new_size: int = tmp_path.stat().st_size
+
+        with self._lock:
+            old_size: int = 0
+
+            try:
+                old_size = entry_path.stat().st_size
+            except FileNotFoundError:
+                pass
+
+            os.replace(tmp_path, entry_path)
+
+            # track the size after one scan, rather than scanning per put
+            if self._total_bytes is None:
+                _, self._total_bytes = evict_lru(self.cache_dir, f"*{self.SUFFIX}", self.max_bytes)
+            else:
+                self._total_bytes += new_size - old_size
+
+            if self._total_bytes > self.max_bytes:
+                _, self._total_bytes = evict_lru(self.cache_dir, f"*{self.SUFFIX}", self.max_bytes)
+
+
+    def invalidate (
+        self,
+        path: pathlib.Path | None = None,
+        ) -> int:
+        """
+Remove the entry for one source file, or all entries if no path is
+given. Returns the number of entries removed.
+        """
+        entry_paths: typing.Iterable[ pathlib.Path ] = self.cache_dir.glob(f"*{self.SUFFIX}")
+
+        if path is not None:
+            entry_paths = [ self._entry_path(path) ]
+
+        count: int = 0
+
+        for entry_path in entry_paths:
+            try:
+                entry_path.unlink()
+                count += 1
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._total_bytes = None
+
+        return count
+
+
+    def evict (
+        self,
+        ) -> int:
+        """
+Remove the least recently used entries until the cache fits within
+`max_bytes`. Returns the number of entries removed.
+        """
+        with self._lock:
+            count, self._total_bytes = evict_lru(self.cache_dir, f"*{self.SUFFIX}", self.max_bytes)
+
+        return count
+
+
+######################################################################
+## render cache
+
+class RenderCache:
+    """
+An on-disk cache of rendered pages, keyed by the hashes of the page
+model, the template, and the minifier options, so that pages whose
+models did not change skip both Jinja2 and `minify_html`.
+
+Entries are content-addressed, so any number of source files may
+share one cache, and threads may share one instance.
+    """
+    SUFFIX: str = ".html"
+
+
+    def __init__ (
+        self,
+        cache_dir: pathlib.Path,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.cache_dir: pathlib.Path = cache_dir
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._total_bytes: typing.Optional[ int ] = None
+        self._template_digests: typing.Dict[ str, str ] = {}
+
+        self.cache_dir.mkdir(parents = True, exist_ok = True)
+
+
+    def compose_key (
+        self,
+        model_json: bytes,
+        page_template: "jinja2.Template",
+        minify: bool,
+        *,
+        stylesheet: typing.Optional[ str ] = None,
+        ) -> typing.Optional[ str ]:
+        """
+Compose the cache key for one page, given its page model serialized as
+JSON, plus the URL of a shared `stylesheet` if any. Returns `None` for
+a template which was not loaded from a file, since it has no contents
+to hash.
+        """
+        if page_template.filename is None:
+            return None
+
+        template_digest: typing.Optional[ str ] = self._template_digests.get(page_template.filename)
+
+        if template_digest is None:
+            # the page template includes the stylesheet
+            template_path: pathlib.Path = pathlib.Path(page_template.filename)
+            template_digest = file_digest(template_path) + file_digest(STYLESHEET_PATH)
+            self._template_digests[page_template.filename] = template_digest
+
+        options: typing.Optional[ dict ] = MINIFY_OPTIONS if minify else None
+
+        digest = hashlib.sha256()
+        digest.update(f"v{RENDER_CACHE_VERSION}".encode("utf-8"))
+        digest.update(template_digest.encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys = True).encode("utf-8"))
+        digest.update(minifier_version().encode("utf-8"))
+        digest.update(f"{stylesheet}".encode("utf-8"))
+        digest.update(model_json)
+
+        return digest.hexdigest()
+
+
+    def get (
+        self,
+        key: str,
+        ) -> typing.Optional[ str ]:
+        """
+Return the cached page for a key, or `None` on a miss.
+        """
+        entry_path: pathlib.Path = self.cache_dir / f"{key}{self.SUFFIX}"
+
+        try:
+            html: str = entry_path.read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # mark as recently used, for eviction, unless another thread
+        # evicted it meanwhile
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+
+        self.hits += 1
+
+        return html
+
+
+    def put (
+        self,
+        key: str,
+        html: str,
+        ) -> None:
+        """
+Store a rendered page, then evict if the cache grew too large.
+        """
+        entry_path: pathlib.Path = self.cache_dir / f"{key}{self.SUFFIX}"
+        data: bytes = html.encode("utf-8")
+
+        # write atomically, so concurrent readers never see partial entries
+        tmp_suffix: str = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path: pathlib.Path = entry_path.with_suffix(tmp_suffix)
+        tmp_path.write_bytes(data)
+
+        with self._lock:
+            old_size: int = 0
+
+            try:
+                old_size = entry_path.stat().st_size
+            except FileNotFoundError:
+                pass
+
+            os.replace(tmp_path, entry_path)
+
+            # track the size after one scan, rather than scanning per page
+            if self._total_bytes is None:
+                _, self._total_bytes = evict_lru(self.cache_dir, f"*{self.SUFFIX}", self.max_bytes)
+            else:
+                self._total_bytes += len(data) - old_size
+
+            if self._total_bytes > self.max_bytes:
+                _, self._total_bytes = evict_lru(self.cache_dir, f"*{self.SUFFIX}", self.max_bytes)
+
+
+    def clear (
+        self,
+        ) -> int:
+        """
+Remove all entries. Returns the number of entries removed.
+        """
+        count: int = 0
+
+        for entry_path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            entry_path.unlink(missing_ok = True)
+            count += 1
+
+        with self._lock:
+            self._total_bytes = None
+
+        return count
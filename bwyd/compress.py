@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Precompressed siblings of the rendered outputs, e.g., `page.html.gz`
+and `page.html.br`, which static web servers can serve as-is instead
+of compressing each response on the fly.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import gzip
+import pathlib
+import typing
+import zlib
+
+from .manifest import write_if_changed
+
+# Brotli is optional, as the `brotli` extra: without it, only gzip
+# siblings get written
+try:
+    import brotli  # type: ignore  # pylint: disable=E0401
+except ImportError:  # pragma: no cover
+    brotli = None  # pylint: disable=C0103
+
+
+######################################################################
+## compressors
+
+def _compress_gzip (
+    data: bytes,
+    ) -> bytes:
+    """
+Gzip at the highest level, with a fixed timestamp in the header, so
+that the same input always compresses to the same bytes.
+    """
+    return gzip.compress(data, compresslevel = 9, mtime = 0)
+
+
+def _compress_brotli (
+    data: bytes,
+    ) -> bytes:
+    """
+Brotli at the highest quality, tuned for text.
+    """
+    return brotli.compress(data, mode = brotli.MODE_TEXT, quality = 11)  # type: ignore
+
+
+def _stream_gzip (
+    ) -> typing.Tuple[ typing.Callable[ [ bytes ], bytes ], typing.Callable[ [], bytes ] ]:
+    """
+Incremental gzip, which writes the same bytes as `_compress_gzip()`
+given the same input in chunks.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def _stream_brotli (
+    ) -> typing.Tuple[ typing.Callable[ [ bytes ], bytes ], typing.Callable[ [], bytes ] ]:
+    """
+Incremental Brotli, at the same settings as `_compress_brotli()`.
+    """
+    compressor = brotli.Compressor(mode = brotli.MODE_TEXT, quality = 11)  # type: ignore
+    return compressor.process, compressor.finish
+
+
+# compressor for each sibling suffix
+COMPRESSORS: typing.Dict[ str, typing.Callable[ [ bytes ], bytes ] ] = {
+    ".gz": _compress_gzip,
+    ".br": _compress_brotli,
+}
+
+# incremental compressor for each sibling suffix, as a pair of functions
+# to compress one chunk, then to finish
+STREAM_COMPRESSORS: typing.Dict[ str, typing.Callable[ [], tuple ] ] = {
+    ".gz": _stream_gzip,
+    ".br": _stream_brotli,
+}
+
+
+def available_formats (
+    ) -> typing.List[ str ]:
+    """
+Accessor for the sibling suffixes which can be written, given the
+optional dependencies installed.
+    """
+    return [
+        suffix
+        for suffix in COMPRESSORS
+        if suffix != ".br" or brotli is not None
+    ]
+
+
+def sibling_path (
+    path: pathlib.Path,
+    suffix: str,
+    ) -> pathlib.Path:
+    """
+Locate the compressed sibling of an output file, e.g., `page.html.gz`
+    """
+    return path.with_name(path.name + suffix)
+
+
+def remove_siblings (
+    path: pathlib.Path,
+    ) -> None:
+    """
+Remove any compressed siblings of an output file, e.g., when the
+output gets removed, or gets rewritten without them, so that a web
+server never serves stale content.
+    """
+    for suffix in COMPRESSORS:
+        sibling_path(path, suffix).unlink(missing_ok = True)
+
+
+######################################################################
+## parallel compression
+
+class Precompressor:
+    """
+Writes the compressed siblings of output files in a pool of threads,
+since both `zlib` and `brotli` release the GIL while compressing.
+
+The siblings of an output only get compressed again when its bytes
+changed, or when a sibling is missing. At most a few outputs per
+worker wait to be compressed at any time, so memory stays flat.
+    """
+
+    def __init__ (
+        self,
+        *,
+        formats: typing.Optional[ typing.List[ str ] ] = None,
+        workers: int = 4,
+        ) -> None:
+        """
+Constructor, which defaults to every format available. Raises
+`ValueError` for an unknown format, or for Brotli when its package is
+not installed.
+        """
+        if formats is None:
+            formats = available_formats()
+
+        for suffix in formats:
+            if suffix not in available_formats():
+                raise ValueError(f"compressed format `{suffix}` is not available")
+
+        self.formats: typing.List[ str ] = formats
+        self.workers: int = workers
+        self.written: typing.List[ str ] = []
+
+        self._executor: typing.Optional[ concurrent.futures.ThreadPoolExecutor ] = None
+        self._pending: collections.deque = collections.deque()
+
+
+    @classmethod
+    def _compress (
+        cls,
+        path: pathlib.Path,
+        suffix: str,
+        data: bytes,
+        ) -> typing.Optional[ str ]:
+        """
+Private method to compress and write one sibling, in a worker thread.
+        """
+        if write_if_changed(path, COMPRESSORS[suffix](data)):
+            return str(path)
+
+        return None
+
+
+    def submit (
+        self,
+        path: pathlib.Path,
+        data: bytes,
+        *,
+        changed: bool = True,
+        ) -> None:
+        """
+Queue the compressed siblings of an output file for writing, given its
+uncompressed bytes and whether those `changed` since the last write.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.workers)
+
+        for suffix in self.formats:
+            sib_path: pathlib.Path = sibling_path(path, suffix)
+
+            if not changed and sib_path.exists():
+                continue
+
+            # wait on the oldest sibling whenever the queue is full
+            while len(self._pending) >= 2 * self.workers:
+                self._collect(self._pending.popleft())
+
+            self._pending.append(self._executor.submit(self._compress, sib_path, suffix, data))
+
+
+    def tee (
+        self,
+        path: pathlib.Path,
+        chunks: typing.Iterable[ str ],
+        ) -> typing.Iterator[ str ]:
+        """
+Pass through the text chunks of an output which gets streamed to disk,
+while compressing them into its siblings in the same pass, so that the
+full output never gets held in memory. This runs in the calling thread,
+and the siblings get written whether or not the output changed.
+        """
+        with contextlib.ExitStack() as stack:
+            streams: list = []
+
+            for suffix in self.formats:
+                fp: typing.BinaryIO = stack.enter_context(open(sibling_path(path, suffix), "wb"))
+                compress, finish = STREAM_COMPRESSORS[suffix]()
+                streams.append(( fp, compress, finish, ))
+
+            for chunk in chunks:
+                data: bytes = chunk.encode("utf-8")
+
+                for fp, compress, _ in streams:
+                    fp.write(compress(data))
+
+                yield chunk
+
+            for fp, _, finish in streams:
+                fp.write(finish())
+
+        self.written.extend([ str(sibling_path(path, suffix)) for suffix in self.formats ])
+
+
+    def _collect (
+        self,
+        future: concurrent.futures.Future,
+        ) -> None:
+        """
+Private method to record the result of one sibling, re-raising any
+error from its worker thread.
+        """
+        written: typing.Optional[ str ] = future.result()
+
+        if written is not None:
+            self.written.append(written)
+
+
+    def flush (
+        self,
+        ) -> typing.List[ str ]:
+        """
+Wait until all the queued siblings have been written, returning the
+paths of the siblings which changed since the previous flush.
+        """
+        while len(self._pending) > 0:
+            self._collect(self._pending.popleft())
+
+        written: typing.List[ str ] = self.written
+        self.written = []
+
+        return written
+
+
+    def close (
+        self,
+        ) -> typing.List[ str ]:
+        """
+Flush, then shut down the worker threads.
+        """
+        written: typing.List[ str ] = self.flush()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+        return written
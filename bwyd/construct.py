@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Trusted construction of data classes from parser-produced values.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import copy
+import functools
+import typing
+
+from pydantic import BaseModel
+
+
+T = typing.TypeVar("T", bound = BaseModel)
+
+_new: typing.Callable = object.__new__
+_set: typing.Callable = object.__setattr__
+
+IMMUTABLE_TYPES: tuple = ( type(None), bool, int, float, str, bytes, tuple, frozenset, )
+
+
+@functools.cache
+def _field_defaults (
+    cls: typing.Type[ BaseModel ],
+    ) -> typing.Tuple[ dict, typing.Tuple[ typing.Tuple[ str, typing.Callable ], ... ] ]:
+    """
+The optional fields of a data class, collected once per class: the
+immutable defaults which can be shared, plus a function for each field
+whose default must get copied or built per instance.
+    """
+    shared: dict = {}
+    copied: typing.List[ typing.Tuple[ str, typing.Callable ] ] = []
+
+    for name, field in cls.model_fields.items():
+        if field.is_required():
+            continue
+
+        default: typing.Any = field.default
+
+        if field.default_factory is not None:
+            copied.append(( name, field.default_factory, ))
+        elif isinstance(default, IMMUTABLE_TYPES):
+            shared[name] = default
+        elif type(default) in ( list, dict, set, ) and not default:  # pylint: disable=C0123
+            # an empty builtin collection only needs a shallow copy
+            copied.append(( name, default.copy, ))
+        else:
+            copied.append(( name, functools.partial(copy.deepcopy, default), ))
+
+    return shared, tuple(copied)
+
+
+def trusted_construct (
+    cls: typing.Type[ T ],
+    fields: dict,
+    ) -> T:
+    """
+Build a data class instance *without* validation, for values which the
+grammar has already constrained, e.g., symbols, strings, and numbers
+produced by the parser.
+
+This stores the given `fields` dictionary directly as the instance
+dictionary, the same way `model_construct` does, without the per-call
+overhead of the generic `pydantic` version. Optional fields which are
+not given get their defaults, copied the same way that `pydantic` does.
+
+Objects which users construct themselves should get validated as usual.
+    """
+    shared, copied = _field_defaults(cls)
+    obj: T = _new(cls)
+    _set(obj, "__pydantic_fields_set__", set(fields))
+
+    for name, value in shared.items():
+        if name not in fields:
+            fields[name] = value
+
+    for name, make_default in copied:
+        if name not in fields:
+            fields[name] = make_default()
+
+    _set(obj, "__dict__", fields)
+    _set(obj, "__pydantic_extra__", None)
+    _set(obj, "__pydantic_private__", None)
+
+    return obj
@@ -6,164 +6,190 @@ DSL implementing the Bwyd language.
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
+# pylint: disable=C0302
+
+import collections
+import concurrent.futures
+import hashlib
 import json
 import logging
+import multiprocessing
+import multiprocessing.context
+import os
 import pathlib
+import threading
+import time
 import tomllib
 import typing
-import urllib.parse
 
 from icecream import ic  # type: ignore  # pylint: disable=E0401
-from rdflib.namespace import DCTERMS, RDF, SKOS, XSD  # pylint: disable=W0611
-import jinja2
-import rdflib
-import requests_cache
 import textx  # type: ignore  # pylint: disable=E0401
 
-from .measure import Conversion, Converter
+from .assets import StaticAssets
+from .cache import ModuleCache, RenderCache, converter_digest, file_digest, grammar_digest
+from .compress import Precompressor, remove_siblings
+from .error import BwydParserError
+from .manifest import BuildManifest, BuildReport, ManifestEntry, RenderReport, \
+    MANIFEST_VERSION, bytes_digest, stat_signature, write_if_changed
+from .measure import Conversion, Converter, Measure, MeasureTotals
 from .module import Module
-from .resources import BWYD_NAMESPACE, BWYD_SVG, \
-    CONVERT_PATH, GRAMMAR_PATH, JINJA_INDEX_TEMPLATE
+from .output import PAGE_LIST_ADAPTER
+from .parser import parse_file
+from .resources import BWYD_SVG, \
+    CONVERT_PATH, GRAMMAR_PATH, STYLESHEET_PATH, get_index_template, get_page_template
+
+# heavy dependencies get imported on first use, to keep startup fast
+if typing.TYPE_CHECKING:
+    import jinja2
+    import requests_cache
+
+    from .graph import Graph
 
 
 ######################################################################
-## knowledge graph management
+## corpus operations
 
-class Graph:
+MANIFEST_NAME: str = "bwyd.manifest.json"
+
+
+class Corpus:  # pylint: disable=R0903
     """
-A knowledge graph based on a corpus of Bwyd modules.
+A corpus of Bwyd modules.
     """
+
     def __init__ (
         self,
+        config: dict,
+        converter: Converter,
+        *,
+        lang: str = "en",
+        parser: str = "textx",
         ) -> None:
         """
 Constructor.
         """
-        self.lang: str = "en"
-        self.prefix: str = "bwyd"
-        self.ns_bwyd: rdflib.Namespace = rdflib.Namespace(BWYD_NAMESPACE)
-        self.graph: rdflib.Graph = rdflib.Graph()
+        logging.basicConfig(format="%(asctime)s %(message)s")
 
-        nm: rdflib.namespace.NamespaceManager = self.graph.namespace_manager
-        nm.bind(self.prefix, self.ns_bwyd)
+        self.config: dict = config
+        self.converter: Converter = converter
+        self.lang: str = lang
+        self.parser: str = parser
+        self.errors: typing.Dict[ pathlib.Path, Exception ] = {}
+        self.assets: typing.Optional[ StaticAssets ] = None
+        self.precompressor: typing.Optional[ Precompressor ] = None
 
 
-    def compose_iri (
+    def use_shared_assets (
         self,
-        names: list[ str ],
-        ) -> rdflib.URIRef:
+        dir_path: pathlib.Path,
+        *,
+        base_url: str | None = None,
+        ) -> StaticAssets:
         """
-Compose an IRI in the Bwyd namespace.
+Write the icon and the stylesheet once into the given directory, with
+content-hashed file names, then reference them from every page, the
+index, and the JSON exports rather than inlining them.
+
+Pages reference the assets by relative paths, unless a `base_url` for
+the directory gets provided.
         """
-        urn: str = ":".join([ urllib.parse.quote_plus(name) for name in names ])
-        return rdflib.URIRef(self.ns_bwyd + urn)
+        self.assets = StaticAssets.write(dir_path, base_url = base_url)
+        return self.assets
 
 
-    def compose_iri_instance (
+    def use_precompression (
         self,
-        inst_symbol: str,
         *,
-        sub_symbol: str | None = None,
-        ) -> rdflib.URIRef:
-        """
-Compose an IRI in the Bwyd namespace for an instance of a class.
+        formats: typing.Optional[ typing.List[ str ] ] = None,
+        workers: int = 4,
+        ) -> Precompressor:
         """
-        if sub_symbol is not None:
-            return rdflib.URIRef(self.ns_bwyd + inst_symbol + "#" + sub_symbol)
+Write compressed siblings, e.g., `.gz` and `.br`, alongside each HTML
+output which gets written: pages, plus the index. The siblings get
+compressed in a pool of threads, and only when the uncompressed bytes
+change, or when a sibling is missing.
 
-        return rdflib.URIRef(self.ns_bwyd + inst_symbol)
+The formats default to every one available, where `.br` needs the
+optional `brotli` package.
+        """
+        self.precompressor = Precompressor(formats = formats, workers = workers)
+        return self.precompressor
 
 
-    def compose_iri_literal (
+    def get_cache (
         self,
-        literal: str,
         *,
-        lang: str,
-        ) -> rdflib.Literal:
+        cache_path: pathlib.Path | None = None,
+        cache_expire: int | None = None,
+        ) -> "requests_cache.CachedSession":
         """
-Compose an IRI in the Bwyd namespace for a literal.
+Build a URL request cache session, optionally loading any
+previous serialized cache from disk.
         """
-        return rdflib.Literal(
-            literal,
-            lang = lang,
-        )
+        import requests_cache  # pylint: disable=C0415
 
+        if cache_path is None:
+            cache_path = pathlib.Path(self.config["bwyd"]["cache_path"])
 
-    def add_tuple (
-        self,
-        s_obj: rdflib.URIRef,
-        p_obj: rdflib.URIRef,
-        o_obj: rdflib.term.Identifier,
-        ) -> None:
-        """
-Add one RDF tuple to the graph.
-        """
-        self.graph.add(( s_obj, p_obj, o_obj, ))
-
+        if cache_expire is None:
+            cache_expire = self.config["bwyd"]["cache_expire"]
 
-    def serialize (
-        self,
-        *,
-        format: str = "turtle",  # pylint: disable=W0622
-        ) -> str:
-        """
-Return the serialized graph int the given format.
-        """
-        return self.graph.serialize(
-            format = format,
-            base = BWYD_NAMESPACE,
+        session: requests_cache.CachedSession = requests_cache.CachedSession(
+            backend = requests_cache.SQLiteCache(cache_path),
         )
 
+        session.settings.expire_after = cache_expire
 
-######################################################################
-## corpus operations
+        return session
 
-class Corpus:  # pylint: disable=R0903
-    """
-A corpus of Bwyd modules.
-    """
 
-    def __init__ (
+    def get_module_cache (
         self,
-        config: dict,
-        converter: Converter,
         *,
-        lang: str = "en",
-        ) -> None:
+        cache_path: pathlib.Path | None = None,
+        max_bytes: int | None = None,
+        ) -> ModuleCache:
         """
-Constructor.
+Build an on-disk cache of interpreted modules, which defaults to the
+`module_cache_path` and `module_cache_max_bytes` configuration settings.
         """
-        logging.basicConfig(format="%(asctime)s %(message)s")
+        settings: dict = self.config.get("bwyd", {})
 
-        self.config: dict = config
-        self.converter: Converter = converter
-        self.lang: str = lang
+        if cache_path is None:
+            cache_path = pathlib.Path(settings.get("module_cache_path", "bwyd.modules"))
 
+        if max_bytes is None:
+            max_bytes = settings.get("module_cache_max_bytes", 256 * 1024 * 1024)
 
-    def get_cache (
+        return ModuleCache(
+            cache_path,
+            max_bytes = max_bytes,  # type: ignore
+        )
+
+
+    def get_render_cache (
         self,
         *,
         cache_path: pathlib.Path | None = None,
-        cache_expire: int | None = None,
-        ) -> requests_cache.CachedSession:
+        max_bytes: int | None = None,
+        ) -> RenderCache:
         """
-Build a URL request cache session, optionally loading any
-previous serialized cache from disk.
+Build an on-disk cache of rendered pages, which defaults to the
+`render_cache_path` and `render_cache_max_bytes` configuration settings.
         """
+        settings: dict = self.config.get("bwyd", {})
+
         if cache_path is None:
-            cache_path = pathlib.Path(self.config["bwyd"]["cache_path"])
+            cache_path = pathlib.Path(settings.get("render_cache_path", "bwyd.pages"))
 
-        if cache_expire is None:
-            cache_expire = self.config["bwyd"]["cache_expire"]
+        if max_bytes is None:
+            max_bytes = settings.get("render_cache_max_bytes", 256 * 1024 * 1024)
 
-        session: requests_cache.CachedSession = requests_cache.CachedSession(
-            backend = requests_cache.SQLiteCache(cache_path),
+        return RenderCache(
+            cache_path,
+            max_bytes = max_bytes,  # type: ignore
         )
 
-        session.settings.expire_after = cache_expire
-
-        return session
-
 
     def iter_files (
         self,
@@ -181,36 +207,298 @@ Iterator for listing the Bwyd modules in a given directory.
                 yield bwyd_path
 
 
-    def parse_modules (
+    def parse_modules (  # pylint: disable=R0913
         self,
         dir_path: pathlib.Path,
         *,
         glob: str = "*.bwyd",
+        cache: ModuleCache | None = None,
+        workers: int = 1,
+        worker_parser: str = "fast",
+        ordered: bool = True,
+        release_parse_tree: bool = True,
         debug: bool = False,
         ) -> typing.Iterator[ Module ]:
         """
 Traverse the given directory, parsing Bwyd modules.
+When a module cache is provided, unchanged modules get loaded from it
+instead of being parsed and interpreted again.
+
+With `workers > 1` the modules get parsed in a pool of processes,
+yielded either in file order or in completion order. In that mode any
+error in one file, e.g., a parser error or an invalid amount, gets
+logged and recorded in `self.errors`, then the rest of the batch
+continues.
+
+The workers use the `"fast"` parser by default, which produces the
+same modules, and needs no metamodel to start. A `textx` metamodel
+cannot be pickled or persisted, so with `worker_parser = "textx"` each
+worker builds its own when it starts.
+
+The workers start from a `forkserver` where available, which imports
+the calling script again: guard its entry point with
+`if __name__ == "__main__":` as for any `spawn` pool.
+
+Set `release_parse_tree` to `False` to keep the parse tree of each
+module which gets parsed serially; modules loaded from the cache or
+from worker processes never carry one.
         """
-        dsl: Bwyd = Bwyd()
+        if workers > 1:
+            yield from self._parse_parallel(
+                list(self.iter_files(dir_path, glob = glob)),
+                cache = cache,
+                workers = workers,
+                worker_parser = worker_parser,
+                ordered = ordered,
+                debug = debug,
+            )
+            return
 
         for bwyd_path in self.iter_files(dir_path, glob = glob):
-            slug: str = bwyd_path.stem
-
-            if debug:
-                ic(bwyd_path.name)
-
-            # parse the Bwyd module
-            module: Module = dsl.parse(
+            yield self.parse_module(
                 bwyd_path,
-                slug = slug,
-            )
-
-            # interpret the parsed module
-            module.interpret(
+                cache = cache,
+                release_parse_tree = release_parse_tree,
                 debug = debug,
             )
 
-            yield module
+
+    def parse_module (
+        self,
+        bwyd_path: pathlib.Path,
+        *,
+        cache: ModuleCache | None = None,
+        release_parse_tree: bool = True,
+        debug: bool = False,
+        ) -> Module:
+        """
+Parse and interpret one Bwyd module, using the module cache if provided.
+        """
+        slug: str = bwyd_path.stem
+
+        if debug:
+            ic(bwyd_path.name)
+
+        if cache is not None:
+            cached: Module | None = cache.get(bwyd_path, self.converter, slug = slug)
+
+            if cached is not None:
+                return cached
+
+        # parse and interpret the Bwyd module
+        module: Module = Bwyd(converter = self.converter, parser = self.parser).load(
+            bwyd_path,
+            slug = slug,
+            release_parse_tree = release_parse_tree,
+            debug = debug,
+        )
+
+        if cache is not None:
+            cache.put(module, self.converter)
+
+        return module
+
+
+    def _parse_parallel (  # pylint: disable=R0913,R0914
+        self,
+        paths: typing.List[ pathlib.Path ],
+        *,
+        cache: ModuleCache | None,
+        workers: int,
+        worker_parser: str,
+        ordered: bool,
+        debug: bool,
+        ) -> typing.Iterator[ Module ]:
+        """
+Private method to parse and interpret modules in a process pool.
+        """
+        self.errors = {}
+        pending: typing.List[ Module | concurrent.futures.Future ] = []
+        future_paths: typing.Dict[ concurrent.futures.Future, pathlib.Path ] = {}
+
+        if worker_parser not in PARSERS:
+            raise ValueError(f"unknown parser `{worker_parser}`, expected one of {PARSERS}")
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers = workers,
+            mp_context = _get_mp_context(),
+            initializer = _init_worker,
+            initargs = ( self.converter, worker_parser, ),
+        ) as executor:
+            for bwyd_path in paths:
+                cached: Module | None = None
+
+                if cache is not None:
+                    cached = cache.get(bwyd_path, self.converter, slug = bwyd_path.stem)
+
+                if cached is not None:
+                    pending.append(cached)
+                else:
+                    future: concurrent.futures.Future = executor.submit(
+                        _parse_worker,
+                        bwyd_path,
+                        debug,
+                    )
+
+                    future_paths[future] = bwyd_path
+                    pending.append(future)
+
+            results: typing.Iterable[ Module | concurrent.futures.Future ] = pending
+
+            if not ordered:
+                results = [
+                    *[ item for item in pending if isinstance(item, Module) ],
+                    *concurrent.futures.as_completed([
+                        item
+                        for item in pending
+                        if isinstance(item, concurrent.futures.Future)
+                    ]),
+                ]
+
+            for item in results:
+                if isinstance(item, Module):
+                    yield item
+                    continue
+
+                error: Exception | None = None
+
+                try:
+                    bwyd_path, module, error = item.result()
+                except Exception as ex:  # pylint: disable=W0718
+                    # any other failure in a worker, e.g., an invalid amount,
+                    # or a result which cannot be pickled, skips only its file
+                    bwyd_path, error = future_paths[item], ex
+
+                if error is not None:
+                    logging.error(f"{bwyd_path}: {error}")  # pylint: disable=W1203
+                    self.errors[bwyd_path] = error
+                    continue
+
+                module.converter = self.converter
+
+                if cache is not None:
+                    cache.put(module, self.converter)
+
+                yield module
+
+
+    def summarize (
+        self,
+        module: Module,
+        session: "requests_cache.CachedSession",
+        ) -> dict:
+        """
+Summarize one module for the search/discovery index.
+        """
+        updated: typing.Optional[ str ] = None
+
+        if module.updated is not None:
+            updated = module.updated.isoformat()
+
+        # with shared assets, the index falls back to the icon
+        default_thumb: typing.Optional[ str ] = BWYD_SVG if self.assets is None else None
+
+        return {
+            "slug": module.slug,
+            "thumb": module.get_thumbnail(session, default = default_thumb),
+            "title": module.title,
+            "text": module.text,
+            "serves": module.total_yields(),
+            "duration": module.total_duration(),
+            "updated": updated,
+            "keywords": module.collect_keywords(),
+        }
+
+
+    def export_json (
+        self,
+        modules: typing.Iterable[ Module ],
+        *,
+        indent: typing.Optional[ int ] = None,
+        ) -> bytes:
+        """
+Serialize the page models of the given modules as one JSON array,
+directly to bytes.
+        """
+        return PAGE_LIST_ADAPTER.dump_json(
+            [ module.get_page_model(assets = self.assets) for module in modules ],
+            indent = indent,
+        )
+
+
+    def write_json (
+        self,
+        modules: typing.Iterable[ Module ],
+        json_path: pathlib.Path,
+        *,
+        indent: typing.Optional[ int ] = None,
+        ) -> bool:
+        """
+Export the page models of the given modules into a JSON file, only
+when its contents would change, along with its compressed siblings if
+precompression is in use. Returns whether the file got written.
+        """
+        changed: bool = self._write_output(json_path, self.export_json(modules, indent = indent))
+
+        if self.precompressor is not None:
+            self.precompressor.flush()
+
+        return changed
+
+
+    def total_ingredients (
+        self,
+        modules: typing.Iterable[ Module ],
+        ) -> typing.Dict[ str, Measure ]:
+        """
+Roll up the ingredient totals of the given modules into one total per
+ingredient, normalized into grams for mass or liters for volume, in a
+single pass over the per-module totals.
+        """
+        totals: MeasureTotals = MeasureTotals(self.converter, canonical = True)
+
+        for module in modules:
+            for entity, measure in module.iter_ingredients():
+                if not totals.add(entity.symbol, measure):
+                    logging.error(  # pylint: disable=W1203
+                        f"wrong units for ingredient rollup: {entity.symbol} {measure.units}"
+                    )
+
+        return dict(totals.items())
+
+
+    def render_index (
+        self,
+        summaries: typing.List[ dict ],
+        index_path: pathlib.Path,
+        *,
+        index_template: typing.Optional[ "jinja2.Template" ] = None,
+        ) -> str:
+        """
+Render an HTML index for search/discovery from module summaries,
+returning the hash of its contents. The index only gets written, and
+its compressed siblings only get compressed again, when its bytes
+change.
+        """
+        if index_template is None:
+            index_template = get_index_template()
+
+        icon: str = BWYD_SVG
+
+        if self.assets is not None:
+            icon = self.assets.get_url("icon", index_path.parent)
+
+        mod_data: dict = {
+            "corpus": {
+                "icon": icon,
+                "modules": summaries,
+            },
+        }
+
+        html: bytes = index_template.render(mod_data).encode("utf-8")
+        self._write_output(index_path, html)
+
+        return bytes_digest(html)
 
 
     def render_discovery (
@@ -218,34 +506,558 @@ Traverse the given directory, parsing Bwyd modules.
         modules: list[ Module ],
         index_path: pathlib.Path,
         *,
-        index_template: jinja2.Template = JINJA_INDEX_TEMPLATE,
+        index_template: typing.Optional[ "jinja2.Template" ] = None,
         ) -> None:
         """
 Render an HTML index for search/discovery across a directory of recipes.
         """
-        mod_data: dict = {
-            "corpus": {
-                "icon": BWYD_SVG,
-                "modules": [
-                    {
-                        "slug": module.slug,
-                        "thumb": module.get_thumbnail(self.get_cache()),
-                        "title": module.title,
-                        "text": module.text,
-                        "serves": module.total_yields(),
-                        "duration": module.total_duration(),
-                        "updated": module.updated,
-                        "keywords": module.collect_keywords(),
-                    }
-                    for module in modules
-                ],
-            },
+        session: "requests_cache.CachedSession" = self.get_cache()
+
+        self.render_index(
+            [ self.summarize(module, session) for module in modules ],
+            index_path,
+            index_template = index_template,
+        )
+
+        if self.precompressor is not None:
+            self.precompressor.flush()
+
+
+######################################################################
+## parallel rendering
+
+    def render_pages (  # pylint: disable=R0913,R0914
+        self,
+        dir_path: pathlib.Path,
+        *,
+        glob: str = "*.bwyd",
+        cache: ModuleCache | None = None,
+        render_cache: RenderCache | None = None,
+        workers: int = 4,
+        queue_size: int | None = None,
+        debug: bool = False,
+        ) -> RenderReport:
+        """
+Render every Bwyd module in the given directory as HTML, as a pipeline
+of three stages: parse, then render and minify in a pool of threads,
+then write each page only when its contents would change.
+
+Both Jinja2 and `minify_html` run in the worker threads, and the
+latter releases the GIL while it minifies. At most `queue_size` pages
+are in flight between the stages, so memory stays flat regardless of
+the size of the corpus, and the pages get written in file order. The
+output is byte-identical to rendering each module serially, which is
+what `workers = 1` does. With a render cache, unchanged pages get
+returned from it instead of being rendered again.
+        """
+        if queue_size is None:
+            queue_size = 2 * workers
+
+        report: RenderReport = RenderReport(workers = workers)
+        page_template: "jinja2.Template" = get_page_template()
+        start_time: float = time.perf_counter()
+
+        def render (
+            module: Module,
+            ) -> bytes:
+            """
+Render and minify one page, in a worker thread.
+            """
+            return module.render_template(
+                page_template = page_template,
+                render_cache = render_cache,
+                assets = self.assets,
+            ).encode("utf-8")
+
+        def write (
+            html_path: pathlib.Path,
+            html: bytes,
+            ) -> None:
+            """
+Write one page, in the calling thread.
+            """
+            report.rendered.append(str(html_path))
+
+            if self._write_output(html_path, html):
+                report.written.append(str(html_path))
+
+        modules: typing.Iterator[ Module ] = self.parse_modules(
+            dir_path,
+            glob = glob,
+            cache = cache,
+            debug = debug,
+        )
+
+        if workers <= 1:
+            for module in modules:
+                write(module.path.with_suffix(".html"), render(module))
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers = workers) as executor:
+                pending: collections.deque = collections.deque()
+
+                for module in modules:
+                    # wait on the oldest page whenever the queue is full
+                    if len(pending) >= queue_size:
+                        html_path, future = pending.popleft()
+                        write(html_path, future.result())
+
+                    pending.append((
+                        module.path.with_suffix(".html"),
+                        executor.submit(render, module),
+                    ))
+
+                while len(pending) > 0:
+                    html_path, future = pending.popleft()
+                    write(html_path, future.result())
+
+        if self.precompressor is not None:
+            report.compressed = self.precompressor.flush()
+
+        report.elapsed = time.perf_counter() - start_time
+
+        if debug:
+            ic(len(report.rendered), report.pages_per_sec())
+
+        return report
+
+
+######################################################################
+## incremental builds
+
+    def get_build_hash (
+        self,
+        ) -> str:
+        """
+Hash everything besides the sources which affects the rendered
+output: grammar, unit converter, templates, shared assets, and the
+compressed formats. Whenever this changes, an incremental build falls
+back to rebuilding everything.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{MANIFEST_VERSION}".encode("utf-8"))
+        digest.update(grammar_digest().encode("utf-8"))
+        digest.update(converter_digest(self.converter).encode("utf-8"))
+        digest.update(file_digest(STYLESHEET_PATH).encode("utf-8"))
+
+        if self.assets is not None:
+            digest.update(self.assets.model_dump_json().encode("utf-8"))
+
+        # turning precompression on or off must revisit every output
+        if self.precompressor is not None:
+            digest.update(json.dumps(self.precompressor.formats).encode("utf-8"))
+
+        for template in [ get_page_template(), get_index_template() ]:
+            if template.filename is not None:
+                digest.update(file_digest(pathlib.Path(template.filename)).encode("utf-8"))
+
+        return digest.hexdigest()
+
+
+    @classmethod
+    def _write_if_changed (
+        cls,
+        path: pathlib.Path,
+        data: bytes,
+        ) -> bool:
+        """
+Private method to write a file only when its contents would change,
+which keeps timestamps stable for downstream sync tools.
+        """
+        return write_if_changed(path, data)
+
+
+    def _write_output (
+        self,
+        path: pathlib.Path,
+        data: bytes,
+        ) -> bool:
+        """
+Private method to write one output only when its contents would
+change, then queue its compressed siblings if precompression is in
+use, or otherwise remove any siblings left from an earlier build.
+        """
+        changed: bool = self._write_if_changed(path, data)
+
+        if self.precompressor is not None:
+            self.precompressor.submit(path, data, changed = changed)
+        else:
+            remove_siblings(path)
+
+        return changed
+
+
+    def _is_fresh (
+        self,
+        entry: ManifestEntry,
+        bwyd_path: pathlib.Path,
+        ) -> bool:
+        """
+Private method to check whether a source module and its output are
+unchanged since the last build, rehashing only when `stat()` differs.
+        """
+        if not pathlib.Path(entry.output_path).exists():
+            return False
+
+        stat_sig: typing.Tuple[ int, int ] = stat_signature(bwyd_path)
+
+        if stat_sig == entry.source_stat:
+            return True
+
+        if file_digest(bwyd_path) != entry.source_hash:
+            return False
+
+        # touched but not edited
+        entry.source_stat = stat_sig
+        return True
+
+
+    def build_module (  # pylint: disable=R0913
+        self,
+        bwyd_path: pathlib.Path,
+        session: "requests_cache.CachedSession",
+        report: BuildReport,
+        *,
+        cache: ModuleCache | None = None,
+        render_cache: RenderCache | None = None,
+        debug: bool = False,
+        ) -> ManifestEntry:
+        """
+Parse, interpret, and render one module as HTML, returning its
+build manifest entry.
+        """
+        source_stat: typing.Tuple[ int, int ] = stat_signature(bwyd_path)
+        source_hash: str = file_digest(bwyd_path)
+
+        module: Module = self.parse_module(
+            bwyd_path,
+            cache = cache,
+            debug = debug,
+        )
+
+        html_path: pathlib.Path = bwyd_path.with_suffix(".html")
+        html: bytes = module.render_template(
+            render_cache = render_cache,
+            assets = self.assets,
+        ).encode("utf-8")
+        report.rendered.append(str(bwyd_path))
+
+        if self._write_output(html_path, html):
+            report.written.append(str(html_path))
+
+        return ManifestEntry(
+            source_hash = source_hash,
+            source_stat = source_stat,
+            output_path = str(html_path),
+            output_hash = bytes_digest(html),
+            products = [
+                product.symbol
+                for closure in module.closures.values()
+                for product in closure.products
+            ],
+            uses = [
+                symbol
+                for closure in module.closures.values()
+                for symbol, entity in closure.ingredients.items()
+                if entity.external
+            ],
+            summary = self.summarize(module, session),
+        )
+
+
+    def build (  # pylint: disable=R0913
+        self,
+        dir_path: pathlib.Path,
+        *,
+        glob: str = "*.bwyd",
+        manifest_path: pathlib.Path | None = None,
+        index_path: pathlib.Path | None = None,
+        incremental: bool = True,
+        cache: ModuleCache | None = None,
+        render_cache: RenderCache | None = None,
+        debug: bool = False,
+        ) -> BuildReport:
+        """
+Render each Bwyd module in the given directory as HTML, plus the
+search/discovery index.
+
+In incremental mode, a build manifest records the input hashes, output
+hashes, and `USE` dependencies for each module. Then only the modules
+whose inputs changed get parsed and rendered again, plus any modules
+which depend on their products. The index only gets rendered again when
+a module summary changed.
+
+With a render cache, a rebuilt module whose page model did not change
+skips rendering, and its output file does not get rewritten.
+        """
+        if manifest_path is None:
+            manifest_path = dir_path / MANIFEST_NAME
+
+        if index_path is None:
+            index_path = dir_path / "index.html"
+
+        build_hash: str = self.get_build_hash()
+        manifest: BuildManifest = BuildManifest()
+
+        if incremental:
+            manifest = BuildManifest.load(manifest_path)
+
+            if manifest.build_hash != build_hash:
+                manifest = BuildManifest()
+
+        manifest.build_hash = build_hash
+
+        sources: typing.Dict[ str, pathlib.Path ] = {
+            str(bwyd_path): bwyd_path
+            for bwyd_path in self.iter_files(dir_path, glob = glob)
+        }
+
+        stale: typing.Set[ str ] = {
+            key
+            for key, bwyd_path in sources.items()
+            if key not in manifest.modules or not self._is_fresh(manifest.modules[key], bwyd_path)
         }
 
-        html: str = index_template.render(mod_data)
+        report: BuildReport = self._update(
+            manifest,
+            sources,
+            stale,
+            index_path,
+            cache = cache,
+            render_cache = render_cache,
+            debug = debug,
+        )
+
+        manifest.save(manifest_path)
+
+        return report
+
+
+    def _update (  # pylint: disable=R0913,R0914
+        self,
+        manifest: BuildManifest,
+        sources: typing.Dict[ str, pathlib.Path ],
+        stale: typing.Set[ str ],
+        index_path: pathlib.Path,
+        *,
+        cache: ModuleCache | None = None,
+        render_cache: RenderCache | None = None,
+        keep_going: bool = False,
+        debug: bool = False,
+        ) -> BuildReport:
+        """
+Private method to bring a build manifest up to date, in place:
+remove the outputs of deleted sources, rebuild the stale modules plus
+their dependents, then render the index if any summary changed.
+
+With `keep_going` a parser error gets logged and recorded in
+`self.errors`, leaving that module's previous output in place.
+        """
+        report: BuildReport = BuildReport()
+        session: "requests_cache.CachedSession" = self.get_cache()
+        old_summaries: list = [ ( key, entry.summary, ) for key, entry in manifest.modules.items() ]
+
+        # outputs of deleted sources get removed, while the modules which
+        # a narrower glob leaves out stay as they are
+        changed_products: typing.Set[ str ] = set()
+
+        deleted: typing.List[ str ] = [
+            key
+            for key in manifest.modules
+            if key not in sources and not pathlib.Path(key).exists()
+        ]
+
+        for key in deleted:
+            pathlib.Path(manifest.modules[key].output_path).unlink(missing_ok = True)
+            remove_siblings(pathlib.Path(manifest.modules[key].output_path))
+            changed_products.update(manifest.modules.pop(key).products)
+            report.removed.append(key)
+
+        # rebuild the stale modules, then their dependents, until stable;
+        # dependents only arise once `USE` can cross modules
+        done: typing.Set[ str ] = set()
+        todo: typing.Set[ str ] = stale | manifest.dependents(changed_products)
+
+        while len(todo) > 0:
+            changed_products = set()
+
+            for key in [ key for key in sources if key in todo ]:
+                done.add(key)
+
+                try:
+                    entry: ManifestEntry = self.build_module(
+                        sources[key],
+                        session,
+                        report,
+                        cache = cache,
+                        render_cache = render_cache,
+                        debug = debug,
+                    )
+                except (BwydParserError, textx.exceptions.TextXError) as ex:
+                    if not keep_going:
+                        raise
+
+                    logging.error(f"{key}: {ex}")  # pylint: disable=W1203
+                    self.errors[sources[key]] = ex
+                    continue
+
+                if key in manifest.modules:
+                    changed_products.update(manifest.modules[key].products)
+
+                changed_products.update(entry.products)
+                manifest.modules[key] = entry
+
+            todo = manifest.dependents(changed_products) - done
+
+        # the index keeps the previous order, with new modules appended in
+        # source order, so that it only changes when a summary does
+
+        new_summaries: list = [ ( key, entry.summary, ) for key, entry in manifest.modules.items() ]
+
+        if old_summaries != new_summaries or not index_path.exists():
+            manifest.index_hash = self.render_index(
+                [ entry.summary for entry in manifest.modules.values() ],
+                index_path,
+            )
+
+            report.index_rendered = True
+
+        if self.precompressor is not None:
+            report.compressed = self.precompressor.flush()
+
+        return report
+
+
+    def _snapshot (
+        self,
+        dir_path: pathlib.Path,
+        glob: str,
+        ) -> typing.Dict[ str, typing.Tuple[ int, int ] ]:
+        """
+Private method to capture the `stat()` signatures of the sources.
+        """
+        snapshot: typing.Dict[ str, typing.Tuple[ int, int ] ] = {}
+
+        for bwyd_path in self.iter_files(dir_path, glob = glob):
+            try:
+                snapshot[str(bwyd_path)] = stat_signature(bwyd_path)
+            except FileNotFoundError:
+                # deleted while scanning
+                pass
+
+        return snapshot
+
+
+    def watch (  # pylint: disable=R0913,R0914
+        self,
+        dir_path: pathlib.Path,
+        *,
+        glob: str = "*.bwyd",
+        manifest_path: pathlib.Path | None = None,
+        index_path: pathlib.Path | None = None,
+        cache: ModuleCache | None = None,
+        render_cache: RenderCache | None = None,
+        interval: float = 0.25,
+        debounce: float = 0.5,
+        max_batches: int | None = None,
+        on_build: typing.Callable[ [ BuildReport ], None ] | None = None,
+        debug: bool = False,
+        ) -> None:
+        """
+Watch the given directory, by polling, and re-render modules as their
+sources change.
+
+After an initial incremental build, a burst of edits gets debounced
+until the sources have been quiet for `debounce` seconds, then only the
+touched modules (plus dependents) get parsed, interpreted and rendered,
+using the warm metamodel and the in-memory build manifest.
+Parser errors get logged without stopping the watch.
+
+Runs until interrupted, or until `max_batches` rebuilds have finished.
+Template or converter changes need a restart to take effect.
+        """
+        if manifest_path is None:
+            manifest_path = dir_path / MANIFEST_NAME
+
+        if index_path is None:
+            index_path = dir_path / "index.html"
+
+        report: BuildReport = self.build(
+            dir_path,
+            glob = glob,
+            manifest_path = manifest_path,
+            index_path = index_path,
+            cache = cache,
+            render_cache = render_cache,
+            debug = debug,
+        )
+
+        if on_build is not None:
+            on_build(report)
+
+        manifest: BuildManifest = BuildManifest.load(manifest_path)
+        snapshot: typing.Dict[ str, typing.Tuple[ int, int ] ] = self._snapshot(dir_path, glob)
+        pending: typing.Set[ str ] = set()
+        last_change: float = 0.0
+        batches: int = 0
 
-        with open(index_path, "w", encoding = "utf-8") as fp:
-            fp.write(html)
+        while max_batches is None or batches < max_batches:
+            time.sleep(interval)
+
+            current: typing.Dict[ str, typing.Tuple[ int, int ] ] = self._snapshot(dir_path, glob)
+
+            changed: typing.Set[ str ] = {
+                key
+                for key in set(current.keys()) | set(snapshot.keys())
+                if current.get(key) != snapshot.get(key)
+            }
+
+            snapshot = current
+
+            if len(changed) > 0:
+                pending.update(changed)
+                last_change = time.monotonic()
+                continue
+
+            if len(pending) < 1 or time.monotonic() - last_change < debounce:
+                continue
+
+            sources: typing.Dict[ str, pathlib.Path ] = {
+                key: pathlib.Path(key)
+                for key in current
+            }
+
+            # ignore files which were touched but not edited
+            stale: typing.Set[ str ] = {
+                key
+                for key in pending
+                if key in sources and (
+                    key not in manifest.modules
+                    or not self._is_fresh(manifest.modules[key], sources[key])
+                )
+            }
+
+            if debug:
+                ic(stale)
+
+            self.errors = {}
+
+            report = self._update(
+                manifest,
+                sources,
+                stale,
+                index_path,
+                cache = cache,
+                render_cache = render_cache,
+                keep_going = True,
+                debug = debug,
+            )
+
+            manifest.save(manifest_path)
+            pending.clear()
+            batches += 1
+
+            if on_build is not None:
+                on_build(report)
 
 
     def build_graph (  # pylint: disable=R0914
@@ -253,10 +1065,15 @@ Render an HTML index for search/discovery across a directory of recipes.
         modules: list[ Module ],
         *,
         debug: bool = False,  # pylint: disable=W0613
-        ) -> Graph:
+        ) -> "Graph":
         """
 Build a knowledge graph from the modules in this corpus.
         """
+        from rdflib.namespace import DCTERMS, RDF, SKOS  # pylint: disable=C0415
+        import rdflib  # pylint: disable=C0415
+
+        from .graph import Graph  # pylint: disable=C0415,W0621
+
         graph: Graph = Graph()
 
         class_closure: rdflib.URIRef = graph.compose_iri_instance("Closure")
@@ -378,38 +1195,174 @@ Build a knowledge graph from the modules in this corpus.
 ######################################################################
 ## parser/interpreter definitions
 
-class Bwyd:  # pylint: disable=R0903
+class LazyClassResource:  # pylint: disable=R0903
     """
-Bwyd DSL parser/interpreter.
+A descriptor for a class-level resource which gets loaded on first
+access, then by default cached on the owner class.
+Unpinned resources call their loader on every access instead, leaving
+any caching up to the loader.
+    """
+    def __init__ (
+        self,
+        loader: typing.Callable[ [], typing.Any ],
+        *,
+        pin: bool = True,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.loader: typing.Callable[ [], typing.Any ] = loader
+        self.pin: bool = pin
+        self.name: str = ""
+
+
+    def __set_name__ (
+        self,
+        owner: type,
+        name: str,
+        ) -> None:
+        """
+Record the attribute name under which this resource gets cached.
+        """
+        self.name = name
+
+
+    def __get__ (
+        self,
+        obj: typing.Any,
+        owner: type,
+        ) -> typing.Any:
+        """
+Load the resource, then replace this descriptor with its value
+if pinned.
+        """
+        value: typing.Any = self.loader()
+
+        if self.pin:
+            setattr(owner, self.name, value)
+
+        return value
+
+
+class MetaModelCache:
+    """
+A process-wide, in-memory cache of built `textx` metamodels, keyed by
+the hash of the grammar file.
+The grammar file's `stat()` signature gets checked on each access, so
+the metamodel rebuilds automatically whenever the grammar changes.
+
+A `textx` metamodel cannot be pickled, so this cache does not persist
+across processes; new processes which need to parse quickly should
+use the `"fast"` parser instead.
     """
-    META_MODEL: textx.metamodel.TextXMetaModel = textx.metamodel_from_file(
-        GRAMMAR_PATH,
-        debug = False, # True
-    )
+    def __init__ (
+        self,
+        grammar_path: pathlib.Path,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.grammar_path: pathlib.Path = grammar_path
+        self.builds: int = 0
+        self._stat_sig: typing.Optional[ typing.Tuple[ int, int ] ] = None
+        self._key: str = ""
+        self._meta_models: typing.Dict[ str, textx.metamodel.TextXMetaModel ] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+
+    def get_key (
+        self,
+        ) -> str:
+        """
+Accessor for the cache key of the current grammar, which only gets
+rehashed when the grammar file's size or modification time changes.
+        """
+        stat: os.stat_result = self.grammar_path.stat()
+        stat_sig: typing.Tuple[ int, int ] = ( stat.st_mtime_ns, stat.st_size, )
+
+        if stat_sig != self._stat_sig:
+            digest = hashlib.sha256(self.grammar_path.read_bytes())
+            self._key = digest.hexdigest()
+            self._stat_sig = stat_sig
+
+        return self._key
 
+
+    def get (
+        self,
+        ) -> textx.metamodel.TextXMetaModel:
+        """
+Return the metamodel for the current grammar, building it if needed.
+        """
+        with self._lock:
+            key: str = self.get_key()
+
+            if key not in self._meta_models:
+                # only the current grammar is worth keeping
+                self._meta_models.clear()
+                self._meta_models[key] = textx.metamodel_from_file(
+                    self.grammar_path,
+                    debug = False, # True
+                )
+
+                self.builds += 1
+
+            return self._meta_models[key]
+
+
+META_MODEL_CACHE: MetaModelCache = MetaModelCache(GRAMMAR_PATH)
+
+PARSERS: typing.Tuple[ str, ... ] = ( "textx", "fast", )
+
+
+def load_unit_converter (
+    ) -> Converter:
+    """
+Load the default measurements unit converter.
+    """
     with open(CONVERT_PATH, "r", encoding = "utf-8") as fp:
-        UNIT_CONVERTER: Converter = {
+        return {
             conv.symbol: conv
             for row in json.load(fp)
             for conv in [ Conversion.model_validate(row) ]
         }
 
 
+class Bwyd:  # pylint: disable=R0903
+    """
+Bwyd DSL parser/interpreter.
+    """
+    META_MODEL: textx.metamodel.TextXMetaModel = LazyClassResource(META_MODEL_CACHE.get, pin = False)  # type: ignore  # pylint: disable=C0301
+    UNIT_CONVERTER: Converter = LazyClassResource(load_unit_converter)  # type: ignore
+
+
     def __init__ (
         self,
         *,
         config_path: pathlib.Path | None = None,
-        converter: Converter = UNIT_CONVERTER,
+        converter: Converter | None = None,
+        parser: str = "textx",
         ) -> None:
         """
 Constructor.
+
+The `parser` argument selects between the `textx` metamodel built from
+the grammar, or `"fast"` for the dedicated recursive-descent parser
+which produces the same parse tree.
         """
+        if parser not in PARSERS:
+            raise ValueError(f"unknown parser `{parser}`, expected one of {PARSERS}")
+
+        self.parser: str = parser
         self.config: dict = {}
 
         if config_path is not None:
             with open(config_path, mode = "rb") as fp:
                 self.config = tomllib.load(fp)
 
+        if converter is None:
+            converter = self.UNIT_CONVERTER
+
         self.converter: Converter = converter
 
 
@@ -434,16 +1387,77 @@ Extend the measurements unit converter by merging with provided conversions.
         """
 Initialize a parser to load one Bywd module from a file.
         """
+        parse_tree: typing.Any = None
+
+        if self.parser == "fast":
+            parse_tree = parse_file(path)
+        else:
+            parse_tree = self.META_MODEL.model_from_file(
+                path,
+                debug = debug,
+            )
+
         return Module(
             path,
-            self.META_MODEL.model_from_file(
+            parse_tree,
+            self.converter,
+            slug = slug,
+        )
+
+
+    def load (
+        self,
+        path: pathlib.Path,
+        *,
+        slug: str | None = None,
+        release_parse_tree: bool = True,
+        trusted: bool = True,
+        debug: bool = False,
+        ) -> Module:
+        """
+Parse and interpret one Bwyd module from a file.
+
+With the `"fast"` parser this happens in a single pass, using object
+processors which interpret each `CLOSURE` as soon as it has been
+parsed, so the full parse tree never gets held in memory.
+The `textx` metamodel only calls its object processors after the
+whole model has been built, so that parser interprets in a second
+pass instead, then by default releases the parse tree.
+
+Set `trusted` to `False` to fully validate each data class built from
+parser-produced values, instead of using trusted construction.
+        """
+        if self.parser != "fast":
+            module: Module = self.parse(
                 path,
+                slug = slug,
+            )
+
+            module.interpret(
+                release_parse_tree = release_parse_tree,
+                trusted = trusted,
                 debug = debug,
-            ),
+            )
+
+            return module
+
+        module = Module(
+            path,
+            None,
             self.converter,
             slug = slug,
         )
 
+        parse_file(
+            path,
+            processors = module.get_processors(
+                trusted = trusted,
+                debug = debug,
+            ),
+        )
+
+        return module
+
 
     def build_corpus (
         self,
@@ -454,4 +1468,71 @@ Factory for initializing a corpus of Bywd modules.
         return Corpus(
             config = self.config,
             converter = self.converter,
+            parser = self.parser,
+        )
+
+
+######################################################################
+## process pool workers
+
+_WORKER_DSL: Bwyd | None = None
+
+
+def _get_mp_context (
+    ) -> typing.Optional[ multiprocessing.context.BaseContext ]:
+    """
+Start method for the worker processes: `forkserver` where available,
+which never forks a parent that may already run threads, e.g., the
+render or precompression pools. The server imports this package once,
+so that each worker forked from it starts without importing it again.
+Otherwise use the platform default.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return None
+
+    context: multiprocessing.context.ForkServerContext = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([ "bwyd.dsl" ])
+
+    return context
+
+
+def _init_worker (
+    converter: Converter,
+    parser: str,
+    ) -> None:
+    """
+Pre-warm one worker process, so that the parser and the unit
+converter get loaded once per worker rather than once per file.
+    """
+    global _WORKER_DSL  # pylint: disable=W0603
+
+    _WORKER_DSL = Bwyd(converter = converter, parser = parser)
+
+    if parser == "textx":
+        META_MODEL_CACHE.get()
+
+
+def _parse_worker (
+    path: pathlib.Path,
+    debug: bool,
+    ) -> typing.Tuple[ pathlib.Path, Module | None, BwydParserError | None ]:
+    """
+Parse and interpret one module within a worker process, reporting
+any parser errors back to the caller instead of raising them.
+    """
+    dsl: Bwyd = _WORKER_DSL if _WORKER_DSL is not None else Bwyd()
+
+    try:
+        module: Module = dsl.load(
+            path,
+            slug = path.stem,
+            debug = debug,
         )
+
+        return path, module, None
+
+    except BwydParserError as ex:
+        return path, None, ex
+
+    except textx.exceptions.TextXError as ex:
+        return path, None, BwydParserError(str(ex))
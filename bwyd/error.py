@@ -6,6 +6,8 @@ Bwyd language exception handling.
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
+import typing
+
 
 ######################################################################
 ## exception handling
@@ -25,3 +27,27 @@ Custom exception which notes a Bwyd language discrepancy.
         """
         super().__init__(*args)
         self.symbol = kwargs.get("symbol")
+
+
+    def __reduce__ (
+        self,
+        ) -> tuple:
+        """
+Pickle support, which keeps the symbol when errors get reported
+back from worker processes.
+        """
+        return (
+            _rebuild_error,
+            ( self.__class__, self.args, self.symbol, ),
+        )
+
+
+def _rebuild_error (
+    cls: type,
+    args: tuple,
+    symbol: typing.Any,
+    ) -> BwydParserError:
+    """
+Reconstruct an unpickled parser exception.
+    """
+    return cls(*args, symbol = symbol)
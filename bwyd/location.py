@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Source locations within Bwyd modules, resolved lazily.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import bisect
+import re
+import typing
+
+
+class LineIndex:  # pylint: disable=R0903
+    """
+A per-file index of line starts, which maps character offsets within
+a source text to line/column pairs, the same way the `arpeggio` parser
+does for `textx.get_location`.
+    """
+    def __init__ (
+        self,
+        text: str,
+        *,
+        filename: str | None = None,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.filename: str | None = filename
+        self.line_ends: typing.List[ int ] = [
+            match.start()
+            for match in re.finditer("\n", text)
+        ]
+
+
+    @classmethod
+    def from_model (
+        cls,
+        root: typing.Any,
+        ) -> "LineIndex":
+        """
+Get the line index for the root of a parse tree, reusing the one which
+the fast parser attached, or else indexing the `textx` parser input.
+        """
+        parser: typing.Any = root._tx_parser  # pylint: disable=W0212
+
+        if isinstance(parser, LineIndex):
+            return parser
+
+        return cls(
+            parser.input,
+            filename = root._tx_filename,  # pylint: disable=W0212
+        )
+
+
+    def pos_to_linecol (
+        self,
+        pos: int,
+        ) -> typing.Tuple[ int, int ]:
+        """
+Convert a character offset into 1-based line and column numbers.
+        """
+        line: int = bisect.bisect_left(self.line_ends, pos)
+        col: int = pos
+
+        if line > 0:
+            col -= self.line_ends[line - 1] + 1
+
+        return line + 1, col + 1
+
+
+class SourceLocation:
+    """
+The compact location of one parsed element: a pair of character offsets
+plus a reference to the line index of its file. The line and column
+only get resolved when this location gets reported, and it prints the
+same as the dictionary returned by `textx.get_location`.
+    """
+    __slots__ = ( "index", "start", "end", )
+
+
+    def __init__ (
+        self,
+        index: LineIndex,
+        start: int,
+        end: int,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.index: LineIndex = index
+        self.start: int = start
+        self.end: int = end
+
+
+    @classmethod
+    def of (
+        cls,
+        index: LineIndex,
+        node: typing.Any,
+        ) -> "SourceLocation":
+        """
+Factory for the location of a parse node.
+        """
+        return cls(
+            index,
+            node._tx_position,  # pylint: disable=W0212
+            node._tx_position_end,  # pylint: disable=W0212
+        )
+
+
+    def to_dict (
+        self,
+        ) -> dict:
+        """
+Resolve this location into line, column, length, and filename.
+        """
+        line, col = self.index.pos_to_linecol(self.start)
+
+        return {
+            "line": line,
+            "col": col,
+            "nchar": self.end - self.start,
+            "filename": self.index.filename,
+        }
+
+
+    def __str__ (
+        self,
+        ) -> str:
+        """
+Format the resolved location, for error messages.
+        """
+        return str(self.to_dict())
+
+
+    def __repr__ (
+        self,
+        ) -> str:
+        """
+Represent the resolved location.
+        """
+        return repr(self.to_dict())
+
+
+    def __eq__ (
+        self,
+        other: object,
+        ) -> bool:
+        """
+Locations are equal when they span the same text in the same file.
+        """
+        if not isinstance(other, SourceLocation):
+            return NotImplemented
+
+        return (
+            self.start == other.start
+            and self.end == other.end
+            and self.index.filename == other.index.filename
+        )
+
+
+    def __hash__ (
+        self,
+        ) -> int:
+        """
+Hash consistently with equality.
+        """
+        return hash(( self.start, self.end, self.index.filename, ))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Build manifest for incremental rendering of a corpus of Bwyd modules.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import typing
+
+from pydantic import BaseModel
+
+
+# bump this whenever the manifest layout changes
+MANIFEST_VERSION: int = 1
+
+
+def bytes_digest (
+    data: bytes,
+    ) -> str:
+    """
+Hash a rendered output.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def stream_to_file (
+    path: pathlib.Path,
+    chunks: typing.Iterable[ str ],
+    ) -> str:
+    """
+Write a rendered output to a file as a stream of text chunks, encoded
+and hashed one at a time, returning the same hash as `bytes_digest()`
+of the full contents.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "wb") as fp:
+        for chunk in chunks:
+            data: bytes = chunk.encode("utf-8")
+            digest.update(data)
+            fp.write(data)
+
+    return digest.hexdigest()
+
+
+def write_if_changed (
+    path: pathlib.Path,
+    data: bytes,
+    ) -> bool:
+    """
+Write a rendered output only when its contents would change, which
+keeps timestamps stable for downstream sync tools and CDN invalidation.
+A different size means a change, without reading the previous file.
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.write_bytes(data)
+    return True
+
+
+def stat_signature (
+    path: pathlib.Path,
+    ) -> typing.Tuple[ int, int ]:
+    """
+Cheap change detector for a file, based on its size and modification
+time, which avoids rehashing files that have not been touched.
+    """
+    stat: os.stat_result = path.stat()
+    return ( stat.st_mtime_ns, stat.st_size, )
+
+
+class ManifestEntry (BaseModel):  # pylint: disable=R0902
+    """
+A data class representing the build state of one source module.
+    """
+    source_hash: str
+    source_stat: typing.Tuple[ int, int ]
+    output_path: str
+    output_hash: str
+    products: typing.List[ str ] = []
+    uses: typing.List[ str ] = []
+    summary: dict = {}
+
+
+class BuildManifest (BaseModel):  # pylint: disable=R0902
+    """
+A data class representing the build state of one corpus, recording
+the input hashes, output hashes, and `USE` dependencies of each module.
+    """
+    version: int = MANIFEST_VERSION
+    build_hash: str = ""
+    index_hash: str = ""
+    modules: typing.Dict[ str, ManifestEntry ] = {}
+
+
+    @classmethod
+    def load (
+        cls,
+        path: pathlib.Path,
+        ) -> "BuildManifest":
+        """
+Load a manifest from disk, or start a fresh one if it is missing,
+unreadable, or from an older layout.
+        """
+        if not path.exists():
+            return cls()
+
+        try:
+            manifest: BuildManifest = cls.model_validate_json(path.read_bytes())
+        except ValueError as ex:
+            logging.warning(f"ignoring unreadable build manifest {path}: {ex}")  # pylint: disable=W1203
+            return cls()
+
+        if manifest.version != MANIFEST_VERSION:
+            return cls()
+
+        return manifest
+
+
+    def save (
+        self,
+        path: pathlib.Path,
+        ) -> None:
+        """
+Write this manifest to disk atomically.
+        """
+        tmp_path: pathlib.Path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(self.model_dump_json(indent = 1), encoding = "utf-8")
+        os.replace(tmp_path, path)
+
+
+    def dependents (
+        self,
+        products: typing.Set[ str ],
+        ) -> typing.Set[ str ]:
+        """
+Find the modules which `USE` any of the given products from another
+module. Callers follow the dependencies transitively by rebuilding
+the dependents, then asking again about their products.
+
+For now `Module.validate()` rejects a `USE` of any product which the
+same module does not produce, so this finds no dependents yet: the
+tracking is kept so that incremental builds stay correct once `USE`
+can cross modules.
+        """
+        return {
+            key
+            for key, entry in self.modules.items()
+            # only count the uses which this module does not produce itself
+            if len((set(entry.uses) - set(entry.products)) & products) > 0
+        }
+
+
+class BuildReport (BaseModel):  # pylint: disable=R0902
+    """
+A data class summarizing what one corpus build did.
+    """
+    rendered: typing.List[ str ] = []
+    written: typing.List[ str ] = []
+    removed: typing.List[ str ] = []
+    compressed: typing.List[ str ] = []
+    index_rendered: bool = False
+
+
+class RenderReport (BaseModel):  # pylint: disable=R0902
+    """
+A data class summarizing one rendering pass over a corpus.
+    """
+    rendered: typing.List[ str ] = []
+    written: typing.List[ str ] = []
+    compressed: typing.List[ str ] = []
+    workers: int = 1
+    elapsed: float = 0.0
+
+
+    def pages_per_sec (
+        self,
+        ) -> float:
+        """
+Throughput of the rendering pass, from parsing through writing.
+        """
+        if self.elapsed <= 0.0:
+            return 0.0
+
+        return len(self.rendered) / self.elapsed
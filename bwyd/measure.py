@@ -9,12 +9,18 @@ see copyright/license https://github.com/DerwenAI/bwyd/README.md
 from collections import OrderedDict
 from fractions import Fraction
 import enum
+import functools
 import logging
 import typing
 
 from icecream import ic  # type: ignore  # pylint: disable=W0611
 from pydantic import BaseModel, NonNegativeFloat, PositiveFloat
-import inflect
+
+from .construct import trusted_construct
+
+# heavy dependencies get imported on first use, to keep startup fast
+if typing.TYPE_CHECKING:
+    import inflect
 
 
 class MeasureUnits (enum.StrEnum):
@@ -34,6 +40,117 @@ An enumeration class representing string literals for Measure units.
 OUNCE_PER_POUND: float = 16.0
 CUP_PER_LITER: float = 4.226753
 POUND_PER_GRAM: float = 0.002204623
+TSP_PER_CUP: float = 48.0
+TBSP_PER_CUP: float = 16.0
+
+# thresholds for humanizing imperial amounts, shared with `batch.py`
+TSP_MAX_CUPS: float = 0.0615
+TBSP_MAX_CUPS: float = 0.24
+CUP_MIN_VOLUME: float = 0.25
+POUND_MIN_MASS: float = 0.25
+MIXED_MIN_AMOUNT: float = 0.95
+ONE_DIGIT_MIN_AMOUNT: float = 0.4
+FRACTION_ROUND_UP: float = 0.9
+FRACTION_ROUND_DOWN: float = 0.2
+
+
+class UnitDimension (enum.StrEnum):
+    """
+An enumeration class representing what a Measure unit measures.
+    """
+    MASS = enum.auto()
+    VOLUME = enum.auto()
+
+
+# the size of each unit, in grams for mass or in liters for volume
+UNIT_SIZES: typing.Dict[ str, typing.Tuple[ UnitDimension, float ] ] = {
+    MeasureUnits.TEASPOON.value: ( UnitDimension.VOLUME, 1.0 / CUP_PER_LITER / TSP_PER_CUP, ),
+    MeasureUnits.TABLESPOON.value: ( UnitDimension.VOLUME, 1.0 / CUP_PER_LITER / TBSP_PER_CUP, ),
+    MeasureUnits.CUP.value: ( UnitDimension.VOLUME, 1.0 / CUP_PER_LITER, ),
+    MeasureUnits.LITER.value: ( UnitDimension.VOLUME, 1.0, ),
+    MeasureUnits.MILLILITER.value: ( UnitDimension.VOLUME, 0.001, ),
+    MeasureUnits.POUND.value: ( UnitDimension.MASS, 1.0 / POUND_PER_GRAM, ),
+    MeasureUnits.OUNCE.value: ( UnitDimension.MASS, 1.0 / POUND_PER_GRAM / OUNCE_PER_POUND, ),
+    MeasureUnits.GRAM.value: ( UnitDimension.MASS, 1.0, ),
+    MeasureUnits.KILOGRAM.value: ( UnitDimension.MASS, 1000.0, ),
+}
+
+METRIC_UNITS: typing.FrozenSet[ str ] = frozenset([
+    MeasureUnits.LITER.value,
+    MeasureUnits.MILLILITER.value,
+    MeasureUnits.GRAM.value,
+    MeasureUnits.KILOGRAM.value,
+])
+
+# each ( from, to ) pair of units maps to a ratio ( numerator, denominator ),
+# so that converting an amount is `amount * numerator / denominator`, which
+# keeps the stated constants and densities exact
+UnitFactors = typing.Dict[ typing.Tuple[ str, str ], typing.Tuple[ float, float ] ]
+
+
+def _unit_factor (
+    from_units: str,
+    to_units: str,
+    ) -> typing.Tuple[ float, float ]:
+    """
+Conversion ratio between two units of the same dimension.
+    """
+    exact: UnitFactors = {
+        ( MeasureUnits.GRAM.value, MeasureUnits.POUND.value, ): ( POUND_PER_GRAM, 1.0, ),
+        ( MeasureUnits.LITER.value, MeasureUnits.CUP.value, ): ( CUP_PER_LITER, 1.0, ),
+    }
+
+    if ( from_units, to_units, ) in exact:
+        return exact[( from_units, to_units, )]
+
+    return ( UNIT_SIZES[from_units][1], UNIT_SIZES[to_units][1], )
+
+
+UNIT_FACTORS: UnitFactors = {
+    ( from_units, to_units, ): _unit_factor(from_units, to_units)
+    for from_units, ( from_dim, _ ) in UNIT_SIZES.items()
+    for to_units, ( to_dim, _ ) in UNIT_SIZES.items()
+    if from_dim == to_dim
+}
+
+
+@functools.cache
+def conversion_factors (
+    density: float,
+    imperial: str,
+    metric: str,
+    ) -> UnitFactors:
+    """
+Precompute the full unit-to-unit factor table for one ingredient,
+given its density as the amount in `metric` units per one `imperial`
+unit, e.g., grams per cup. This extends the generic factors with the
+conversions between mass and volume.
+    """
+    factors: UnitFactors = dict(UNIT_FACTORS)
+    metric_dim, metric_size = UNIT_SIZES[metric]
+    imperial_dim, imperial_size = UNIT_SIZES[imperial]
+
+    if metric_dim == imperial_dim:
+        return factors
+
+    # the size of one unit of volume in units of mass, for this ingredient
+    mass_per_volume: float = density * metric_size / imperial_size
+
+    if metric_dim == UnitDimension.VOLUME:
+        mass_per_volume = 1.0 / mass_per_volume
+
+    for from_units, ( from_dim, from_size ) in UNIT_SIZES.items():
+        for to_units, ( to_dim, to_size ) in UNIT_SIZES.items():
+            if from_dim == UnitDimension.MASS and to_dim == UnitDimension.VOLUME:
+                factors[( from_units, to_units, )] = ( from_size, mass_per_volume * to_size, )
+            elif from_dim == UnitDimension.VOLUME and to_dim == UnitDimension.MASS:
+                factors[( from_units, to_units, )] = ( from_size * mass_per_volume, to_size, )
+
+    # keep the stated density exact
+    factors[( metric, imperial, )] = ( 1.0, density, )
+    factors[( imperial, metric, )] = ( density, 1.0, )
+
+    return factors
 
 
 class DurationUnits (enum.StrEnum):
@@ -66,7 +183,78 @@ An enumeration class representing string literals for Temperature units.
     FAHRENHEIT = "F"
 
 
-PLURAL = inflect.engine()
+@functools.cache
+def get_plural_engine (
+    ) -> "inflect.engine":
+    """
+Build the `inflect` engine used for pluralization on first use,
+since importing `inflect` is notoriously slow.
+    """
+    import inflect  # pylint: disable=C0415
+
+    return inflect.engine()
+
+
+@functools.cache
+def get_plural_table (
+    ) -> typing.Dict[ str, str ]:
+    """
+Precompute the plurals of the `MeasureUnits` and `DurationUnits` names
+on first use, since these few names get pluralized over and over.
+    """
+    engine: "inflect.engine" = get_plural_engine()
+
+    return {
+        units.value: engine.plural(units.value)
+        for units in [ *MeasureUnits, *DurationUnits ]
+    }
+
+
+def pluralize (
+    units: str,
+    ) -> str:
+    """
+Plural of a unit name, looked up in the precomputed table.
+    """
+    plural: typing.Optional[ str ] = get_plural_table().get(units)
+
+    if plural is None:
+        plural = get_plural_engine().plural(units)
+
+    return plural
+
+
+@functools.cache
+def get_fraction_table (
+    denom_limit: int,
+    ) -> typing.Dict[ float, str ]:
+    """
+Precompute the humanized fractions for each amount in [0.0, 1.0]
+rounded to hundredths, given a limit on the denominator.
+    """
+    return {
+        i / 100.0: str(Fraction(i / 100.0).limit_denominator(denom_limit))
+        for i in range(101)
+    }
+
+
+def humanize_fraction (
+    amount: float,
+    digits: int,
+    denom_limit: int,
+    ) -> str:
+    """
+Humanize an amount rounded to the given decimal `digits` as a fraction
+with a limited denominator, looked up in the precomputed table for
+amounts in [0.0, 1.0].
+    """
+    rounded: float = round(amount, digits)
+    human: typing.Optional[ str ] = get_fraction_table(denom_limit).get(rounded)
+
+    if human is None:
+        human = str(Fraction(rounded).limit_denominator(denom_limit))
+
+    return human
 
 
 class Conversion (BaseModel):  # pylint: disable=R0902
@@ -79,9 +267,46 @@ A data class representing one Conversion object.
     metric: str = MeasureUnits.GRAM.value
 
 
+    def get_factors (
+        self,
+        ) -> UnitFactors:
+        """
+Accessor for the unit-to-unit factor table of this ingredient,
+which gets precomputed once per distinct conversion.
+        """
+        return conversion_factors(self.density, self.imperial, self.metric)
+
+
 Converter = typing.Dict[ str, Conversion ]
 
 
+class ImperialMode (enum.StrEnum):
+    """
+An enumeration class representing how an imperial amount gets humanized.
+    """
+    CUP = enum.auto()
+    VOLUME = enum.auto()
+    MASS = enum.auto()
+    GENERIC = enum.auto()
+
+
+class ImperialPlan (BaseModel):  # pylint: disable=R0902
+    """
+A data class representing how to humanize the imperial equivalent of
+a metric measure: multiply its amount by `numerator`, divide by
+`denominator`, then humanize according to `mode`:
+
+  * `CUP`: cups, or tablespoons/teaspoons for small amounts
+  * `VOLUME`: cups, or as `CUP` for less than a quarter cup
+  * `MASS`: pounds, or ounces for less than a quarter pound
+  * `GENERIC`: the given `units`
+    """
+    numerator: float
+    denominator: float
+    mode: ImperialMode
+    units: MeasureUnits
+
+
 class Humanized (BaseModel):  # pylint: disable=R0902
     """
 A data class representing one humanized Measure object.
@@ -103,7 +328,7 @@ Denormalize a meaure which is already in human-readable form.
         units: str = self.units.value
 
         if self.amount > 1.0 and self.human != "1" and self.units != MeasureUnits.TEASPOON:
-            units = PLURAL.plural(units)
+            units = pluralize(units)
 
         return f" ({self.human} {units})"
 
@@ -120,17 +345,29 @@ A data class representing one parsed Measure object.
     def build (
         cls,
         parse: typing.Any,
+        *,
+        trusted: bool = False,
         ) -> "Measure":
         """
-Constructor from a `textx` parse object.
+Constructor from a `textx` parse object, optionally using trusted
+construction.
         """
         measure_units: typing.Optional[ str ] = None
 
         if parse.units is not None:
             measure_units = MeasureUnits(parse.units).value
 
+        amount: float = float(parse.amount)
+
+        # the grammar allows a signed number, so validate negative amounts
+        if trusted and amount >= 0.0:
+            return trusted_construct(
+                Measure,
+                { "amount": amount, "units": measure_units, },
+            )
+
         return Measure(
-            amount = float(parse.amount),
+            amount = amount,
             units = measure_units,
         )
 
@@ -141,13 +378,25 @@ Constructor from a `textx` parse object.
         """
 Denormalize this measure into human-readable form.
         """
-        html: str = f"{self.amount}"
+        return self.humanize_amount(self.amount, self.units)
+
+
+    @classmethod
+    def humanize_amount (
+        cls,
+        amount: float,
+        units: typing.Optional[ str ],
+        ) -> str:
+        """
+Denormalize an amount in the given units into human-readable form.
+        """
+        html: str = f"{amount}"
 
         if html.endswith(".0"):
             html = html[:-2]
 
-        if self.units is not None:
-            html = f"{html} {self.units}"
+        if units is not None:
+            html = f"{html} {units}"
 
         return html
 
@@ -164,48 +413,171 @@ imperial conversion if available.
         """
         amount: str = self.humanize().strip()
 
-        if converter is not None:
-            if symbol in converter:
-                conv: Conversion = converter[symbol]
+        if converter is None or self.units is None:
+            return amount
+
+        conv: typing.Optional[ Conversion ] = converter.get(symbol)
 
-                if self.units == conv.metric:
-                    imper_amount: float = self.amount / conv.density
-                    human: Humanized = self._humanize_cup(imper_amount)
-                    amount += human.denormalize()
+        if conv is None and not external:
+            logging.warning(f"no conversion ratio for {symbol}")  # pylint: disable=W1203
 
-            elif self.units is not None:
-                if not external:
-                    logging.warning(f"no conversion ratio for {symbol}")  # pylint: disable=W1203
+        human: typing.Optional[ Humanized ] = self._humanize_imperial(conv)
 
-                match self.units:
-                    case MeasureUnits.GRAM.value:
-                        imper_amount = self.amount * POUND_PER_GRAM
+        if human is not None:
+            amount += human.denormalize()
+
+        return amount
 
-                        if imper_amount < 0.25:
-                            imper_amount *= OUNCE_PER_POUND
 
-                            if imper_amount > 0.95:
-                                human = self._humanize_generic(imper_amount, MeasureUnits.OUNCE)
-                            else:
-                                human = Humanized(
-                                    amount = imper_amount,
-                                    human = str(round(imper_amount, 2)),
-                                    units = MeasureUnits.OUNCE,
-                                )
-                        else:
-                            human = self._humanize_generic(imper_amount, MeasureUnits.POUND)
+    def convert (
+        self,
+        units: str,
+        *,
+        conversion: typing.Optional[ Conversion ] = None,
+        ) -> "Measure":
+        """
+Convert this measure into any compatible units, with a lookup in the
+precomputed factor table: the generic one, or else the table for the
+given ingredient conversion, which also converts between mass and
+volume.
+        """
+        factors: UnitFactors = UNIT_FACTORS
 
-                        amount += human.denormalize()
+        if conversion is not None:
+            factors = conversion.get_factors()
 
-                    case MeasureUnits.LITER.value:
-                        imper_amount = self.amount * CUP_PER_LITER
-                        human = self._humanize_generic(imper_amount, MeasureUnits.CUP)
-                        amount += human.denormalize()
+        factor: typing.Optional[ typing.Tuple[ float, float ] ] = factors.get(( self.units, units, ))  # type: ignore  # pylint: disable=C0301
 
-                    case _:
-                        logging.warning(f"no default conversion for unit `{self.units}`")  # pylint: disable=W1203
+        if factor is None:
+            raise ValueError(f"cannot convert `{self.units}` into `{units}`")
 
-        return amount
+        return Measure(
+            amount = self.amount * factor[0] / factor[1],
+            units = units,
+        )
+
+
+    @classmethod
+    def imperial_plan (
+        cls,
+        units: str,
+        conv: typing.Optional[ Conversion ],
+        ) -> typing.Optional[ ImperialPlan ]:
+        """
+Plan how to humanize the imperial equivalent of a measure in metric
+`units`: in the imperial units of its ingredient conversion if
+available, otherwise in pounds for mass or cups for volume.
+        """
+        if units not in METRIC_UNITS:
+            if conv is None:
+                logging.warning(f"no default conversion for unit `{units}`")  # pylint: disable=W1203
+
+            return None
+
+        if conv is not None:
+            factor: typing.Optional[ typing.Tuple[ float, float ] ] = conv.get_factors().get(( units, conv.imperial, ))  # type: ignore  # pylint: disable=C0301
+
+            if factor is None:
+                return None
+
+            mode: ImperialMode = ImperialMode.GENERIC
+
+            if conv.imperial == MeasureUnits.CUP.value:
+                mode = ImperialMode.CUP
+
+            return ImperialPlan(
+                numerator = factor[0],
+                denominator = factor[1],
+                mode = mode,
+                units = MeasureUnits(conv.imperial),
+            )
+
+        if UNIT_SIZES[units][0] == UnitDimension.VOLUME:
+            factor = UNIT_FACTORS[( units, MeasureUnits.CUP.value, )]
+
+            return ImperialPlan(
+                numerator = factor[0],
+                denominator = factor[1],
+                mode = ImperialMode.VOLUME,
+                units = MeasureUnits.CUP,
+            )
+
+        factor = UNIT_FACTORS[( units, MeasureUnits.POUND.value, )]
+
+        return ImperialPlan(
+            numerator = factor[0],
+            denominator = factor[1],
+            mode = ImperialMode.MASS,
+            units = MeasureUnits.POUND,
+        )
+
+
+    @classmethod
+    def humanize_imperial (
+        cls,
+        imper_amount: float,
+        plan: ImperialPlan,
+        ) -> Humanized:
+        """
+Humanize an amount which has been converted into the imperial units
+of a plan.
+        """
+        if plan.mode == ImperialMode.CUP:
+            return cls._humanize_cup(imper_amount)
+
+        if plan.mode == ImperialMode.GENERIC:
+            return cls._humanize_generic(imper_amount, plan.units)
+
+        if plan.mode == ImperialMode.VOLUME:
+            # humanize small volumes as tablespoons or teaspoons
+            if imper_amount < CUP_MIN_VOLUME:
+                return cls._humanize_cup(imper_amount)
+
+            return cls._humanize_generic(imper_amount, MeasureUnits.CUP)
+
+        return cls._humanize_mass(imper_amount)
+
+
+    @classmethod
+    def _humanize_mass (
+        cls,
+        amount: float,
+        ) -> Humanized:
+        """
+Private method to humanize imperial measurement ratios, for pounds,
+or for ounces when less than a quarter pound.
+        """
+        if amount >= POUND_MIN_MASS:
+            return cls._humanize_generic(amount, MeasureUnits.POUND)
+
+        amount *= OUNCE_PER_POUND
+
+        if amount > MIXED_MIN_AMOUNT:
+            return cls._humanize_generic(amount, MeasureUnits.OUNCE)
+
+        return Humanized(
+            amount = amount,
+            human = str(round(amount, 2)),
+            units = MeasureUnits.OUNCE,
+        )
+
+
+    def _humanize_imperial (
+        self,
+        conv: typing.Optional[ Conversion ],
+        ) -> typing.Optional[ Humanized ]:
+        """
+Private method to humanize the imperial equivalent of a metric measure.
+        """
+        plan: typing.Optional[ ImperialPlan ] = self.imperial_plan(self.units, conv)  # type: ignore
+
+        if plan is None:
+            return None
+
+        return self.humanize_imperial(
+            self.amount * plan.numerator / plan.denominator,
+            plan,
+        )
 
 
     @classmethod
@@ -219,10 +591,10 @@ Private method to humanize imperial measurement ratios, for generic case.
         """
         denom_limit: int = 4
 
-        if amount > .95:
+        if amount > MIXED_MIN_AMOUNT:
             human: str = cls.fix_fraction(amount)
         else:
-            human = str(Fraction(round(amount, 2)).limit_denominator(denom_limit))
+            human = humanize_fraction(amount, 2, denom_limit)
 
         return Humanized(
             amount = amount,
@@ -242,16 +614,16 @@ Private method to humanize imperial measurement ratios, for cup.
         units: MeasureUnits = MeasureUnits.CUP
         denom_limit: int = 4
 
-        if amount <= 0.0615:
-            return cls._humanize_tsp(amount * 48.0)
+        if amount <= TSP_MAX_CUPS:
+            return cls._humanize_tsp(amount * TSP_PER_CUP)
 
-        if amount <= 0.24:
-            return cls._humanize_tbsp(amount * 16.0)
+        if amount <= TBSP_MAX_CUPS:
+            return cls._humanize_tbsp(amount * TBSP_PER_CUP)
 
         if amount >= 1.0:
             human: str = cls.fix_fraction(amount)
         else:
-            human = str(Fraction(round(amount, 2)).limit_denominator(denom_limit))
+            human = humanize_fraction(amount, 2, denom_limit)
 
         return Humanized(
             amount = amount,
@@ -271,12 +643,12 @@ Private method to humanize imperial measurement ratios, for tablespoon.
         units: MeasureUnits = MeasureUnits.TABLESPOON
         denom_limit: int = 8
 
-        if amount >= 0.95:
+        if amount >= MIXED_MIN_AMOUNT:
             human: str = cls.fix_fraction(amount)
-        elif amount >= 0.4:
-            human = str(Fraction(round(amount, 1)).limit_denominator(denom_limit))
+        elif amount >= ONE_DIGIT_MIN_AMOUNT:
+            human = humanize_fraction(amount, 1, denom_limit)
         else:
-            human = str(Fraction(round(amount, 2)).limit_denominator(denom_limit))
+            human = humanize_fraction(amount, 2, denom_limit)
 
         # plural for teaspoons is too easily confused with tablespoon
 
@@ -298,12 +670,12 @@ Private method to humanize imperial measurement ratios, for teaspoon.
         units: MeasureUnits = MeasureUnits.TEASPOON
         denom_limit: int = 8
 
-        if amount >= 0.95:
+        if amount >= MIXED_MIN_AMOUNT:
             human: str = cls.fix_fraction(amount)
-        elif amount >= 0.4:
-            human = str(Fraction(round(amount, 1)).limit_denominator(denom_limit))
+        elif amount >= ONE_DIGIT_MIN_AMOUNT:
+            human = humanize_fraction(amount, 1, denom_limit)
         else:
-            human = str(Fraction(round(amount, 2)).limit_denominator(denom_limit))
+            human = humanize_fraction(amount, 2, denom_limit)
 
         # plural for teaspoons is too easily confused with tablespoon
 
@@ -325,17 +697,31 @@ Humanize fractions representing imperial measurement ratios >= 1.0
         base: int = int(amount)
         frac: float = amount - float(base)
 
-        if frac >= 0.9:
+        if frac >= FRACTION_ROUND_UP:
             return str(round(amount))
-        if frac < 0.2:
+        if frac < FRACTION_ROUND_DOWN:
             return str(base)
 
         denom_limit: int = 4
-        human = str(Fraction(round(frac, 2)).limit_denominator(denom_limit))
+        human = humanize_fraction(frac, 2, denom_limit)
 
         return f"{base:d} {human}"
 
 
+    def scale (
+        self,
+        factor: float,
+        ) -> "Measure":
+        """
+A new measure with this amount multiplied by a positive `factor`,
+in the same units.
+        """
+        return trusted_construct(
+            Measure,
+            { "amount": self.amount * factor, "units": self.units, },
+        )
+
+
     def get_model (
         self
         ) -> dict:
@@ -348,6 +734,106 @@ Serializable representation for JSON.
         }
 
 
+# the canonical units per dimension, for normalized totals
+CANONICAL_UNITS: typing.Dict[ UnitDimension, str ] = {
+    UnitDimension.MASS: MeasureUnits.GRAM.value,
+    UnitDimension.VOLUME: MeasureUnits.LITER.value,
+}
+
+
+class MeasureTotals:
+    """
+Total measured amounts per symbol, accumulated in one pass.
+
+Each total keeps the units first seen for its symbol, or with
+`canonical` set, grams for mass and liters for volume. Amounts in
+other compatible units get converted with an O(1) lookup in the
+precomputed factor tables, and between mass and volume through the
+density of the symbol in the unit converter, if any.
+    """
+
+    def __init__ (
+        self,
+        converter: typing.Optional[ Converter ],
+        *,
+        canonical: bool = False,
+        ) -> None:
+        """
+Constructor.
+        """
+        self.converter: typing.Optional[ Converter ] = converter
+        self.canonical: bool = canonical
+        self.totals: typing.Dict[ str, Measure ] = OrderedDict()
+
+
+    def _convert (
+        self,
+        symbol: str,
+        measure: Measure,
+        units: str,
+        ) -> float:
+        """
+Private method to convert the amount of a measure into the given
+units, which raises `ValueError` if these are not compatible.
+        """
+        conv: typing.Optional[ Conversion ] = None
+
+        if self.converter is not None:
+            conv = self.converter.get(symbol)
+
+        return measure.convert(units, conversion = conv).amount
+
+
+    def add (
+        self,
+        symbol: str,
+        measure: Measure,
+        ) -> bool:
+        """
+Add a measure to the total for its symbol, returning `False` if its
+units cannot get converted into the units of that total.
+        """
+        total: typing.Optional[ Measure ] = self.totals.get(symbol)
+
+        if total is None:
+            units: typing.Optional[ str ] = measure.units
+            amount: float = measure.amount
+
+            if self.canonical and units in UNIT_SIZES:
+                units = CANONICAL_UNITS[UNIT_SIZES[units][0]]  # type: ignore
+                amount = self._convert(symbol, measure, units)
+
+            self.totals[symbol] = trusted_construct(
+                Measure,
+                { "amount": amount, "units": units, },
+            )
+
+            return True
+
+        if measure.units == total.units:
+            total.amount += measure.amount
+            return True
+
+        if measure.units is None or total.units is None:
+            return False
+
+        try:
+            total.amount += self._convert(symbol, measure, total.units)
+        except ValueError:
+            return False
+
+        return True
+
+
+    def items (
+        self,
+        ) -> typing.Iterator[ typing.Tuple[ str, Measure ] ]:
+        """
+Iterator for the totals, in the order each symbol was first added.
+        """
+        yield from self.totals.items()
+
+
 class Duration (Measure):  # pylint: disable=R0902
     """
 A data class representing one parsed Duration object.
@@ -358,17 +844,29 @@ A data class representing one parsed Duration object.
     def build (
         cls,
         parse: typing.Any,
+        *,
+        trusted: bool = False,
         ) -> "Duration":
         """
-Constructor from a `textx` parse object.
+Constructor from a `textx` parse object, optionally using trusted
+construction.
         """
         duration_units: typing.Optional[ str ] = None
 
         if parse.units is not None:
             duration_units = DurationUnits(parse.units).value
 
+        amount: float = float(parse.amount)
+
+        # the grammar allows a signed number, so validate negative amounts
+        if trusted and amount >= 0.0:
+            return trusted_construct(
+                Duration,
+                { "amount": amount, "units": duration_units, },
+            )
+
         return Duration(
-            amount = float(parse.amount),
+            amount = amount,
             units = duration_units,
         )
 
@@ -405,7 +903,7 @@ Adapted from:
         for label, amount in cascade:
             if amount > 0:
                 if amount > 1:
-                    label = PLURAL.plural(label)
+                    label = pluralize(label)
 
                 units.append(f"{int(amount)} {label}")
 
@@ -434,17 +932,29 @@ A data class representing one parsed Temperature object.
     def build (
         cls,
         parse: typing.Any,
+        *,
+        trusted: bool = False,
         ) -> "Temperature":
         """
-Constructor from a `textx` parse object.
+Constructor from a `textx` parse object, optionally using trusted
+construction.
         """
         temperature_units: typing.Optional[ str ] = None
 
         if parse.units is not None:
             temperature_units = TemperatureUnits(parse.units).value
 
+        amount: float = float(parse.amount)
+
+        # the grammar allows a signed number, so validate negative amounts
+        if trusted and amount >= 0.0:
+            return trusted_construct(
+                Temperature,
+                { "amount": amount, "units": temperature_units, },
+            )
+
         return Temperature(
-            amount = float(parse.amount),
+            amount = amount,
             units = temperature_units,
         )
 
@@ -6,10 +6,11 @@ DSL implementing the Bwyd language.
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
+# pylint: disable=C0302
+
 from collections import OrderedDict
 from urllib.parse import ParseResult, urlparse
 import datetime
-import itertools
 import json
 import logging
 import pathlib
@@ -17,32 +18,75 @@ import re
 import typing
 
 from icecream import ic  # type: ignore  # pylint: disable=E0401
-from spdx_tools.spdx.validation.spdx_id_validators import is_valid_internal_spdx_id
-import dateutil
-import jinja2
-import minify_html
-import requests_cache
-import spdx_license_list
-import textx  # type: ignore  # pylint: disable=E0401
+from pydantic import BaseModel
+
+from .construct import T, trusted_construct
 
 from .error import BwydParserError
 
+from .location import LineIndex, SourceLocation
+
+from .manifest import bytes_digest, stream_to_file, write_if_changed
+
 from .measure import Converter, \
-    Measure, DurationUnits, Duration, Temperature
+    Measure, MeasureTotals, DurationUnits, Duration, Temperature
 
 from .ops import Dependency, \
     OpsTypes, OpNote, OpTransfer, OpAdd, OpAction, OpWait, OpStore, OpHeat, OpChill, OpBake
 
-from .resources import BWYD_SVG, JINJA_PAGE_TEMPLATE, URL_PATTERN
+from .output import PAGE_ADAPTER, PageModel, SchemaOrgRecipe, \
+    LicenseModel, DetailsModel, AmountModel, ClosureModel
+
+from .ratio import Ratio, RatioPart
+
+from .resources import BWYD_SVG, URL_PATTERN, get_page_template
 
 from .structure import Post, Product, \
     Activity, Focus, Closure
 
+# heavy dependencies get imported on first use, to keep startup fast
+if typing.TYPE_CHECKING:
+    import jinja2
+    import requests_cache
+
+    from .assets import StaticAssets
+    from .cache import RenderCache
+    from .compress import Precompressor
+
 
 ######################################################################
 ## module definitions
 
-class Module:  # pylint: disable=R0902
+M = typing.TypeVar("M", bound = Measure)
+
+# interprets the parse node of one op, within a closure of a module
+OpHandler = typing.Callable[ [ "Module", Closure, typing.Any ], typing.Any ]
+
+# relative deviation from a declared RATIO which validation tolerates
+RATIO_TOLERANCE: float = 0.1
+
+# options for `minify_html`, which are also part of the render cache keys
+MINIFY_OPTIONS: typing.Dict[ str, bool ] = {
+    "keep_html_and_head_opening_tags": True,
+    "minify_css": True,
+    "minify_js": True,
+    "remove_processing_instructions": True,
+}
+
+class ModuleAggregates (BaseModel, arbitrary_types_allowed = True):  # pylint: disable=R0902
+    """
+A data class representing the module-level aggregates, which get
+computed together in one traversal of the interpreted module.
+    """
+    duration: str
+    yields: typing.List[ str ]
+    closure_yields: typing.Dict[ str, typing.List[ str ] ]
+    keywords: typing.List[ str ]
+    ingredients: typing.List[ typing.Tuple[ Dependency, Measure ] ]
+    ingredient_amounts: typing.List[ str ]
+
+
+class Module:  # pylint: disable=R0902,R0904
     """
 One parsed module.
     """
@@ -59,7 +103,8 @@ Constructor.
         """
         self.path: pathlib.Path = path
         self.parse_tree: typing.Any = parse_tree
-        self.converter: Converter = converter
+        self._converter: Converter = converter
+        self._aggregates: typing.Optional[ ModuleAggregates ] = None
         self.slug: typing.Optional[ str ] = slug
         self.title: str = ""
         self.text: str = ""
@@ -70,6 +115,46 @@ Constructor.
         self.spdx_name: typing.Optional[ str ] = None
         self.updated: typing.Optional[ datetime.date ] = None
         self.closures: typing.Dict[ str, Closure ] = OrderedDict()
+        self._line_index: typing.Optional[ LineIndex ] = None
+        self._trusted: bool = True
+
+
+    def __getstate__ (
+        self
+        ) -> dict:
+        """
+Pickle support, which drops the `textx` parse tree and the unit
+converter, neither of which belong to the interpreted module, plus
+the aggregates derived from them.
+        """
+        state: dict = self.__dict__.copy()
+        state["parse_tree"] = None
+        state["_converter"] = None
+        state["_aggregates"] = None
+        return state
+
+
+    @property
+    def converter (
+        self,
+        ) -> Converter:
+        """
+Accessor for the measurements unit converter.
+        """
+        return self._converter
+
+
+    @converter.setter
+    def converter (
+        self,
+        converter: Converter,
+        ) -> None:
+        """
+Replace the measurements unit converter, which invalidates the
+aggregates.
+        """
+        self._converter = converter
+        self.invalidate_aggregates()
 
 
     @classmethod
@@ -100,12 +185,15 @@ Make the image URL embeddable in an <iframe/>
 
     def get_thumbnail (
         self,
-        session: requests_cache.CachedSession,
-        ) -> str:
+        session: "requests_cache.CachedSession",
+        *,
+        default: typing.Optional[ str ] = BWYD_SVG,
+        ) -> typing.Optional[ str ]:
         """
-Accessor for a thumbnail URL.
+Accessor for a thumbnail URL, which falls back to the `default` for
+a module without any posts.
         """
-        img_url: str = BWYD_SVG
+        img_url: typing.Optional[ str ] = default
 
         if len(self.posts) > 0:
             img_url = self.posts[0].get_thumbnail(session)
@@ -113,116 +201,177 @@ Accessor for a thumbnail URL.
         return img_url
 
 
-    def get_schema_org (
+    def get_schema_org_model (
         self,
-        ) -> dict:
+        ) -> SchemaOrgRecipe:
         """
-Accessor for composing Schema.org metadata in JSON-LD
+Typed output model for Schema.org metadata in JSON-LD
 <https://schema.org/Recipe>
         """
-        frag: dict = {
-            "@context": "https://schema.org",
-            "@type": "Recipe",
-            "name": self.title,
-            "description": self.text,
-            "keywords": self.collect_keywords(),
-            "recipeYield": self.total_yields()[0],
-            "recipeIngredient": [
-                measure.humanize_convert(entity.symbol, entity.external, self.converter) + " " + entity.text  # pylint: disable=C0301
-                for entity, measure in self.iter_ingredients()
-            ],
-        }
-
-        # optional metadata
+        aggregates: ModuleAggregates = self.get_aggregates()
         img_url: str = self.get_image()
+        author: typing.Optional[ str ] = self.author
 
-        if len(img_url) > 0:
-            frag["image"] = img_url
-
-        if len(self.cites) > 0:
-            frag["isBasedOn"] = self.cites[0]
-
-        if self.updated is not None:
-            frag["dateModified"] = self.updated.isoformat()
-
-        if self.author is not None:
-            author: str = self.author
+        if author is not None:
             match: typing.Optional[ re.Match ] = re.match(r"^([\w\s]+).*$", author)
 
             if match is not None:
                 author = match.group(1).strip()
 
-            frag["author"] = author
+        return SchemaOrgRecipe(
+            name = self.title,
+            description = self.text,
+            keywords = list(aggregates.keywords),
+            recipeYield = aggregates.yields[0],
+            recipeIngredient = [
+                amount + " " + entity.text
+                for ( entity, _ ), amount in zip(
+                    aggregates.ingredients,
+                    aggregates.ingredient_amounts,
+                )
+            ],
+            # optional metadata
+            image = img_url if len(img_url) > 0 else None,
+            isBasedOn = self.cites[0] if len(self.cites) > 0 else None,
+            dateModified = self.updated.isoformat() if self.updated is not None else None,
+            author = author,
+            license = f"https://spdx.org/licenses/{self.spdx_id}.html" if self.spdx_id is not None else None,  # pylint: disable=C0301
+        )
+
+
+    def get_schema_org (
+        self,
+        ) -> dict:
+        """
+Accessor for composing Schema.org metadata in JSON-LD
+<https://schema.org/Recipe>
+        """
+        return self.get_schema_org_model().model_dump()
+
+
+    def get_page_model (
+        self,
+        *,
+        assets: typing.Optional[ "StaticAssets" ] = None,
+        page_dir: typing.Optional[ pathlib.Path ] = None,
+        ) -> PageModel:
+        """
+Typed output model for the page of this module, which serializes
+directly to JSON.
+
+With shared assets, the icon gets referenced by its URL from the
+`page_dir` where the page gets written, which defaults to the directory
+of the module source, instead of being inlined.
+        """
+        aggregates: ModuleAggregates = self.get_aggregates()
+        spdx_license: typing.Optional[ LicenseModel ] = None
+        icon: str = BWYD_SVG
+
+        if assets is not None:
+            icon = assets.get_url("icon", page_dir or self.path.parent)
 
         if self.spdx_id is not None:
-            frag["license"] = f"https://spdx.org/licenses/{self.spdx_id}.html"
+            spdx_license = LicenseModel(
+                id = self.spdx_id,
+                name = self.spdx_name,
+            )
 
-        return frag
+        return PageModel(
+            path = self.path.name,
+            icon = icon,
+            title = self.title,
+            text = self.text,
+            license = spdx_license,
+            details = DetailsModel(
+                serves = list(aggregates.yields),
+                duration = aggregates.duration,
+                keywords = list(aggregates.keywords),
+                author = self.author,
+                updated = self.updated.isoformat() if self.updated is not None else None,
+            ),
+            ingredients = [
+                AmountModel(
+                    amount = amount,
+                    text = entity.text,
+                )
+                for ( entity, _ ), amount in zip(
+                    aggregates.ingredients,
+                    aggregates.ingredient_amounts,
+                )
+            ],
+            sources = self.cites,
+            gallery = [ post.url for post in self.posts],
+            image = self.get_image(),
+            closures = [
+                ClosureModel(
+                    title = name,
+                    yields = list(aggregates.closure_yields[name]),
+                    text = closure.text,
+                    supers = closure.supers,
+                    keywords = closure.keywords,
+                    requires = closure.get_requires(),
+                    foci = [ focus.get_output(self.converter) for focus in closure.foci ],
+                )
+                for name, closure in self.closures.items()
+            ],
+            schema_org = self.get_schema_org_model(),
+        )
 
 
     def get_model (
         self,
+        *,
+        page: typing.Optional[ PageModel ] = None,
         ) -> dict:
         """
 Return a list of JSON-friendly dictionary representations,
-one for each parsed Closure.
-        """
-        closure_list: typing.List[ dict ] = [
-            {
-                "title": name,
-                "yields": closure.total_yields(intermediaries = True),
-                "text": closure.text,
-                "supers": closure.supers,
-                "keywords": closure.keywords,
-                "requires": closure.get_dependencies(),
-                "foci": [ focus.get_model(self.converter) for focus in closure.foci ],
-            }
-            for name, closure in self.closures.items()
-        ]
+one for each parsed Closure, from the given `page` model if it has
+already been built.
 
-        spdx_license: typing.Optional[ dict ] = None
-        updated: typing.Optional[ str ] = None
+The Schema.org metadata gets included as a JSON string, ready to
+embed in the HTML page.
+        """
+        if page is None:
+            page = self.get_page_model()
 
-        if self.spdx_id is not None:
-            spdx_license = {
-                "id": self.spdx_id,
-                "name": self.spdx_name,
-            }
+        dat: dict = page.model_dump()
+        dat["schema_org"] = json.dumps(dat["schema_org"])
+        return dat
 
-        if self.updated is not None:
-            updated = self.updated.isoformat()
 
-        return {
-            "path": self.path.name,
-            "icon": BWYD_SVG,
-            "title": self.title,
-            "text": self.text,
-            "license": spdx_license,
-            "details": {
-                "serves": self.total_yields(),
-                "duration": self.total_duration(),
-                "keywords": self.collect_keywords(),
-                "author": self.author,
-                "updated": updated,
-            },
-            "ingredients": [
-                {
-                    "amount": measure.humanize_convert(
-                        entity.symbol,
-                        entity.external,
-                        self.converter,
-                    ),
-                    "text": entity.text,
-                }
-                for entity, measure in self.iter_ingredients()
-            ],
-            "sources": self.cites,
-            "gallery": [ post.url for post in self.posts],
-            "image": self.get_image(),
+    def model_dump_json (
+        self,
+        *,
+        indent: typing.Optional[ int ] = None,
+        ) -> bytes:
+        """
+Serialize the page model straight to JSON bytes, with the Schema.org
+metadata nested as an object rather than encoded as a string.
+        """
+        return PAGE_ADAPTER.dump_json(
+            self.get_page_model(),
+            indent = indent,
+        )
 
-            "closures": closure_list,
-            "schema_org": json.dumps(self.get_schema_org()),
-        }
+
+    def _locate (
+        self,
+        node: typing.Any,
+        ) -> SourceLocation:
+        """
+Helper method to record the location of a parse node as offsets into
+this module's source, which only get resolved into line and column
+numbers if reported.
+        """
+        if self._line_index is None:
+            root: typing.Any = node
+
+            while hasattr(root, "parent"):
+                root = root.parent
+
+            self._line_index = LineIndex.from_model(root)
+
+        return SourceLocation.of(self._line_index, node)
 
 
 ######################################################################
@@ -236,11 +385,14 @@ one for each parsed Closure.
 Helper method to validate an SPDX license identifier.
 See: <https://spdx.org/licenses/>
         """
+        from spdx_tools.spdx.validation.spdx_id_validators import is_valid_internal_spdx_id  # pylint: disable=C0415,C0301
+        import spdx_license_list  # pylint: disable=C0415
+
         spdx_id: str = lic_parse.spdx_id
         valid_ref: bool = is_valid_internal_spdx_id(f"SPDXRef-{spdx_id}")
 
         if not valid_ref or spdx_id not in spdx_license_list.LICENSES:
-            loc: dict = textx.get_location(lic_parse)
+            loc: SourceLocation = self._locate(lic_parse)
 
             raise BwydParserError(
                 f"unknown SPDX license ID `{spdx_id}` referenced at {loc}",
@@ -251,16 +403,15 @@ See: <https://spdx.org/licenses/>
         self.spdx_name = spdx_license_list.LICENSES[spdx_id].name
 
 
-    @classmethod
     def _validate_url (  # type: ignore  # pylint: disable=R1710
-        cls,
+        self,
         entity: typing.Any,
         ) -> str:
         """
 Helper method to parse one URL.
         """
         try:
-            loc: dict = textx.get_location(entity)
+            loc: SourceLocation = self._locate(entity)
             url: str = entity.url
             result: ParseResult = urlparse(url)
 
@@ -312,6 +463,11 @@ Validate the forward references for one Bwyd module.
                         symbol = symbol,
                     )
 
+            # check the amounts added against a declared ratio
+            for part, deviation in closure.check_ratio(self.converter).items():
+                if abs(deviation) > RATIO_TOLERANCE:
+                    logging.warning(f"RATIO `{closure.ratio.name}` part `{part}` is off by {deviation:+.0%} at {closure.ratio.loc}")  # type: ignore  # pylint: disable=C0301,W1203
+
 
 ######################################################################
 ## parsing methods
@@ -339,314 +495,344 @@ Interpret and resolve each dependency: container, tool, ingredient, use.
 
         if depend_class_name == "Container":
             # forward reference, to be resolved during this parsing pass
-            closure.containers[depend_parse.symbol] = Dependency(
-                loc = textx.get_location(depend_parse),
+            closure.containers[depend_parse.symbol] = self._construct(
+                Dependency,
+                loc = self._locate(depend_parse),
                 symbol = depend_parse.symbol,
                 text = depend_parse.text,
             )
 
         elif depend_class_name == "Tool":
             # forward reference, to be resolved during this parsing pass
-            closure.tools[depend_parse.symbol] = Dependency(
-                loc = textx.get_location(depend_parse),
+            closure.tools[depend_parse.symbol] = self._construct(
+                Dependency,
+                loc = self._locate(depend_parse),
                 symbol = depend_parse.symbol,
                 text = depend_parse.text,
             )
 
         elif depend_class_name == "Ingredient":
             # forward reference, to be resolved during this parsing pass
-            closure.ingredients[depend_parse.symbol] = Dependency(
-                loc = textx.get_location(depend_parse),
+            closure.ingredients[depend_parse.symbol] = self._construct(
+                Dependency,
+                loc = self._locate(depend_parse),
                 symbol = depend_parse.symbol,
                 text = depend_parse.text,
             )
 
         elif depend_class_name == "Use":
             # external forward reference, to be resolved on a subsequent pass
-            closure.ingredients[depend_parse.symbol] = Dependency(
-                loc = textx.get_location(depend_parse),
+            closure.ingredients[depend_parse.symbol] = self._construct(
+                Dependency,
+                loc = self._locate(depend_parse),
                 symbol = depend_parse.symbol,
                 text = depend_parse.text,
                 external = True,
             )
 
 
-    def _interpret_op (  # pylint: disable=R0911,R0912,R0915
+    def _construct (
         self,
-        closure: Closure,
-        op_parse: typing.Any,
-        *,
-        debug: bool = False,
-        ) -> typing.Optional[ OpsTypes ]:
+        cls: typing.Type[ T ],
+        /,
+        **fields: typing.Any,
+        ) -> T:
         """
-Interpret the steps within an activity.
+Helper method to build a data class from parser-produced values:
+either with trusted construction, skipping validation, or else with
+full validation.
         """
-        op_class_name: str = op_parse.__class__.__name__
+        if self._trusted:
+            return trusted_construct(cls, fields)
 
-        if debug:
-            ic(op_parse)
+        return cls(**fields)
 
-        if op_class_name == "Note":
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.text,
-                )
 
-            return OpNote(
-                loc = textx.get_location(op_parse),
-                text = op_parse.text,
-            )
+    def build_op (
+        self,
+        cls: typing.Type[ T ],
+        op_parse: typing.Any,
+        /,
+        **fields: typing.Any,
+        ) -> T:
+        """
+Build an operation from its parse node, recording its source location.
+        """
+        fields["loc"] = self._locate(op_parse)
 
-        if op_class_name == "Transfer":
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                )
+        if self._trusted:
+            return trusted_construct(cls, fields)
 
-            # resolve local reference
-            entity: typing.Optional[ typing.Any ] = None
+        return cls(**fields)
 
-            if op_parse.symbol in closure.ingredients:
-                entity = closure.ingredients[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc: dict = textx.get_location(op_parse)
 
-                raise BwydParserError(
-                    f"INGREDIENT `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
+    def build_measure (
+        self,
+        cls: typing.Type[ M ],
+        measure_parse: typing.Any,
+        ) -> M:
+        """
+Build a measure, duration, or temperature from its parse node.
+        """
+        return cls.build(measure_parse, trusted = self._trusted)  # type: ignore
 
-            return OpTransfer(
-                loc = textx.get_location(op_parse),
-                symbol = op_parse.symbol,
-                entity = entity,
-            )
 
-        if op_class_name == "Add":
-            # resolve local reference
-            entity = None
+    def resolve (
+        self,
+        closure: Closure,
+        parse: typing.Any,
+        kinds: typing.Tuple[ str, ... ],
+        label: str,
+        ) -> Dependency:
+        """
+Resolve the local reference by `parse.symbol` to a dependency within
+the given closure, searching the given kinds of dependencies in order:
+`"ingredients"`, `"tools"`, `"containers"`. Then count the reference.
+        """
+        for kind in kinds:
+            entity: typing.Optional[ Dependency ] = getattr(closure, kind).get(parse.symbol)
 
-            if op_parse.symbol in closure.ingredients:
-                entity = closure.ingredients[op_parse.symbol]
+            if entity is not None:
                 entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
+                return entity
 
-                raise BwydParserError(
-                    f"INGREDIENT `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
+        loc: SourceLocation = self._locate(parse)
 
-            measure: Measure = Measure.build(op_parse.measure)
-
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.text,
-                    measure,
-                    entity,
-                )
+        raise BwydParserError(
+            f"{label} `{parse.symbol}` used but not defined {loc}",
+            symbol = parse.symbol,
+        )
 
-            return OpAdd(
-                loc = textx.get_location(op_parse),
-                symbol = op_parse.symbol,
-                measure = measure,
-                text = op_parse.text,
-                entity = entity,
-            )
 
-        if op_class_name == "Action":
-            # resolve local reference
-            entity = None
+######################################################################
+## op handlers, keyed by grammar rule
 
-            if op_parse.symbol in closure.tools:
-                entity = closure.tools[op_parse.symbol]
-                entity.ref_count += 1
-            elif op_parse.symbol in closure.containers:
-                entity = closure.containers[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
+    def _op_note (
+        self,
+        closure: Closure,  # pylint: disable=W0613
+        op_parse: typing.Any,
+        ) -> OpNote:
+        """
+NOTE: text
+        """
+        return self.build_op(
+            OpNote,
+            op_parse,
+            text = op_parse.text,
+        )
 
-                raise BwydParserError(
-                    f"ACTION OBJECT `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
 
-            duration: Duration = Duration.build(op_parse.duration)
+    def _op_transfer (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpTransfer:
+        """
+TRANSFER symbol
+        """
+        return self.build_op(
+            OpTransfer,
+            op_parse,
+            symbol = op_parse.symbol,
+            entity = self.resolve(closure, op_parse, ( "ingredients", ), "INGREDIENT"),
+        )
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.modifier,
-                    op_parse.until,
-                    duration,
-                    entity,
-                )
 
-            return OpAction(
-                loc = textx.get_location(op_parse),
-                tool = entity,
-                modifier = op_parse.modifier,
-                until = op_parse.until,
-                duration = duration,
-            )
+    def _op_add (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpAdd:
+        """
+ADD symbol (measure): text
+        """
+        entity: Dependency = self.resolve(closure, op_parse, ( "ingredients", ), "INGREDIENT")
+
+        return self.build_op(
+            OpAdd,
+            op_parse,
+            symbol = op_parse.symbol,
+            measure = self.build_measure(Measure, op_parse.measure),
+            text = op_parse.text,
+            entity = entity,
+        )
 
-        if op_class_name == "Wait":
-            duration = Duration.build(op_parse.duration)
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.modifier,
-                    op_parse.until,
-                    duration,
-                )
+    def _op_action (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpAction:
+        """
+ACTION symbol: modifier UNTIL: until TIME (duration)
+        """
+        return self.build_op(
+            OpAction,
+            op_parse,
+            tool = self.resolve(closure, op_parse, ( "tools", "containers", ), "ACTION OBJECT"),
+            modifier = op_parse.modifier,
+            until = op_parse.until,
+            duration = self.build_measure(Duration, op_parse.duration),
+        )
 
-            return OpWait(
-                loc = textx.get_location(op_parse),
-                modifier = op_parse.modifier,
-                until = op_parse.until,
-                duration = duration,
-            )
 
-        if op_class_name == "Bake":
-            # resolve local reference
-            if op_parse.symbol in closure.containers:
-                entity = closure.containers[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
+    def _op_wait (
+        self,
+        closure: Closure,  # pylint: disable=W0613
+        op_parse: typing.Any,
+        ) -> OpWait:
+        """
+WAIT: modifier UNTIL: until TIME (duration)
+        """
+        return self.build_op(
+            OpWait,
+            op_parse,
+            modifier = op_parse.modifier,
+            until = op_parse.until,
+            duration = self.build_measure(Duration, op_parse.duration),
+        )
 
-                raise BwydParserError(
-                    f"BAKE CONTAINER `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
 
-            duration = Duration.build(op_parse.duration)
-            temperature = Temperature.build(op_parse.temperature)
+    def _op_bake (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpBake:
+        """
+BAKE symbol: modifier AT: temperature UNTIL: until TIME (duration)
+        """
+        return self.build_op(
+            OpBake,
+            op_parse,
+            mode = op_parse.__class__.__name__,
+            container = self.resolve(closure, op_parse, ( "containers", ), "BAKE CONTAINER"),
+            modifier = op_parse.modifier,
+            until = op_parse.until,
+            duration = self.build_measure(Duration, op_parse.duration),
+            temperature = self.build_measure(Temperature, op_parse.temperature),
+        )
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.modifier,
-                    op_parse.until,
-                    duration,
-                    temperature,
-                )
 
-            return OpBake(
-                loc = textx.get_location(op_parse),
-                mode = op_class_name,
-                container = entity,
-                modifier = op_parse.modifier,
-                until = op_parse.until,
-                duration = duration,
-                temperature = temperature,
-            )
+    def _op_heat (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpHeat:
+        """
+HEAT symbol: modifier UNTIL: until TIME (duration)
+        """
+        return self.build_op(
+            OpHeat,
+            op_parse,
+            container = self.resolve(closure, op_parse, ( "containers", ), "HEAT CONTAINER"),
+            modifier = op_parse.modifier,
+            until = op_parse.until,
+            duration = self.build_measure(Duration, op_parse.duration),
+        )
 
-        if op_class_name == "Heat":
-            # resolve local reference
-            if op_parse.symbol in closure.containers:
-                entity = closure.containers[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
 
-                raise BwydParserError(
-                    f"HEAT CONTAINER `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
+    def _op_chill (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpChill:
+        """
+CHILL symbol: modifier UNTIL: until TIME (duration)
+        """
+        return self.build_op(
+            OpChill,
+            op_parse,
+            container = self.resolve(closure, op_parse, ( "containers", ), "CHILL CONTAINER"),
+            modifier = op_parse.modifier,
+            until = op_parse.until,
+            duration = self.build_measure(Duration, op_parse.duration),
+        )
 
-            duration = Duration.build(op_parse.duration)
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.modifier,
-                    op_parse.until,
-                    duration,
-                )
+    def _op_store (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        ) -> OpStore:
+        """
+STORE symbol: modifier UPTO (duration)
+        """
+        return self.build_op(
+            OpStore,
+            op_parse,
+            container = self.resolve(closure, op_parse, ( "containers", ), "STORE CONTAINER"),
+            modifier = op_parse.modifier,
+            duration = self.build_measure(Duration, op_parse.duration),
+        )
 
-            return OpHeat(
-                loc = textx.get_location(op_parse),
-                container = entity,
-                modifier = op_parse.modifier,
-                until = op_parse.until,
-                duration = duration,
-            )
 
-        if op_class_name == "Chill":
-            # resolve local reference
-            if op_parse.symbol in closure.containers:
-                entity = closure.containers[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
+    # grammar rule => op handler
+    OP_HANDLERS: typing.ClassVar[ typing.Dict[ str, OpHandler ] ] = {
+        "Note": _op_note,
+        "Transfer": _op_transfer,
+        "Add": _op_add,
+        "Action": _op_action,
+        "Wait": _op_wait,
+        "Bake": _op_bake,
+        "Heat": _op_heat,
+        "Chill": _op_chill,
+        "Store": _op_store,
+    }
 
-                raise BwydParserError(
-                    f"CHILL CONTAINER `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
 
-            duration = Duration.build(op_parse.duration)
+    @classmethod
+    def register_op (
+        cls,
+        rule: str,
+        handler: typing.Optional[ OpHandler ] = None,
+        ) -> typing.Any:
+        """
+Register the handler which interprets the parse nodes of one grammar
+rule as an operation, e.g., for a new `FERMENT` op. This can also be
+used as a decorator:
+
+    @Module.register_op("Ferment")
+    def interpret_ferment (module, closure, op_parse):
+        return module.build_op(
+            OpFerment,
+            op_parse,
+            container = module.resolve(closure, op_parse, ( "containers", ), "FERMENT CONTAINER"),
+            duration = module.build_measure(Duration, op_parse.duration),
+        )
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.modifier,
-                    op_parse.until,
-                    duration,
-                )
+The grammar must also define the rule, for the parser to produce it.
+A handler registered for an existing rule replaces the built-in one.
+        """
+        if handler is None:
+            return lambda func: cls.register_op(rule, func)
 
-            return OpChill(
-                loc = textx.get_location(op_parse),
-                container = entity,
-                modifier = op_parse.modifier,
-                until = op_parse.until,
-                duration = duration,
-            )
+        cls.OP_HANDLERS[rule] = handler
+        return handler
 
-        if op_class_name == "Store":
-            # resolve local reference
-            if op_parse.symbol in closure.containers:
-                entity = closure.containers[op_parse.symbol]
-                entity.ref_count += 1
-            else:
-                loc = textx.get_location(op_parse)
 
-                raise BwydParserError(
-                    f"STORE CONTAINER `{op_parse.symbol}` used but not defined {loc}",
-                    symbol = op_parse.symbol,
-                )
+    def _interpret_op (
+        self,
+        closure: Closure,
+        op_parse: typing.Any,
+        *,
+        debug: bool = False,
+        ) -> typing.Optional[ OpsTypes ]:
+        """
+Interpret the steps within an activity, dispatching on the grammar
+rule of each parse node.
+        """
+        handler: typing.Optional[ OpHandler ] = self.OP_HANDLERS.get(op_parse.__class__.__name__)
 
-            duration = Duration.build(op_parse.duration)
+        ## OTHERWISE, parse fails ...
+        if handler is None:
+            return None
 
-            if debug:
-                ic(
-                    op_class_name,
-                    op_parse.symbol,
-                    op_parse.modifier,
-                    duration,
-                )
+        op_obj: OpsTypes = handler(self, closure, op_parse)
 
-            return OpStore(
-                loc = textx.get_location(op_parse),
-                container = entity,
-                modifier = op_parse.modifier,
-                duration = duration,
-            )
+        if debug:
+            ic(op_parse, op_obj)
 
-        ## OTHERWISE, parse fails ...
-        return None
+        return op_obj
 
 
     def _interpret_focus (
@@ -665,20 +851,9 @@ Interpret the activities within a focus.
                 focus_parse.symbol,
             )
 
-        # resolve local reference
-        if focus_parse.symbol in closure.containers:
-            entity: typing.Any = closure.containers[focus_parse.symbol]
-            entity.ref_count += 1
-        else:
-            loc: dict = textx.get_location(focus_parse)
-
-            raise BwydParserError(
-                f"CONTAINER `{focus_parse.symbol}` used but not defined {loc}",
-                symbol = focus_parse.symbol,
-            )
-
-        focus = Focus(
-            container = entity,
+        focus = self._construct(
+            Focus,
+            container = self.resolve(closure, focus_parse, ( "containers", ), "CONTAINER"),
         )
 
         closure.foci.append(focus)
@@ -690,7 +865,8 @@ Interpret the activities within a focus.
                     activity.text,
                 )
 
-            act: Activity = Activity(
+            act: Activity = self._construct(
+                Activity,
                 text = activity.text,
             )
 
@@ -722,21 +898,33 @@ Interpret the components within a ratio.
                 [ (part.symbol, part.components) for part in ratio_parse.parts ],
             )
 
+        parts: typing.List[ RatioPart ] = []
+
         for part in ratio_parse.parts:
             if len(part.components) < 1:
-                # resolve local reference
-                if part.symbol in closure.ingredients:
-                    entity: typing.Any = closure.ingredients[part.symbol]
-                    entity.ref_count += 1
-                else:
-                    loc: dict = textx.get_location(part)
+                self.resolve(closure, part, ( "ingredients", ), "RATIO part")
 
-                    raise BwydParserError(
-                        f"RATIO part `{part.symbol}` used but not defined {loc}",
-                        symbol = part.symbol,
-                    )
+            # `textx` leaves an undeclared weight as 0
+            weight: typing.Optional[ float ] = None
+
+            if part.weight:
+                weight = float(part.weight)
 
-            ## OHFUCK: store representation of this ratio
+            parts.append(
+                self._construct(
+                    RatioPart,
+                    symbol = part.symbol,
+                    components = list(part.components),
+                    weight = weight,
+                )
+            )
+
+        closure.ratio = self._construct(
+            Ratio,
+            loc = self._locate(ratio_parse),
+            name = ratio_parse.name,
+            parts = parts,
+        )
 
 
     def _interpret_closure (  # pylint: disable=R0912,R0915
@@ -754,7 +942,8 @@ Helper method to interpret one Closure.
         if closure_parse.text is not None and len(closure_parse.text) > 0:
             text = closure_parse.text
 
-        closure: Closure = Closure(
+        closure: Closure = self._construct(
+            Closure,
             name = closure_parse.name,
             obj = closure_parse,
             text = text,
@@ -786,10 +975,11 @@ Helper method to interpret one Closure.
                 )
 
             closure.products.append(
-                Product(
-                    loc = textx.get_location(prod_parse),
+                self._construct(
+                    Product,
+                    loc = self._locate(prod_parse),
                     symbol = prod_parse.symbol,
-                    amount = Measure.build(prod_parse.measure),
+                    amount = Measure.build(prod_parse.measure, trusted = self._trusted),
                     intermediate = (prod_parse.intermediate == "INTERMEDIATE"),
                 )
             )
@@ -821,87 +1011,376 @@ Helper method to interpret one Closure.
         return closure
 
 
+    def _interpret_metadata (
+        self,
+        meta_parse: typing.Any,
+        ) -> None:
+        """
+Helper method to interpret one item of the optional metadata.
+        """
+        import dateutil.parser  # pylint: disable=C0415
+
+        meta_class_name: str = meta_parse.__class__.__name__
+        loc: SourceLocation = self._locate(meta_parse)
+
+        if meta_class_name == "Author":
+            self.author = self._urlify(meta_parse.name)
+
+        elif meta_class_name == "License":
+            if self.spdx_id is not None:
+                # do not allow multiple licenses
+                spdx_id: str = meta_parse.spdx_id
+
+                raise BwydParserError(
+                    f"redundant SPDX license ID `{spdx_id}` referenced at {loc}",
+                    symbol = spdx_id,
+                )
+
+            self._validate_license(meta_parse)
+
+        elif meta_class_name == "Updated":
+            if self.updated is not None:
+                # do not allow multiple dates
+                updated: str = meta_parse.date
+
+                raise BwydParserError(
+                    f"redundant dates `{updated}` referenced at {loc}",
+                    symbol = updated,
+                )
+
+            self.updated = dateutil.parser.parse(meta_parse.date).date()
+
+        elif meta_class_name == "Cite":
+            self.cites.append(self._validate_url(meta_parse))
+
+        elif meta_class_name == "Post":
+            self.posts.append(Post(url = self._validate_url(meta_parse)))
+
+
     def interpret (
         self,
         *,
+        release_parse_tree: bool = False,
+        trusted: bool = True,
         debug: bool = False,
         ) -> None:
         """
-Interpret one Bwyd module.
+Interpret one Bwyd module, optionally releasing its parse tree
+afterwards.
+
+By default the data classes for parser-produced values get built with
+trusted construction, since the grammar has already constrained them;
+set `trusted` to `False` to validate each one fully instead.
         """
+        self._trusted = trusted
         self.title = self.parse_tree.title
         self.text = self.parse_tree.text
 
         # parse the optional metadata
         for meta_parse in self.parse_tree.meta:
-            meta_class_name: str = meta_parse.__class__.__name__
-            loc: dict = textx.get_location(meta_parse)
-
-            if meta_class_name == "Author":
-                self.author = self._urlify(meta_parse.name)
+            self._interpret_metadata(meta_parse)
 
-            elif meta_class_name == "License":
-                if self.spdx_id is not None:
-                    # do not allow multiple licenses
-                    spdx_id: str = meta_parse.spdx_id
+        # parse each `CLOSURE`
+        for closure_parse in self.parse_tree.closures:
+            self.closures[closure_parse.name] = self._interpret_closure(
+                closure_parse,
+                debug = debug,
+            )
 
-                    raise BwydParserError(
-                        f"redundant SPDX license ID `{spdx_id}` referenced at {loc}",
-                        symbol = spdx_id,
-                    )
+        # validate the resulting parsed module
+        self.validate()
 
-                self._validate_license(meta_parse)
+        if release_parse_tree:
+            self.release_parse_tree()
 
-            elif meta_class_name == "Updated":
-                if self.updated is not None:
-                    # do not allow multiple dates
-                    updated: str = meta_parse.date
 
-                    raise BwydParserError(
-                        f"redundant dates `{updated}` referenced at {loc}",
-                        symbol = updated,
-                    )
+    def release_parse_tree (
+        self,
+        ) -> None:
+        """
+Drop the references to the parse tree, which is no longer needed once
+this module has been interpreted, so that it can be garbage collected.
+        """
+        self.parse_tree = None
 
-                self.updated = dateutil.parser.parse(meta_parse.date).date()
+        for closure in self.closures.values():
+            closure.obj = None
 
-            elif meta_class_name == "Cite":
-                self.cites.append(self._validate_url(meta_parse))
 
-            elif meta_class_name == "Post":
-                self.posts.append(Post(url = self._validate_url(meta_parse)))
+    def get_processors (
+        self,
+        *,
+        trusted: bool = True,
+        debug: bool = False,
+        ) -> typing.Dict[ str, typing.Callable[ [ typing.Any ], typing.Any ] ]:
+        """
+Object processors, keyed by grammar rule, which interpret this module
+in a single pass while it gets parsed: each metadata item and `CLOSURE`
+gets interpreted as soon as its parse node is complete, then the
+parse subtree gets released.
+        """
+        self._trusted = trusted
 
-        # parse each `CLOSURE`
-        for closure_parse in self.parse_tree.closures:
-            self.closures[closure_parse.name] = self._interpret_closure(
+        def process_closure (
+            closure_parse: typing.Any,
+            ) -> Closure:
+            closure: Closure = self._interpret_closure(
                 closure_parse,
                 debug = debug,
             )
 
-        # validate the resulting parsed module
-        self.validate()
+            closure.obj = None
+            self.closures[closure.name] = closure
+            return closure
+
+        def process_module (
+            module_parse: typing.Any,
+            ) -> None:
+            self.title = module_parse.title
+            self.text = module_parse.text
+            self.validate()
+
+        return {
+            "Author": self._interpret_metadata,
+            "Updated": self._interpret_metadata,
+            "License": self._interpret_metadata,
+            "Cite": self._interpret_metadata,
+            "Post": self._interpret_metadata,
+            "Closure": process_closure,
+            "Module": process_module,
+        }
+
+
+######################################################################
+## scaling
+
+    def _scaled_closures (
+        self,
+        names: typing.Iterable[ str ],
+        ) -> typing.Set[ str ]:
+        """
+Helper method to find the closures which scaling the named closures
+affects: these, plus transitively each closure that produces an
+ingredient which one of them uses.
+        """
+        producers: typing.Dict[ str, str ] = {
+            product.symbol: closure.name
+            for closure in self.closures.values()
+            for product in closure.products
+        }
+
+        scaled: typing.Set[ str ] = set()
+        pending: typing.List[ str ] = list(names)
+
+        while len(pending) > 0:
+            name: str = pending.pop()
+
+            if name in scaled:
+                continue
+
+            if name not in self.closures:
+                raise KeyError(f"unknown closure `{name}`")
+
+            scaled.add(name)
+
+            for entity in self.closures[name].ingredients.values():
+                if entity.external and entity.symbol in producers:
+                    pending.append(producers[entity.symbol])
+
+        return scaled
+
+
+    def scale (
+        self,
+        factor: float,
+        *,
+        closures: typing.Optional[ typing.Iterable[ str ] ] = None,
+        ) -> "Module":
+        """
+A new module with its products and the measure of each `ADD` scaled
+by a positive `factor`, without re-parsing.
+
+If `closures` names a subset of the closures, only those get scaled,
+plus the closures which produce the ingredients they `USE`.
+
+The new module shares all of the unchanged structure with this one,
+i.e., dependencies, the other operations, and closures which are not
+scaled, so this module stays as it was.
+        """
+        if factor <= 0.0:
+            raise ValueError(f"scaling factor must be positive: {factor}")
+
+        names: typing.Set[ str ] = self._scaled_closures(
+            self.closures.keys() if closures is None else closures
+        )
+
+        scaled: Module = Module.__new__(Module)
+        scaled.__dict__.update(self.__dict__)
+
+        scaled.closures = OrderedDict([
+            ( name, closure.scale(factor) if name in names else closure, )
+            for name, closure in self.closures.items()
+        ])
+
+        scaled.invalidate_aggregates()
+        return scaled
+
+
+    def scale_to (
+        self,
+        symbol: str,
+        amount: float,
+        ) -> "Module":
+        """
+A new module scaled so that the named product yields the given
+`amount` in its own units, e.g., a number of servings, along with
+the closures whose products it uses. Raises `ValueError` if the
+product yields no amount to scale from.
+        """
+        for closure in self.closures.values():
+            for product in closure.products:
+                if product.symbol == symbol:
+                    if product.amount.amount <= 0.0:
+                        raise ValueError(f"product `{symbol}` yields no amount to scale from")
+
+                    return self.scale(
+                        amount / product.amount.amount,
+                        closures = [ closure.name ],
+                    )
+
+        raise KeyError(f"unknown product `{symbol}`")
+
+
+    def scale_ratio (
+        self,
+        name: str,
+        symbol: str,
+        amount: float,
+        ) -> "Module":
+        """
+A new module scaled so that the named closure adds the given `amount`
+in grams of one part of its ratio, e.g., 500 g of flour, along with
+the closures whose products it uses.
+        """
+        closure: Closure = self.closures[name]
+
+        if closure.ratio is None:
+            raise KeyError(f"no ratio in closure `{name}`")
+
+        part: str = closure.ratio.get_part(symbol).symbol
+        amounts: typing.Dict[ str, float ] = closure.get_part_amounts(self.converter)
+
+        if part not in amounts:
+            raise ValueError(
+                f"no amount in grams for part `{part}` of ratio `{closure.ratio.name}`"
+            )
+
+        return self.scale(
+            amount / amounts[part],
+            closures = [ name ],
+        )
 
 
 ######################################################################
 ## aggregate measures
 
+    def get_aggregates (
+        self,
+        ) -> ModuleAggregates:
+        """
+Accessor for the module-level aggregates, which get computed in one
+traversal of the closures, then cached until invalidated.
+        """
+        if self._aggregates is None:
+            self._aggregates = self._compute_aggregates()
+
+        return self._aggregates
+
+
+    def invalidate_aggregates (
+        self,
+        ) -> None:
+        """
+Drop the cached aggregates, which must be called after changing the
+interpreted module, e.g., scaling it or extending its unit converter
+in place.
+        """
+        self._aggregates = None
+
+
+    def _compute_aggregates (  # pylint: disable=R0914
+        self,
+        ) -> ModuleAggregates:
+        """
+Helper method to compute all of the module-level aggregates in one
+traversal of the closures, foci, activities, and operations.
+        """
+        total_sec: float = 0.0
+        yields: typing.List[ str ] = []
+        closure_yields: typing.Dict[ str, typing.List[ str ] ] = {}
+        keywords: typing.List[ str ] = []
+        entities: typing.Dict[ str, Dependency ] = {}
+        totals: MeasureTotals = MeasureTotals(self.converter)
+
+        for name, closure in self.closures.items():  # pylint: disable=R1702
+            keywords.extend(closure.supers)
+            keywords.extend(closure.keywords)
+
+            closure_yields[name] = closure.total_yields(intermediaries = True)
+
+            yields.extend([
+                html
+                for product, html in zip(closure.products, closure_yields[name])
+                if not product.intermediate
+            ])
+
+            for focus in closure.foci:
+                for activity in focus.activities:
+                    for op in activity.ops:
+                        total_sec += op.get_duration().normalize()
+
+                        if isinstance(op, OpAdd) and not op.entity.external:
+                            symbol: str = op.entity.symbol
+                            entities.setdefault(symbol, op.entity)
+
+                            # convert into the units of the running total
+                            if not totals.add(symbol, op.measure):
+                                logging.error(  # pylint: disable=W1203
+                                    f"wrong units for ingredient list: {op.measure.units}"
+                                )
+
+        ingredients: typing.List[ typing.Tuple[ Dependency, Measure ] ] = [
+            ( entities[symbol], measure, )
+            for symbol, measure in totals.items()
+        ]
+
+        return ModuleAggregates(
+            duration = Duration(
+                amount = int(total_sec),
+                units = DurationUnits.SECOND.value,
+            ).humanize(),
+            yields = yields,
+            closure_yields = closure_yields,
+            keywords = sorted(keywords),
+            ingredients = ingredients,
+            ingredient_amounts = [
+                measure.humanize_convert(
+                    entity.symbol,
+                    entity.external,
+                    self.converter,
+                )
+                for entity, measure in ingredients
+            ],
+        )
+
+
     def total_duration (
         self,
         ) -> str:
         """
 Accessor for the total duration of one Bwyd module.
         """
-        total_sec: int = int(sum([  # type: ignore  # pylint: disable=R1728
-            op.get_duration().normalize()
-            for closure in self.closures.values()
-            for focus in closure.foci
-            for activity in focus.activities
-            for op in activity.ops
-        ]))
-
-        return Duration(
-            amount = total_sec,
-            units = DurationUnits.SECOND.value,
-        ).humanize()
+        return self.get_aggregates().duration
 
 
     def total_yields (
@@ -910,11 +1389,7 @@ Accessor for the total duration of one Bwyd module.
         """
 Accessor for the total, non-intermediate yields of one Bwyd module.
         """
-        return [
-            product
-            for closure in self.closures.values()
-            for product in closure.total_yields()
-        ]
+        return list(self.get_aggregates().yields)
 
 
     def iter_ingredients (
@@ -923,32 +1398,7 @@ Accessor for the total, non-intermediate yields of one Bwyd module.
         """
 Iterator for the aggregate ingredients in one Bwyd module.
         """
-        ing: OrderedDict = OrderedDict()
-
-        for closure in self.closures.values():  # pylint: disable=R1702
-            for focus in closure.foci:
-                for activity in focus.activities:
-                    for op in activity.ops:
-                        if isinstance(op, OpAdd) and not op.entity.external:
-                            measure: Measure = op.measure
-                            name: str = op.entity.symbol
-
-                            if name not in ing:
-                                ing[name] = [
-                                    op.entity,
-                                    Measure(
-                                        amount = measure.amount,
-                                        units = measure.units,
-                                    ),
-                                ]
-                            elif measure.units == ing[name][1].units:
-                                ing[name][1].amount += measure.amount
-                            else:
-                                error_msg: str = f"wrong units for ingredient list: {measure.units}"
-                                logging.error(error_msg)
-
-        for entity, measure in ing.values():
-            yield entity, measure
+        yield from self.get_aggregates().ingredients
 
 
     def collect_keywords (
@@ -957,14 +1407,7 @@ Iterator for the aggregate ingredients in one Bwyd module.
         """
 Accessor for the collected keywords in one Bwyd module.
         """
-        return sorted(
-            list(
-                itertools.chain.from_iterable([
-                    [ *closure.supers, *closure.keywords ]
-                    for closure in self.closures.values()
-                ])
-            )
-        )
+        return list(self.get_aggregates().keywords)
 
 
 ######################################################################
@@ -973,24 +1416,126 @@ Accessor for the collected keywords in one Bwyd module.
     def render_template (
         self,
         *,
-        page_template: jinja2.Template = JINJA_PAGE_TEMPLATE,
+        page_template: typing.Optional[ "jinja2.Template" ] = None,
         minify: bool = True,
+        render_cache: typing.Optional[ "RenderCache" ] = None,
+        assets: typing.Optional[ "StaticAssets" ] = None,
+        page_dir: typing.Optional[ pathlib.Path ] = None,
         ) -> str:
         """
 Load a Jinja2 template and render the data model as HTML,
 which is by default minified.
+
+With shared assets, the page links to the stylesheet and the icon
+rather than inlining them, by their URLs from the `page_dir` where the
+page gets written, which defaults to the directory of the module
+source.
+
+With a render cache, a page whose model, template, and minifier
+options are unchanged since it was last rendered gets returned from
+the cache, skipping both Jinja2 and `minify_html`.
         """
+        if page_template is None:
+            page_template = get_page_template()
+
+        if page_dir is None:
+            page_dir = self.path.parent
+
+        page: PageModel = self.get_page_model(assets = assets, page_dir = page_dir)
+        stylesheet: typing.Optional[ str ] = None
+        cache_key: typing.Optional[ str ] = None
+
+        if assets is not None:
+            stylesheet = assets.get_url("stylesheet", page_dir)
+
+        if render_cache is not None:
+            cache_key = render_cache.compose_key(
+                PAGE_ADAPTER.dump_json(page),
+                page_template,
+                minify,
+                stylesheet = stylesheet,
+            )
+
+            if cache_key is not None:
+                cached: typing.Optional[ str ] = render_cache.get(cache_key)
+
+                if cached is not None:
+                    return cached
+
         html: str = page_template.render(
-            module = self.get_model()
+            module = self.get_model(page = page),
+            stylesheet = stylesheet,
         )
 
         if minify:
-            return minify_html.minify(  # pylint: disable=E1101
+            import minify_html  # pylint: disable=C0415
+
+            html = minify_html.minify(  # pylint: disable=E1101
                 html,
-                keep_html_and_head_opening_tags = True,
-                minify_css = True,
-                minify_js = True,
-                remove_processing_instructions = True,
+                **MINIFY_OPTIONS,
             )
 
+        if render_cache is not None and cache_key is not None:
+            render_cache.put(cache_key, html)
+
         return html
+
+
+    def render_to_file (  # pylint: disable=R0913
+        self,
+        html_path: pathlib.Path,
+        *,
+        page_template: typing.Optional[ "jinja2.Template" ] = None,
+        minify: bool = True,
+        render_cache: typing.Optional[ "RenderCache" ] = None,
+        assets: typing.Optional[ "StaticAssets" ] = None,
+        precompressor: typing.Optional[ "Precompressor" ] = None,
+        ) -> str:
+        """
+Render the data model as HTML into a file, which is by default
+minified, returning the hash of its contents. A minified page only
+gets written when its bytes change.
+
+With a precompressor, the compressed siblings of the file get queued
+for writing as well; call its `flush()` to wait for them.
+
+Without minification, the page gets streamed to disk in chunks from
+`Template.generate()`, so the full HTML never gets held as one string,
+and any compressed siblings get written in the same pass.
+Minifying needs the full page, which then gets held only once before
+being encoded.
+        """
+        if minify:
+            html: bytes = self.render_template(
+                page_template = page_template,
+                render_cache = render_cache,
+                assets = assets,
+                page_dir = html_path.parent,
+            ).encode("utf-8")
+
+            changed: bool = write_if_changed(html_path, html)
+
+            if precompressor is not None:
+                precompressor.submit(html_path, html, changed = changed)
+
+            return bytes_digest(html)
+
+        if page_template is None:
+            page_template = get_page_template()
+
+        page: PageModel = self.get_page_model(assets = assets, page_dir = html_path.parent)
+        stylesheet: typing.Optional[ str ] = None
+
+        if assets is not None:
+            stylesheet = assets.get_url("stylesheet", html_path.parent)
+
+        chunks: typing.Iterable[ str ] = page_template.generate(
+            module = self.get_model(page = page),
+            stylesheet = stylesheet,
+        )
+
+        # compress the siblings in the same pass as the stream to disk
+        if precompressor is not None:
+            chunks = precompressor.tee(html_path, chunks)
+
+        return stream_to_file(html_path, chunks)
@@ -7,39 +7,52 @@ see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
 from collections import OrderedDict
+import abc
 import enum
 import typing
 
 from pydantic import BaseModel, NonNegativeInt
 
+from .location import SourceLocation
 from .measure import Converter, Measure, DurationUnits, Duration, Temperature
+from .output import DependencyModel, ActivityStep, IngredientStep, \
+    NoteStep, TransferStep, ActionStep, WaitStep, StoreStep, HeatStep, BakeStep
 
 
 ######################################################################
 ## dependencies
 
-class Dependency (BaseModel):  # pylint: disable=R0902
+class Dependency (BaseModel, arbitrary_types_allowed = True):  # pylint: disable=R0902
     """
 A data class representing one parsed dependency:
 Ingredient, Tool, Container, etc.
     """
-    loc: dict
+    loc: SourceLocation
     symbol: str
     text: str
     ref_count: NonNegativeInt = 0
     external: bool = False
 
 
+    def get_output (
+        self
+        ) -> DependencyModel:
+        """
+Typed output model.
+        """
+        return DependencyModel(
+            name = self.symbol,
+            text = self.text,
+        )
+
+
     def get_model (
         self
         ) -> dict:
         """
 Serializable representation for JSON.
         """
-        return {
-            "name": self.symbol,
-            "text": self.text,
-        }
+        return self.get_output().model_dump()
 
 
 class DependencyDict (OrderedDict):
@@ -69,11 +82,12 @@ An enumeration class representing string literals for kinds of appliances.
     OVEN = enum.auto()
 
 
-class OpGeneric (BaseModel):  # pylint: disable=R0902
+class OpGeneric (BaseModel, abc.ABC, arbitrary_types_allowed = True):  # pylint: disable=R0902
     """
-A data class representing a generic operation.
+An abstract data class representing a generic operation, where each
+kind of operation provides its own step for the output.
     """
-    loc: dict
+    loc: SourceLocation
     ref_count: NonNegativeInt = 0
 
 
@@ -89,6 +103,27 @@ Stub: Total duration.
         )
 
 
+    @abc.abstractmethod
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
+        """
+Typed output model, as one step of an Activity, where only an `ADD`
+uses the `converter` for its imperial equivalents.
+        """
+
+
+    def get_model (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> dict:
+        """
+Serializable representation for JSON.
+        """
+        return self.get_step(converter).model_dump()
+
+
 class OpNote (OpGeneric):  # pylint: disable=R0902
     """
 Represents a collapsable Note, inline *within* an Activity, from the
@@ -97,17 +132,18 @@ Author/Cook for other Cooks.
     text: str
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            "note": {
-                "text": self.text,
-            }
-        }
+        return ActivityStep(
+            note = NoteStep(
+                text = self.text,
+            ),
+        )
 
 
 class OpTransfer (OpGeneric):  # pylint: disable=R0902
@@ -119,17 +155,18 @@ a Container from another Focus, still *within* the same Closure.
     entity: Dependency
 
 
-    def get_model (
+    def get_step (
         self,
-        ) -> dict:
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            "transfer": {
-                "name": self.symbol,
-            },
-        }
+        return ActivityStep(
+            transfer = TransferStep(
+                name = self.symbol,
+            ),
+        )
 
 
 class OpAdd (OpGeneric):  # pylint: disable=R0902
@@ -143,12 +180,12 @@ ingredient into a Container within an Activity.
     entity: Dependency
 
 
-    def get_model (
+    def get_output (
         self,
-        converter: Converter,
-        ) -> dict:
+        converter: typing.Optional[ Converter ] = None,
+        ) -> IngredientStep:
         """
-Serializable representation for JSON.
+Typed output model, as one of the ingredients added in an Activity.
         """
         amount: str = self.measure.humanize_convert(
             self.symbol,
@@ -156,11 +193,47 @@ Serializable representation for JSON.
             converter,
         )
 
-        return {
-            "name": self.symbol,
-            "amount": amount,
-            "text": self.text,
-        }
+        return IngredientStep(
+            name = self.symbol,
+            amount = amount,
+            text = self.text,
+        )
+
+
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
+        """
+Typed output model, as one step of an Activity which adds only this
+ingredient. An Activity groups all of its `ADD` operations into one
+step instead, through `get_output()`.
+        """
+        return ActivityStep(
+            ingredients = [ self.get_output(converter) ],
+        )
+
+
+    def get_model (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> dict:
+        """
+Serializable representation for JSON, as one of the ingredients added
+in an Activity.
+        """
+        return self.get_output(converter).model_dump()
+
+
+    def scale (
+        self,
+        factor: float,
+        ) -> "OpAdd":
+        """
+A shallow copy of this operation with its measure scaled, which
+shares the ingredient dependency.
+        """
+        return self.model_copy(update = { "measure": self.measure.scale(factor) })
 
 
 class OpAction (OpGeneric):  # pylint: disable=R0902
@@ -183,20 +256,21 @@ Duration of this operation.
         return self.duration
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            "action": {
-                "tool": self.tool.symbol,
-                "verb": self.modifier,
-                "text": self.until,
-                "time": self.duration.humanize(),
-            }
-        }
+        return ActivityStep(
+            action = ActionStep(
+                tool = self.tool.symbol,
+                verb = self.modifier,
+                text = self.until,
+                time = self.duration.humanize(),
+            ),
+        )
 
 
 class OpWait (OpGeneric):  # pylint: disable=R0902
@@ -219,18 +293,19 @@ Duration of this operation.
         return self.duration
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            "wait": {
-                "text": self.until,
-                "time": self.duration.humanize(),
-            }
-        }
+        return ActivityStep(
+            wait = WaitStep(
+                text = self.until,
+                time = self.duration.humanize(),
+            ),
+        )
 
 
 class OpStore (OpGeneric):  # pylint: disable=R0902
@@ -243,24 +318,26 @@ a Closure for a specified time period.
     duration: Duration
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            "store": {
-                "text": self.modifier,
-                "upto": self.duration.humanize(),
-            }
-        }
+        return ActivityStep(
+            store = StoreStep(
+                text = self.modifier,
+                upto = self.duration.humanize(),
+            ),
+        )
 
 
-class OpAppliance (OpGeneric):  # pylint: disable=R0902
+class OpAppliance (OpGeneric, abc.ABC):  # pylint: disable=R0902
     """
 Represents the process of an Appliance operating on the food within
-a specific Container as part of an Activity.
+a specific Container as part of an Activity, where each kind of
+Appliance provides its own step.
     """
     container: Dependency
     modifier: str
@@ -278,6 +355,16 @@ Duration of this operation.
         return self.duration
 
 
+    @abc.abstractmethod
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
+        """
+Typed output model, as one step of an Activity.
+        """
+
+
 class OpHeat (OpAppliance):  # pylint: disable=R0902
     """
 Represents an Appliance: stove, range, hotplate, camp fire --
@@ -286,19 +373,23 @@ used to *heat* in different modes.
     appliance: str = Appliance.STOVE
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            self.appliance: {
-                "text": self.modifier,
-                "until": self.until,
-                "time": self.duration.humanize(),
-            }
-        }
+        heat: HeatStep = HeatStep(
+            text = self.modifier,
+            until = self.until,
+            time = self.duration.humanize(),
+        )
+
+        if self.appliance == Appliance.COOLER:
+            return ActivityStep(cooler = heat)
+
+        return ActivityStep(stove = heat)
 
 
 class OpChill (OpHeat):  # pylint: disable=R0902
@@ -319,21 +410,22 @@ used to *bake* in different modes.
     appliance: str = Appliance.OVEN
 
 
-    def get_model (
-        self
-        ) -> dict:
+    def get_step (
+        self,
+        converter: typing.Optional[ Converter ] = None,
+        ) -> ActivityStep:
         """
-Serializable representation for JSON.
+Typed output model, as one step of an Activity.
         """
-        return {
-            self.appliance: {
-                "text": self.modifier,
-                "until": self.until,
-                "time": self.duration.humanize(),
-                "mode": self.mode.lower(),
-                "temperature": self.temperature.humanize(),
-            }
-        }
+        return ActivityStep(
+            oven = BakeStep(
+                text = self.modifier,
+                until = self.until,
+                time = self.duration.humanize(),
+                mode = self.mode.lower(),
+                temperature = self.temperature.humanize(),
+            ),
+        )
 
 
 OpsTypes = typing.Union[
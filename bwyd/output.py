@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Typed output models for the page model and the Schema.org metadata
+of a Bwyd module, which serialize straight to JSON bytes.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import typing
+
+from pydantic import BaseModel, ConfigDict, Field, \
+    SerializationInfo, SerializerFunctionWrapHandler, TypeAdapter, model_serializer
+
+
+######################################################################
+## sparse models, where unset optional fields get omitted
+
+class SparseModel (BaseModel):
+    """
+Base class for output models whose optional fields get left out of
+the serialized representation when they are `None`, rather than
+being written as `null`.
+    """
+
+    @model_serializer(mode = "wrap")
+    def _drop_none (
+        self,
+        handler: SerializerFunctionWrapHandler,
+        info: SerializationInfo,  # pylint: disable=W0613
+        ) -> dict:
+        """
+Serialize the fields, omitting those which are `None`.
+        """
+        return {
+            key: val
+            for key, val in handler(self).items()
+            if val is not None
+        }
+
+
+######################################################################
+## activity steps
+
+class DependencyModel (BaseModel):
+    """
+Output model for one dependency: a Container or Tool.
+    """
+    name: str
+    text: str
+
+
+class IngredientStep (BaseModel):
+    """
+Output model for adding a measured amount of an ingredient.
+    """
+    name: str
+    amount: str
+    text: str
+
+
+class NoteStep (BaseModel):
+    """
+Output model for a Note.
+    """
+    text: str
+
+
+class TransferStep (BaseModel):
+    """
+Output model for a Transfer.
+    """
+    name: str
+
+
+class ActionStep (BaseModel):
+    """
+Output model for an Action.
+    """
+    tool: str
+    verb: str
+    text: str
+    time: str
+
+
+class WaitStep (BaseModel):
+    """
+Output model for a Wait.
+    """
+    text: str
+    time: str
+
+
+class StoreStep (BaseModel):
+    """
+Output model for a Store.
+    """
+    text: str
+    upto: str
+
+
+class HeatStep (BaseModel):
+    """
+Output model for heating or chilling with an Appliance.
+    """
+    text: str
+    until: str
+    time: str
+
+
+class BakeStep (HeatStep):
+    """
+Output model for baking with an oven.
+    """
+    mode: str
+    temperature: str
+
+
+class ActivityStep (SparseModel):  # pylint: disable=R0902
+    """
+Output model for one step of an Activity, which has exactly one of
+its fields set: the key names the kind of step.
+    """
+    ingredients: typing.Optional[ typing.List[ IngredientStep ] ] = None
+    note: typing.Optional[ NoteStep ] = None
+    transfer: typing.Optional[ TransferStep ] = None
+    action: typing.Optional[ ActionStep ] = None
+    wait: typing.Optional[ WaitStep ] = None
+    store: typing.Optional[ StoreStep ] = None
+    stove: typing.Optional[ HeatStep ] = None
+    cooler: typing.Optional[ HeatStep ] = None
+    oven: typing.Optional[ BakeStep ] = None
+
+
+######################################################################
+## structure
+
+class ActivityModel (BaseModel):
+    """
+Output model for one Activity.
+    """
+    title: str
+    steps: typing.List[ ActivityStep ]
+
+
+class FocusModel (BaseModel):
+    """
+Output model for one Focus.
+    """
+    container: str
+    activities: typing.List[ ActivityModel ]
+
+
+class ClosureModel (BaseModel):
+    """
+Output model for one Closure.
+    """
+    title: str
+    yields: typing.List[ str ]
+    text: str
+    supers: typing.List[ str ]
+    keywords: typing.List[ str ]
+    requires: typing.List[ DependencyModel ]
+    foci: typing.List[ FocusModel ]
+
+
+######################################################################
+## module
+
+class SchemaOrgRecipe (SparseModel):  # pylint: disable=R0902
+    """
+Output model for Schema.org metadata in JSON-LD
+<https://schema.org/Recipe>
+    """
+    model_config = ConfigDict(
+        populate_by_name = True,
+        serialize_by_alias = True,
+    )
+
+    context: str = Field(default = "https://schema.org", alias = "@context")
+    type: str = Field(default = "Recipe", alias = "@type")
+    name: str
+    description: str
+    keywords: typing.List[ str ]
+    recipeYield: str
+    recipeIngredient: typing.List[ str ]
+    image: typing.Optional[ str ] = None
+    isBasedOn: typing.Optional[ str ] = None
+    dateModified: typing.Optional[ str ] = None
+    author: typing.Optional[ str ] = None
+    license: typing.Optional[ str ] = None
+
+
+class LicenseModel (BaseModel):
+    """
+Output model for an SPDX license.
+    """
+    id: str
+    name: typing.Optional[ str ]
+
+
+class DetailsModel (BaseModel):
+    """
+Output model for the summary details of a module.
+    """
+    serves: typing.List[ str ]
+    duration: str
+    keywords: typing.List[ str ]
+    author: typing.Optional[ str ]
+    updated: typing.Optional[ str ]
+
+
+class AmountModel (BaseModel):
+    """
+Output model for the total amount of one ingredient.
+    """
+    amount: str
+    text: str
+
+
+class PageModel (BaseModel):  # pylint: disable=R0902
+    """
+Output model for the page of one module, with its Schema.org metadata
+nested as an object.
+    """
+    path: str
+    icon: str
+    title: str
+    text: str
+    license: typing.Optional[ LicenseModel ]
+    details: DetailsModel
+    ingredients: typing.List[ AmountModel ]
+    sources: typing.List[ str ]
+    gallery: typing.List[ str ]
+    image: str
+    closures: typing.List[ ClosureModel ]
+    schema_org: SchemaOrgRecipe
+
+
+PAGE_ADAPTER: TypeAdapter = TypeAdapter(PageModel)
+
+PAGE_LIST_ADAPTER: TypeAdapter = TypeAdapter(typing.List[ PageModel ])
@@ -0,0 +1,784 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dedicated tokenizer and recursive-descent parser for the Bwyd grammar.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+
+This follows `resources/bwyd.tx` rule by rule, producing parse nodes
+with the same class names, attributes, and source positions as the
+`textx` model objects which `Module.interpret` consumes, so that
+`textx.get_location` works on them unchanged.
+Keep both in sync whenever the grammar changes.
+"""
+
+import os
+import pathlib
+import re
+import typing
+
+from .error import BwydParserError
+from .location import LineIndex
+
+
+######################################################################
+## tokens, using the same patterns as the `textx` base types
+
+SKIP_PATTERN: re.Pattern = re.compile(r"(?:[ \t\r\n]+|//.*$)*", re.MULTILINE)
+ID_PATTERN: re.Pattern = re.compile(r"[^\d\W]\w*\b")
+STRING_PATTERN: re.Pattern = re.compile(r'("(\\"|[^"])*")|(\'(\\\'|[^\'])*\')')
+STRICTFLOAT_PATTERN: re.Pattern = re.compile(r"[+-]?(((\d+\.(\d*)?|\.\d+)([eE][+-]?\d+)?)|((\d+)([eE][+-]?\d+)))(?<=[\w\.])(?![\w\.])")  # pylint: disable=C0301
+INT_PATTERN: re.Pattern = re.compile(r"[-+]?[0-9]+")
+
+# ordered choices, which get matched as prefixes just like `textx` does
+MEASURE_UNITS: typing.Tuple[ str, ... ] = ( "g", "kg", "ml", "l", )
+DURATION_UNITS: typing.Tuple[ str, ... ] = ( "second", "minute", "hour", "day", "month", "year", )
+OVEN_MODES: typing.Tuple[ str, ... ] = ( "BAKE", "BROIL", "ROAST", "TOAST", )
+
+
+######################################################################
+## parse tree nodes
+
+class ParseNode:  # pylint: disable=R0903
+    """
+Base class for one node in a parse tree.
+The root node has no `parent` attribute, which is how
+`textx.get_model` finds it.
+    """
+    __slots__ = ( "parent", "_tx_position", "_tx_position_end", )
+
+    FIELDS: typing.Tuple[ str, ... ] = ()
+
+
+    def __init__ (
+        self,
+        parent: typing.Optional[ "ParseNode" ],
+        position: int,
+        ) -> None:
+        """
+Constructor.
+        """
+        if parent is not None:
+            self.parent: ParseNode = parent
+
+        self._tx_position: int = position
+        self._tx_position_end: int = position
+
+
+    def __repr__ (
+        self,
+        ) -> str:
+        """
+Represent this node by its grammar rule and position.
+        """
+        return f"<fast:bwyd.{self.__class__.__name__} at {self._tx_position}>"
+
+
+# grammar rule name => assigned attributes
+NODE_FIELDS: typing.Dict[ str, typing.Tuple[ str, ... ] ] = {
+    "Module": ( "title", "text", "meta", "closures", ),
+    "Author": ( "name", ),
+    "Updated": ( "date", ),
+    "License": ( "spdx_id", ),
+    "Cite": ( "url", ),
+    "Post": ( "url", ),
+    "Closure": ( "name", "supers", "text", "keywords", "depend", "foci", "ratio", "prods", ),
+    "IDList": ( "ids", ),
+    "Yield": ( "symbol", "measure", "intermediate", ),
+    "Container": ( "symbol", "text", ),
+    "Tool": ( "symbol", "text", ),
+    "Ingredient": ( "symbol", "text", ),
+    "Use": ( "symbol", "text", ),
+    "Focus": ( "symbol", "activities", ),
+    "Activity": ( "text", "ops", ),
+    "Note": ( "text", ),
+    "Transfer": ( "symbol", ),
+    "Add": ( "symbol", "measure", "text", ),
+    "Action": ( "symbol", "modifier", "until", "duration", ),
+    "Wait": ( "modifier", "until", "duration", ),
+    "Store": ( "symbol", "modifier", "duration", ),
+    "Heat": ( "symbol", "modifier", "until", "duration", ),
+    "Chill": ( "symbol", "modifier", "until", "duration", ),
+    "Bake": ( "symbol", "modifier", "temperature", "until", "duration", ),
+    "Measure": ( "amount", "units", ),
+    "Duration": ( "amount", "units", ),
+    "Temperature": ( "amount", "units", ),
+    "Ratio": ( "name", "parts", ),
+    "RatioPart": ( "weight", "symbol", "components", ),
+}
+
+# the root also carries what `textx.get_location` expects of a model
+ROOT_SLOTS: typing.Tuple[ str, ... ] = ( "_tx_filename", "_tx_parser", )
+
+NODE_CLASSES: typing.Dict[ str, type ] = {
+    rule: type(
+        rule,
+        ( ParseNode, ),
+        {
+            "__slots__": fields + (ROOT_SLOTS if rule == "Module" else ()),
+            "FIELDS": fields,
+        },
+    )
+    for rule, fields in NODE_FIELDS.items()
+}
+
+# `Module_Metadata` alternatives, in grammar order
+META_RULES: typing.Tuple[ typing.Tuple[ str, str, str ], ... ] = (
+    ( "AUTHOR:", "Author", "name", ),
+    ( "UPDATED:", "Updated", "date", ),
+    ( "LICENSE:", "License", "spdx_id", ),
+    ( "POST:", "Post", "url", ),
+    ( "CITE:", "Cite", "url", ),
+)
+
+# `Dependency` alternatives, in grammar order
+DEPEND_RULES: typing.Tuple[ typing.Tuple[ str, str ], ... ] = (
+    ( "CONTAINER", "Container", ),
+    ( "TOOL", "Tool", ),
+    ( "INGREDIENT", "Ingredient", ),
+    ( "USE", "Use", ),
+)
+
+# `Op` alternatives which follow the pattern:
+#   keyword symbol=ID (":" modifier=STRING)? "UNTIL:" until=STRING "TIME" duration=Duration
+TIMED_OPS: typing.Dict[ str, str ] = {
+    "ACTION": "Action",
+    "HEAT": "Heat",
+    "CHILL": "Chill",
+}
+
+
+######################################################################
+## parser
+
+# grammar rule name => object processor
+Processors = typing.Dict[ str, typing.Callable[ [ typing.Any ], typing.Any ] ]
+
+
+class FastParser:  # pylint: disable=R0903
+    """
+Recursive-descent parser for one Bwyd module, which tokenizes on demand:
+each grammar rule scans the next token it expects at the current offset,
+then whitespace and `//` comments get skipped after each token.
+    """
+    def __init__ (
+        self,
+        text: str,
+        *,
+        filename: str | None = None,
+        processors: Processors | None = None,
+        ) -> None:
+        """
+Constructor.
+
+The optional `processors` follow the semantics of `textx` object
+processors: each gets called, keyed by grammar rule, as soon as a node
+of that rule has been parsed completely, and any return value other
+than `None` replaces the node within the parse tree.
+        """
+        self.text: str = text
+        self.filename: str | None = filename
+        self.processors: Processors = processors or {}
+        self.pos: int = 0
+        self.end: int = 0
+
+
+    def parse (
+        self,
+        ) -> ParseNode:
+        """
+Parse the full text, returning the root `Module` node.
+        """
+        self._advance(0)
+        self.end = 0
+
+        return self._module()
+
+
+######################################################################
+## tokenizer
+
+    def _advance (
+        self,
+        end: int,
+        ) -> None:
+        """
+Consume a token ending at the given offset, then skip whitespace and
+comments, so that `self.pos` always points at the next token.
+        """
+        self.end = end
+        self.pos = SKIP_PATTERN.match(self.text, end).end()  # type: ignore
+
+
+    def _error (
+        self,
+        *expected: str,
+        ) -> BwydParserError:
+        """
+Build a syntax error at the current offset, formatted like the
+`textx` syntax errors.
+        """
+        line, col = LineIndex(self.text).pos_to_linecol(self.pos)
+        before: str = self.text[max(self.pos - 10, 0):self.pos]
+        context: str = before + "*" + self.text[self.pos:self.pos + 10]
+        options: str = " or ".join([ repr(exp) for exp in expected ])
+
+        return BwydParserError(
+            f"{self.filename}:{line}:{col}: Expected {options} => {context!r}",
+        )
+
+
+    def _peek (
+        self,
+        keyword: str,
+        ) -> bool:
+        """
+Test whether the next token starts with the given keyword.
+        """
+        return self.text.startswith(keyword, self.pos)
+
+
+    def _accept (
+        self,
+        keyword: str,
+        ) -> bool:
+        """
+Consume the given keyword if it comes next.
+        """
+        if self.text.startswith(keyword, self.pos):
+            self._advance(self.pos + len(keyword))
+            return True
+
+        return False
+
+
+    def _expect (
+        self,
+        keyword: str,
+        ) -> None:
+        """
+Consume the given keyword, which must come next.
+        """
+        if not self._accept(keyword):
+            raise self._error(keyword)
+
+
+    def _choice (
+        self,
+        keywords: typing.Tuple[ str, ... ],
+        ) -> str | None:
+        """
+Consume the first of an ordered choice of keywords which comes next.
+        """
+        for keyword in keywords:
+            if self.text.startswith(keyword, self.pos):
+                self._advance(self.pos + len(keyword))
+                return keyword
+
+        return None
+
+
+    def _match (
+        self,
+        pattern: re.Pattern,
+        name: str,
+        ) -> str:
+        """
+Consume a token which matches the given pattern.
+        """
+        match: typing.Optional[ re.Match ] = pattern.match(self.text, self.pos)
+
+        if match is None:
+            raise self._error(name)
+
+        self._advance(match.end())
+        return match.group()
+
+
+    def _string (
+        self,
+        ) -> str:
+        """
+Consume a `STRING` token, converted the same way `textx` does.
+        """
+        token: str = self._match(STRING_PATTERN, "STRING")
+        return token[1:-1].replace(r"\"", r'"').replace(r"\'", "'")
+
+
+    def _id (
+        self,
+        ) -> str:
+        """
+Consume an `ID` token.
+        """
+        return self._match(ID_PATTERN, "ID")
+
+
+    def _number (
+        self,
+        ) -> int | float:
+        """
+Consume a `NUMBER` token, trying `STRICTFLOAT` before `INT`.
+        """
+        match: typing.Optional[ re.Match ] = STRICTFLOAT_PATTERN.match(self.text, self.pos)
+
+        if match is not None:
+            self._advance(match.end())
+            return float(match.group())
+
+        return int(self._match(INT_PATTERN, "NUMBER"))
+
+
+    def _node (
+        self,
+        rule: str,
+        parent: typing.Optional[ ParseNode ],
+        ) -> typing.Any:
+        """
+Start a node for the given grammar rule at the next token.
+        """
+        return NODE_CLASSES[rule](parent, self.pos)
+
+
+    def _finish (
+        self,
+        node: typing.Any,
+        ) -> typing.Any:
+        """
+Close a node at the end of its last token, then run its object
+processor, if any.
+        """
+        node._tx_position_end = self.end  # pylint: disable=W0212
+
+        if self.processors:
+            rule: str = node.__class__.__name__
+            processor: typing.Optional[ typing.Callable ] = self.processors.get(rule)
+
+            if processor is not None:
+                result: typing.Any = processor(node)
+
+                if result is not None:
+                    return result
+
+        return node
+
+
+######################################################################
+## grammar rules
+
+    def _module (
+        self,
+        ) -> ParseNode:
+        """
+Module: "TITLE:" title=STRING "TEXT:" text=STRING meta+=Module_Metadata closures+=Closure
+        """
+        node: typing.Any = self._node("Module", None)
+        node._tx_filename = self.filename  # pylint: disable=W0212
+        node._tx_parser = LineIndex(self.text, filename = self.filename)  # pylint: disable=W0212
+
+        self._expect("TITLE:")
+        node.title = self._string()
+        self._expect("TEXT:")
+        node.text = self._string()
+
+        node.meta = []
+
+        while True:
+            meta: typing.Any = self._metadata(node)
+
+            if meta is None:
+                break
+
+            node.meta.append(meta)
+
+        if len(node.meta) < 1:
+            raise self._error(*[ keyword for keyword, _, _ in META_RULES ])
+
+        node.closures = []
+
+        while self._peek("CLOSURE:"):
+            node.closures.append(self._closure(node))
+
+        if len(node.closures) < 1 or self.pos < len(self.text):
+            raise self._error("CLOSURE:" if len(node.closures) < 1 else "EOF")
+
+        return self._finish(node)
+
+
+    def _metadata (
+        self,
+        parent: ParseNode,
+        ) -> typing.Optional[ ParseNode ]:
+        """
+Module_Metadata: Author | Updated | License | Post | Cite
+        """
+        for keyword, rule, field in META_RULES:
+            if self._peek(keyword):
+                node: typing.Any = self._node(rule, parent)
+                self._expect(keyword)
+                setattr(node, field, self._string())
+                return self._finish(node)
+
+        return None
+
+
+    def _closure (  # pylint: disable=R0912
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Closure: "CLOSURE:" name=STRING ("AS" supers=IDList)? ("TEXT:" text=STRING)?
+  ("KEYWORDS:" keywords=IDList)? depend+=Dependency foci+=Focus ratio=Ratio? prods+=Yield
+        """
+        node: typing.Any = self._node("Closure", parent)
+        self._expect("CLOSURE:")
+        node.name = self._string()
+
+        node.supers = self._id_list(node) if self._accept("AS") else None
+        node.text = self._string() if self._accept("TEXT:") else ""
+        node.keywords = self._id_list(node) if self._accept("KEYWORDS:") else None
+
+        node.depend = []
+
+        while True:
+            depend: typing.Any = self._dependency(node)
+
+            if depend is None:
+                break
+
+            node.depend.append(depend)
+
+        if len(node.depend) < 1:
+            raise self._error(*[ keyword for keyword, _ in DEPEND_RULES ])
+
+        node.foci = []
+
+        while self._peek("FOCUS"):
+            node.foci.append(self._focus(node))
+
+        if len(node.foci) < 1:
+            raise self._error("FOCUS")
+
+        node.ratio = self._ratio(node) if self._peek("RATIO:") else None
+
+        node.prods = []
+
+        while self._peek("YIELDS"):
+            node.prods.append(self._yield(node))
+
+        if len(node.prods) < 1:
+            raise self._error("YIELDS")
+
+        return self._finish(node)
+
+
+    def _id_list (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+IDList: ids+=ID[","]
+        """
+        node: typing.Any = self._node("IDList", parent)
+        node.ids = [ self._id() ]
+
+        while self._accept(","):
+            node.ids.append(self._id())
+
+        return self._finish(node)
+
+
+    def _dependency (
+        self,
+        parent: ParseNode,
+        ) -> typing.Optional[ ParseNode ]:
+        """
+Dependency: Container | Tool | Ingredient | Use
+        """
+        for keyword, rule in DEPEND_RULES:
+            if self._peek(keyword):
+                node: typing.Any = self._node(rule, parent)
+                self._expect(keyword)
+                node.symbol = self._id()
+                self._expect(":")
+                node.text = self._string()
+                return self._finish(node)
+
+        return None
+
+
+    def _focus (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Focus: "FOCUS" symbol=ID activities+=Activity
+        """
+        node: typing.Any = self._node("Focus", parent)
+        self._expect("FOCUS")
+        node.symbol = self._id()
+        node.activities = []
+
+        while self._peek("ACTIVITY:"):
+            node.activities.append(self._activity(node))
+
+        if len(node.activities) < 1:
+            raise self._error("ACTIVITY:")
+
+        return self._finish(node)
+
+
+    def _activity (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Activity: "ACTIVITY:" text=STRING ops+=Op
+        """
+        node: typing.Any = self._node("Activity", parent)
+        self._expect("ACTIVITY:")
+        node.text = self._string()
+        node.ops = []
+
+        while True:
+            op: typing.Any = self._op(node)
+
+            if op is None:
+                break
+
+            node.ops.append(op)
+
+        if len(node.ops) < 1:
+            raise self._error(
+                "NOTE:", "TRANSFER", "ADD", "ACTION", "WAIT", "STORE", "HEAT", "CHILL",
+                *OVEN_MODES,
+            )
+
+        return self._finish(node)
+
+
+    def _op (  # pylint: disable=R0911,R0912
+        self,
+        parent: ParseNode,
+        ) -> typing.Optional[ ParseNode ]:
+        """
+Op: Note | Transfer | Add | Action | Wait | Store | Heat | Chill | Bake
+        """
+        start: int = self.pos
+        text: str = self.text
+        node: typing.Any = None
+
+        if text.startswith("NOTE:", start):
+            node = self._node("Note", parent)
+            self._expect("NOTE:")
+            node.text = self._string()
+
+        elif text.startswith("TRANSFER", start):
+            node = self._node("Transfer", parent)
+            self._expect("TRANSFER")
+            node.symbol = self._id()
+
+        elif text.startswith("ADD", start):
+            node = self._node("Add", parent)
+            self._expect("ADD")
+            node.symbol = self._id()
+            node.measure = self._measure(node)
+            node.text = self._string() if self._accept(":") else ""
+
+        elif text.startswith("ACTION", start):
+            node = self._timed_op("ACTION", parent)
+
+        elif text.startswith("WAIT", start):
+            node = self._node("Wait", parent)
+            self._expect("WAIT")
+            node.modifier = self._string() if self._accept(":") else ""
+            self._expect("UNTIL:")
+            node.until = self._string()
+            self._expect("TIME")
+            node.duration = self._duration(node)
+
+        elif text.startswith("STORE", start):
+            node = self._node("Store", parent)
+            self._expect("STORE")
+            node.symbol = self._id()
+            node.modifier = self._string() if self._accept(":") else ""
+            self._expect("UPTO")
+            node.duration = self._duration(node)
+
+        elif text.startswith("HEAT", start):
+            node = self._timed_op("HEAT", parent)
+
+        elif text.startswith("CHILL", start):
+            node = self._timed_op("CHILL", parent)
+
+        else:
+            node = self._node("Bake", parent)
+
+            if self._choice(OVEN_MODES) is None:
+                return None
+
+            node.symbol = self._id()
+            node.modifier = self._string() if self._accept(":") else ""
+            self._expect("AT:")
+            node.temperature = self._temperature(node)
+            self._expect("UNTIL:")
+            node.until = self._string()
+            self._expect("TIME")
+            node.duration = self._duration(node)
+
+        return self._finish(node)
+
+
+    def _timed_op (
+        self,
+        keyword: str,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Action | Heat | Chill: keyword symbol=ID (":" modifier=STRING)?
+    "UNTIL:" until=STRING "TIME" duration=Duration
+        """
+        node: typing.Any = self._node(TIMED_OPS[keyword], parent)
+        self._expect(keyword)
+        node.symbol = self._id()
+        node.modifier = self._string() if self._accept(":") else ""
+        self._expect("UNTIL:")
+        node.until = self._string()
+        self._expect("TIME")
+        node.duration = self._duration(node)
+
+        return node
+
+
+    def _measure (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Measure: "(" amount=NUMBER (units=MeasureUnits)? ")"
+        """
+        node: typing.Any = self._node("Measure", parent)
+        self._expect("(")
+        node.amount = self._number()
+        node.units = self._choice(MEASURE_UNITS)
+        self._expect(")")
+
+        return self._finish(node)
+
+
+    def _duration (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Duration: "(" amount=NUMBER units=DurationUnits ")"
+        """
+        node: typing.Any = self._node("Duration", parent)
+        self._expect("(")
+        node.amount = self._number()
+        node.units = self._choice(DURATION_UNITS)
+
+        if node.units is None:
+            raise self._error(*DURATION_UNITS)
+
+        self._expect(")")
+
+        return self._finish(node)
+
+
+    def _temperature (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Temperature: amount=NUMBER units=TemperatureUnits
+        """
+        node: typing.Any = self._node("Temperature", parent)
+        node.amount = self._number()
+        self._expect("C")
+        node.units = "C"
+
+        return self._finish(node)
+
+
+    def _ratio (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Ratio: "RATIO:" name=STRING "=" (parts+=RatioPart[','])
+        """
+        node: typing.Any = self._node("Ratio", parent)
+        self._expect("RATIO:")
+        node.name = self._string()
+        self._expect("=")
+        node.parts = [ self._ratio_part(node) ]
+
+        while self._accept(","):
+            node.parts.append(self._ratio_part(node))
+
+        return self._finish(node)
+
+
+    def _ratio_part (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+RatioPart: (weight=NUMBER)? symbol=ID ('[' components+=ID[','] ']')?
+        """
+        node: typing.Any = self._node("RatioPart", parent)
+
+        # `textx` defaults an unmatched optional NUMBER to 0.0
+        node.weight = 0.0
+
+        if INT_PATTERN.match(self.text, self.pos) or STRICTFLOAT_PATTERN.match(self.text, self.pos):
+            node.weight = self._number()
+
+        node.symbol = self._id()
+        node.components = []
+
+        if self._accept("["):
+            node.components.append(self._id())
+
+            while self._accept(","):
+                node.components.append(self._id())
+
+            self._expect("]")
+
+        return self._finish(node)
+
+
+    def _yield (
+        self,
+        parent: ParseNode,
+        ) -> ParseNode:
+        """
+Yield: "YIELDS" symbol=ID measure=Measure (intermediate="INTERMEDIATE")?
+        """
+        node: typing.Any = self._node("Yield", parent)
+        self._expect("YIELDS")
+        node.symbol = self._id()
+        node.measure = self._measure(node)
+        node.intermediate = "INTERMEDIATE" if self._accept("INTERMEDIATE") else ""
+
+        return self._finish(node)
+
+
+def parse_file (
+    path: pathlib.Path,
+    *,
+    processors: Processors | None = None,
+    ) -> ParseNode:
+    """
+Parse one Bwyd module from a file, as an alternative to
+`textx.metamodel.TextXMetaModel.model_from_file`.
+    """
+    with open(path, "r", encoding = "utf-8") as fp:
+        text: str = fp.read()
+
+    return FastParser(
+        text,
+        filename = os.path.abspath(path),
+        processors = processors,
+    ).parse()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ratio objects in the Bwyd language: the relative weights of the key
+components within a Closure, plus a solver for the amounts of every
+component given the amount of one.
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import importlib.util
+import typing
+
+from pydantic import BaseModel, NonNegativeFloat
+
+from .location import SourceLocation
+
+# NumPy is optional: without it, the solver works on lists; it gets
+# imported on first use, to keep startup fast
+HAS_NUMPY: bool = importlib.util.find_spec("numpy") is not None
+
+
+class RatioPart (BaseModel):  # pylint: disable=R0902
+    """
+A data class representing one part of a Ratio, which may group several
+ingredients as its components, with an optional declared weight.
+    """
+    symbol: str
+    components: typing.List[ str ] = []
+    weight: typing.Optional[ NonNegativeFloat ] = None
+
+
+    def get_symbols (
+        self,
+        ) -> typing.List[ str ]:
+        """
+Accessor for the ingredient symbols which this part includes.
+        """
+        if len(self.components) > 0:
+            return self.components
+
+        return [ self.symbol ]
+
+
+class Ratio (BaseModel, arbitrary_types_allowed = True):  # pylint: disable=R0902
+    """
+A data class representing one parsed Ratio object.
+    """
+    loc: SourceLocation
+    name: str
+    parts: typing.List[ RatioPart ]
+
+
+    def get_part (
+        self,
+        symbol: str,
+        ) -> RatioPart:
+        """
+Accessor for the part named by `symbol`, or which includes it as a
+component.
+        """
+        for part in self.parts:
+            if symbol == part.symbol or symbol in part.components:
+                return part
+
+        raise KeyError(f"unknown part `{symbol}` in ratio `{self.name}`")
+
+
+    def is_declared (
+        self,
+        ) -> bool:
+        """
+Test whether every part declares its weight.
+        """
+        return all(part.weight is not None for part in self.parts)
+
+
+    def get_weights (
+        self,
+        amounts: typing.Optional[ typing.Dict[ str, float ] ] = None,
+        ) -> typing.Dict[ str, float ]:
+        """
+Accessor for the weight of each part: declared in the ratio, otherwise
+taken from the given `amounts` per part, e.g., those which a closure
+adds. Parts without either get left out.
+        """
+        weights: typing.Dict[ str, float ] = {}
+
+        for part in self.parts:
+            if part.weight is not None:
+                weights[part.symbol] = part.weight
+            elif amounts is not None and part.symbol in amounts:
+                weights[part.symbol] = amounts[part.symbol]
+
+        return weights
+
+
+    def percentages (
+        self,
+        base: str,
+        amounts: typing.Optional[ typing.Dict[ str, float ] ] = None,
+        ) -> typing.Dict[ str, float ]:
+        """
+Bakers' percentages: the weight of each part as a percentage of the
+weight of the `base` part, e.g., flour.
+        """
+        weights: typing.Dict[ str, float ] = self.get_weights(amounts)
+        base_weight: float = weights[self.get_part(base).symbol]
+
+        return {
+            symbol: 100.0 * weight / base_weight
+            for symbol, weight in weights.items()
+        }
+
+
+    def solve (
+        self,
+        symbol: str,
+        amounts: typing.Union[ float, typing.Sequence[ float ] ],
+        *,
+        weights: typing.Optional[ typing.Dict[ str, float ] ] = None,
+        ) -> typing.Dict[ str, typing.Any ]:
+        """
+Solve for the amount of every part, given the amount of the part named
+by `symbol`, in the same units.
+
+The `amounts` may be one number, or a sequence of target amounts which
+get solved together: as a NumPy array when available, otherwise as a
+list per part.
+        """
+        if weights is None:
+            weights = self.get_weights()
+
+        known: str = self.get_part(symbol).symbol
+
+        if weights.get(known, 0.0) <= 0.0:
+            raise ValueError(f"no weight for part `{known}` in ratio `{self.name}`")
+
+        ratios: typing.Dict[ str, float ] = {
+            part: weight / weights[known]
+            for part, weight in weights.items()
+        }
+
+        if isinstance(amounts, ( int, float, )):
+            return {
+                part: amounts * ratio
+                for part, ratio in ratios.items()
+            }
+
+        if HAS_NUMPY:
+            import numpy as np  # pylint: disable=C0415
+
+            # one outer product solves every part for every target
+            solved: typing.Any = np.outer(
+                np.fromiter(ratios.values(), dtype = float),
+                np.asarray(amounts, dtype = float),
+            )
+
+            return dict(zip(ratios.keys(), solved))
+
+        return {
+            part: [ amount * ratio for amount in amounts ]
+            for part, ratio in ratios.items()
+        }
@@ -6,10 +6,14 @@ Package definitions for the Bwyd DSL resource files.
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
+import functools
+import os
 import pathlib
 import re
+import typing
 
-import jinja2
+if typing.TYPE_CHECKING:
+    import jinja2
 
 
 BWYD_NAMESPACE: str = "https://derwen.ai/ns/v2/bwyd/"
@@ -23,15 +27,76 @@ GRAMMAR_PATH: pathlib.Path = pathlib.Path(__file__).resolve().parent / "bwyd.tx"
 
 ICON_PATH: pathlib.Path = pathlib.Path(__file__).resolve().parent / "bwyd.svg"
 
+STYLESHEET_PATH: pathlib.Path = pathlib.Path(__file__).resolve().parent / "bwyd.css"
 
-_jinja2_env: jinja2.Environment = jinja2.Environment(
-    loader = jinja2.FileSystemLoader(
-        pathlib.Path(__file__).resolve().parent
+
+# environment variable which names the directory for the compiled
+# template bytecode, shared by every process which renders; set it to
+# an empty string to disable the bytecode cache
+JINJA_CACHE_ENV: str = "BWYD_JINJA_CACHE"
+
+
+@functools.cache
+def get_jinja_env (
+    ) -> "jinja2.Environment":
+    """
+Build the Jinja2 environment for the packaged templates on first use,
+so that importing this package does not pay for `jinja2`.
+
+Compiled templates get stored in a bytecode cache on disk, so that
+each new process, e.g., a render worker, loads them instead of
+compiling them from source. `jinja2` checks the template source on
+every load, so edits to a template recompile it.
+    """
+    import jinja2  # pylint: disable=C0415
+
+    bytecode_cache: typing.Optional[ jinja2.BytecodeCache ] = None
+    cache_dir: typing.Optional[ str ] = os.environ.get(JINJA_CACHE_ENV)
+
+    if cache_dir is None:
+        # a private directory per user, under the system temp dir
+        bytecode_cache = jinja2.FileSystemBytecodeCache()
+    elif len(cache_dir) > 0:
+        pathlib.Path(cache_dir).mkdir(parents = True, exist_ok = True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+
+    return jinja2.Environment(
+        loader = jinja2.FileSystemLoader(
+            pathlib.Path(__file__).resolve().parent
+        ),
+        bytecode_cache = bytecode_cache,
     )
-)
 
-JINJA_PAGE_TEMPLATE: jinja2.Template = _jinja2_env.get_template("page.jinja")
-JINJA_INDEX_TEMPLATE: jinja2.Template = _jinja2_env.get_template("index.jinja")
+
+def get_page_template (
+    ) -> "jinja2.Template":
+    """
+Accessor for the compiled HTML page template.
+    """
+    return get_jinja_env().get_template("page.jinja")
+
+
+def get_index_template (
+    ) -> "jinja2.Template":
+    """
+Accessor for the compiled HTML index template.
+    """
+    return get_jinja_env().get_template("index.jinja")
+
+
+def __getattr__ (
+    name: str,
+    ) -> typing.Any:
+    """
+Compile the Jinja2 templates lazily, on first access.
+    """
+    if name == "JINJA_PAGE_TEMPLATE":
+        return get_page_template()
+
+    if name == "JINJA_INDEX_TEMPLATE":
+        return get_index_template()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 URL_PATTERN: re.Pattern = re.compile(
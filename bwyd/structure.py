@@ -13,17 +13,23 @@ import logging
 import itertools
 import typing
 
-from PIL import Image
 from pydantic import BaseModel, NonNegativeInt
 from upath import UPath
-import requests
-import requests_cache
 
-from .measure import Measure, Converter
+from .location import SourceLocation
+from .measure import Conversion, Measure, Converter
 
 from .ops import Dependency, DependencyDict, \
     OpsTypes, OpAdd
 
+from .output import DependencyModel, ActivityStep, ActivityModel, FocusModel
+
+from .ratio import Ratio
+
+# heavy dependencies get imported on first use, to keep startup fast
+if typing.TYPE_CHECKING:
+    import requests_cache
+
 
 ######################################################################
 ## gallery classes
@@ -53,11 +59,14 @@ Accessor for an embeddable URL.
     def thumbify (
         self,
         img_url: str,
-        session: requests_cache.CachedSession,
+        session: "requests_cache.CachedSession",
         ) -> str:
         """
 Access an image by URL, resize to thumbnail, convert to a data URL.
         """
+        from PIL import Image  # pylint: disable=C0415
+        import requests  # pylint: disable=C0415
+
         data_url: str = img_url
 
         try:
@@ -87,7 +96,7 @@ Access an image by URL, resize to thumbnail, convert to a data URL.
 
     def get_thumbnail (
         self,
-        session: requests_cache.CachedSession,
+        session: "requests_cache.CachedSession",
         ) -> str:
         """
 Accessor for a thumbnail URL.
@@ -104,17 +113,27 @@ Accessor for a thumbnail URL.
 ######################################################################
 ## yields classes
 
-class Product (BaseModel):  # pylint: disable=R0902
+class Product (BaseModel, arbitrary_types_allowed = True):  # pylint: disable=R0902
     """
 A data class representing one Product object.
     """
-    loc: dict
+    loc: SourceLocation
     symbol: str
     amount: Measure
     intermediate: bool
     ref_count: NonNegativeInt = 0
 
 
+    def scale (
+        self,
+        factor: float,
+        ) -> "Product":
+        """
+A shallow copy of this product with its amount scaled.
+        """
+        return self.model_copy(update = { "amount": self.amount.scale(factor) })
+
+
 ######################################################################
 ## structural classes
 
@@ -126,6 +145,33 @@ A data class representing one Activity object.
     ops: typing.List[ OpsTypes ] = []
 
 
+    def get_output (
+        self,
+        converter: Converter,
+        ) -> ActivityModel:
+        """
+Typed output model.
+        """
+        steps: typing.List[ ActivityStep ] = [
+            ActivityStep(
+                ingredients = [
+                    op.get_output(converter)
+                    for op in self.ops
+                    if isinstance(op, OpAdd)
+                ]
+            )
+        ]
+
+        for op in self.ops:
+            if not isinstance(op, OpAdd):
+                steps.append(op.get_step(converter))
+
+        return ActivityModel(
+            title = self.text,
+            steps = steps,
+        )
+
+
     def get_model (
         self,
         converter: Converter,
@@ -133,24 +179,23 @@ A data class representing one Activity object.
         """
 Serializable representation for JSON.
         """
-        dat: dict = {
-            "title": self.text,
-            "steps": [
-                {
-                    "ingredients": [
-                        op.get_model(converter)
-                        for op in self.ops
-                        if isinstance(op, OpAdd)
-                    ]
-                }
-            ]
-        }
+        return self.get_output(converter).model_dump()
 
-        for op in self.ops:
-            if not isinstance(op, OpAdd):
-                dat["steps"].append(op.get_model())
 
-        return dat
+    def scale (
+        self,
+        factor: float,
+        ) -> "Activity":
+        """
+A shallow copy of this activity with the measure of each `ADD`
+scaled, which shares all of its other operations.
+        """
+        return self.model_copy(update = {
+            "ops": [
+                op.scale(factor) if isinstance(op, OpAdd) else op
+                for op in self.ops
+            ]
+        })
 
 
 class Focus (BaseModel):  # pylint: disable=R0902
@@ -161,6 +206,19 @@ A data class representing a parsed Focus object.
     activities: typing.List[ Activity ] = []
 
 
+    def get_output (
+        self,
+        converter: Converter,
+        ) -> FocusModel:
+        """
+Typed output model.
+        """
+        return FocusModel(
+            container = self.container.symbol,
+            activities = [ act.get_output(converter) for act in self.activities ],
+        )
+
+
     def get_model (
         self,
         converter: Converter,
@@ -168,10 +226,20 @@ A data class representing a parsed Focus object.
         """
 Serializable representation for JSON.
         """
-        return {
-            "container": self.container.symbol,
-            "activities": [ act.get_model(converter) for act in self.activities ],
-        }
+        return self.get_output(converter).model_dump()
+
+
+    def scale (
+        self,
+        factor: float,
+        ) -> "Focus":
+        """
+A shallow copy of this focus with its activities scaled, which shares
+the container dependency.
+        """
+        return self.model_copy(update = {
+            "activities": [ act.scale(factor) for act in self.activities ]
+        })
 
 
 class Closure (BaseModel, arbitrary_types_allowed = True):  # pylint: disable=R0902
@@ -188,20 +256,134 @@ A data class representing one parsed Closure object.
     ingredients: DependencyDict = DependencyDict()
     foci: typing.List[ Focus ] = []
     products: typing.List[ Product ] = []
+    ratio: typing.Optional[ Ratio ] = None
 
 
-    def get_dependencies (
+    def __getstate__ (
         self
-        ) -> list:
+        ) -> dict:
         """
-Serialized representation in JSON for the containers and tools.
+Pickle support, which drops the reference to the `textx` parse
+object since that cannot be serialized.
+        """
+        state: dict = super().__getstate__()
+        state["__dict__"] = { **state["__dict__"], "obj": None }
+        return state
+
+
+    def scale (
+        self,
+        factor: float,
+        ) -> "Closure":
+        """
+A shallow copy of this closure with its products and the measure of
+each `ADD` scaled by `factor`, which shares all of the unchanged
+structure, e.g., dependencies and other operations, with the original.
+        """
+        return self.model_copy(update = {
+            "foci": [ focus.scale(factor) for focus in self.foci ],
+            "products": [ product.scale(factor) for product in self.products ],
+        })
+
+
+    def get_part_amounts (
+        self,
+        converter: Converter,
+        ) -> typing.Dict[ str, float ]:
+        """
+Accessor for the total amount in grams which this closure adds for
+each part of its ratio, converting volumes by the density of each
+ingredient. Parts with any amount which does not convert into grams,
+e.g., a count of eggs, get left out.
+        """
+        if self.ratio is None:
+            return {}
+
+        amounts: typing.Dict[ str, float ] = {}
+        unknown: typing.Set[ str ] = set()
+
+        for focus in self.foci:
+            for activity in focus.activities:
+                for op in activity.ops:
+                    if not isinstance(op, OpAdd):
+                        continue
+
+                    try:
+                        part: str = self.ratio.get_part(op.symbol).symbol
+                    except KeyError:
+                        continue
+
+                    conv: typing.Optional[ Conversion ] = converter.get(op.symbol)
+
+                    try:
+                        grams: float = op.measure.convert("g", conversion = conv).amount
+                    except ValueError:
+                        unknown.add(part)
+                        continue
+
+                    amounts[part] = amounts.get(part, 0.0) + grams
+
+        return {
+            part: amount
+            for part, amount in amounts.items()
+            if part not in unknown
+        }
+
+
+    def check_ratio (
+        self,
+        converter: Converter,
+        ) -> typing.Dict[ str, float ]:
+        """
+Compare the amounts which this closure adds with the declared weights
+of its ratio, returning the relative deviation of each part's share,
+for the parts with both.
+        """
+        if self.ratio is None:
+            return {}
+
+        measured: typing.Dict[ str, float ] = self.get_part_amounts(converter)
+
+        declared: typing.Dict[ str, float ] = {
+            part.symbol: part.weight
+            for part in self.ratio.parts
+            if part.weight is not None and part.symbol in measured
+        }
+
+        total_declared: float = sum(declared.values())
+        total_measured: float = sum(measured[part] for part in declared)
+
+        if total_declared <= 0.0 or total_measured <= 0.0:
+            return {}
+
+        return {
+            part: (measured[part] / total_measured) / (weight / total_declared) - 1.0
+            for part, weight in declared.items()
+            if weight > 0.0
+        }
+
+
+    def get_requires (
+        self
+        ) -> typing.List[ DependencyModel ]:
+        """
+Typed output models for the containers and tools.
         """
         return [
-            dep.get_model()
+            dep.get_output()
             for dep in itertools.chain(self.containers.values(), self.tools.values())
         ]
 
 
+    def get_dependencies (
+        self
+        ) -> list:
+        """
+Serialized representation in JSON for the containers and tools.
+        """
+        return [ dep.model_dump() for dep in self.get_requires() ]
+
+
     def total_yields (
         self,
         *,
@@ -7,10 +7,8 @@ Convert a corpus of Bywd modules into HTML.
 
 import pathlib
 import sys
-import typing
 
 from icecream import ic
-import requests_cache
 
 import bwyd
 
@@ -25,37 +23,49 @@ if __name__ == "__main__":
     ])
 
 
-    ## render each module as HTML
+    ## render each module as HTML, plus the search/discovery index,
+    ## reprocessing only the modules which changed since the last build
     corpus: bwyd.Corpus = dsl.build_corpus()
     dir_path: pathlib.Path = pathlib.Path("examples")
 
-    module_iter: typing.Iterator[ bwyd.Module ] = corpus.parse_modules(
+    ## reference the icon and stylesheet as shared assets, rather than
+    ## inlining them into every page
+    #corpus.use_shared_assets(dir_path / "assets")
+
+    ## write precompressed `.gz` (plus `.br`, with `brotli` installed)
+    ## siblings alongside each output, for static serving
+    #corpus.use_precompression()
+
+    report: bwyd.BuildReport = corpus.build(
         dir_path,
         #glob = "potato*.bwyd",
+        #incremental = False,
+        cache = corpus.get_module_cache(),
+        render_cache = corpus.get_render_cache(),
         debug = True, # False
     )
 
-    modules: list[ bwyd.Module ] = []
-
-    for module in module_iter:
-        modules.append(module)
-
-        # render HTML using the Jinja2 template
-        html_path: pathlib.Path = module.path.with_suffix(".html")
+    ic(report)
 
-        with open(html_path, "w", encoding = "utf-8") as fp:
-            fp.write(module.render_template())
-
-    ## search/discovery support
-    corpus.render_discovery(
-        modules,
-        dir_path / "index.html",
-    )
+    ## or render every module, in a thread pool pipeline
+    #render_report: bwyd.RenderReport = corpus.render_pages(
+    #    dir_path,
+    #    cache = corpus.get_module_cache(),
+    #    render_cache = corpus.get_render_cache(),
+    #    workers = 8,
+    #)
+    #ic(render_report.pages_per_sec())
 
 
     ## KG prototype support
     sys.exit(0)
 
+    modules: list[ bwyd.Module ] = list(corpus.parse_modules(
+        dir_path,
+        cache = corpus.get_module_cache(),
+        #workers = 8,
+    ))
+
     graph: bwyd.Graph = corpus.build_graph(modules)
 
     with open("kg.rdf", "w", encoding = "utf-8") as fp:
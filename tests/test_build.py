@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * incremental corpus build
+  * incremental build with a narrower glob
+  * watch mode
+  * streaming render to file
+  * shared static assets
+  * precompressed outputs
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import gzip
+import pathlib
+import tempfile
+import threading
+import time
+
+import bwyd  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def stage_corpus (
+    dir_path: pathlib.Path,
+    ) -> bwyd.Corpus:
+    """
+Copy the examples without their `POST:` lines, so that building the
+index does not need network access for thumbnails.
+    """
+    for bwyd_path in EXAMPLES_DIR.glob("*.bwyd"):
+        lines: list = bwyd_path.read_text(encoding = "utf-8").splitlines(keepends = True)
+        text: str = "".join([ line for line in lines if not line.startswith("POST:") ])
+        (dir_path / bwyd_path.name).write_text(text, encoding = "utf-8")
+
+    config: dict = {
+        "bwyd": {
+            "cache_path": str(dir_path / "bwyd.cache"),
+            "cache_expire": 360,
+        },
+    }
+
+    return bwyd.Corpus(config, bwyd.Bwyd().converter)
+
+
+def test_incremental_build (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Only edited modules get rebuilt, and the index only when a summary changed.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_path: pathlib.Path = pathlib.Path(tmp_dir)
+        corpus: bwyd.Corpus = stage_corpus(dir_path)
+        n_modules: int = len(list(corpus.iter_files(dir_path)))
+
+        report: bwyd.BuildReport = corpus.build(dir_path)
+        assert len(report.rendered) == n_modules
+        assert report.index_rendered
+
+        report = corpus.build(dir_path)
+        assert report.rendered == []
+        assert not report.index_rendered
+
+        # an edit which does not change the summary
+        gravlax_path: pathlib.Path = dir_path / "gravlax.bwyd"
+        text: str = gravlax_path.read_text(encoding = "utf-8")
+        gravlax_path.write_text(text.replace("Sauté the skin", "Fry the skin"), encoding = "utf-8")
+
+        report = corpus.build(dir_path)
+
+        if debug:
+            print(report)
+
+        assert report.rendered == [ str(gravlax_path) ]
+        assert report.written == [ str(gravlax_path.with_suffix(".html")) ]
+        assert not report.index_rendered
+
+        # an edit which changes the summary
+        text = gravlax_path.read_text(encoding = "utf-8")
+        gravlax_path.write_text(text.replace('TITLE: "Gravlax"', 'TITLE: "Cured Salmon"'), encoding = "utf-8")
+
+        report = corpus.build(dir_path)
+        assert report.rendered == [ str(gravlax_path) ]
+        assert report.index_rendered
+        assert "Cured Salmon" in (dir_path / "index.html").read_text(encoding = "utf-8")
+
+        # removing a source removes its output
+        gravlax_path.unlink()
+        report = corpus.build(dir_path)
+        assert report.removed == [ str(gravlax_path) ]
+        assert not gravlax_path.with_suffix(".html").exists()
+
+
+def test_narrow_glob (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+A build with a narrower glob leaves the outputs of the modules outside
+of it in place, along with their entries in the index.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_path: pathlib.Path = pathlib.Path(tmp_dir)
+        corpus: bwyd.Corpus = stage_corpus(dir_path)
+        html_paths: list = [ bwyd_path.with_suffix(".html") for bwyd_path in corpus.iter_files(dir_path) ]
+
+        corpus.build(dir_path)
+        index_html: bytes = (dir_path / "index.html").read_bytes()
+
+        gravlax_path: pathlib.Path = dir_path / "gravlax.bwyd"
+        text: str = gravlax_path.read_text(encoding = "utf-8")
+        gravlax_path.write_text(text.replace("Sauté the skin", "Fry the skin"), encoding = "utf-8")
+
+        report: bwyd.BuildReport = corpus.build(dir_path, glob = "gravlax.bwyd")
+
+        if debug:
+            print(report)
+
+        assert report.rendered == [ str(gravlax_path) ]
+        assert report.removed == []
+        assert not report.index_rendered
+        assert all(html_path.exists() for html_path in html_paths)
+        assert (dir_path / "index.html").read_bytes() == index_html
+
+        # a full build afterwards finds nothing left to do
+        report = corpus.build(dir_path)
+        assert report.rendered == []
+        assert not report.index_rendered
+
+
+def test_watch (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+A burst of edits to one module gets debounced into a single rebuild
+of just that module.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_path: pathlib.Path = pathlib.Path(tmp_dir)
+        corpus: bwyd.Corpus = stage_corpus(dir_path)
+        reports: list = []
+
+        watcher: threading.Thread = threading.Thread(
+            target = corpus.watch,
+            args = ( dir_path, ),
+            kwargs = {
+                "interval": 0.05,
+                "debounce": 0.2,
+                "max_batches": 1,
+                "on_build": reports.append,
+            },
+        )
+
+        watcher.start()
+
+        while len(reports) < 1:
+            time.sleep(0.05)
+
+        gravlax_path: pathlib.Path = dir_path / "gravlax.bwyd"
+        text: str = gravlax_path.read_text(encoding = "utf-8")
+
+        for _ in range(3):
+            text = text.replace("Sauté the skin", "Fry the skin")
+            gravlax_path.write_text(text + "\n", encoding = "utf-8")
+            time.sleep(0.05)
+
+        watcher.join(timeout = 30.0)
+
+        if debug:
+            print(reports)
+
+        assert not watcher.is_alive()
+        assert len(reports) == 2
+        assert reports[1].rendered == [ str(gravlax_path) ]
+        assert not reports[1].index_rendered
+
+
+def test_render_to_file (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Rendering a page into a file, minified or streamed, writes the same
+bytes as rendering it to a string, and returns their hash.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    module: bwyd.Module = dsl.load(EXAMPLES_DIR / "gravlax.bwyd")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        html_path: pathlib.Path = pathlib.Path(tmp_dir) / "gravlax.html"
+
+        for minify in [ True, False ]:
+            digest: str = module.render_to_file(html_path, minify = minify)
+            html: bytes = module.render_template(minify = minify).encode("utf-8")
+
+            if debug:
+                print(minify, digest, len(html))
+
+            assert html_path.read_bytes() == html
+            assert digest == bwyd.manifest.bytes_digest(html)
+
+
+def test_shared_assets (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+With shared assets, the pages and the index reference the icon and
+the stylesheet once, through their content-hashed files.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_path: pathlib.Path = pathlib.Path(tmp_dir)
+        corpus: bwyd.Corpus = stage_corpus(dir_path)
+        html_path: pathlib.Path = dir_path / "gravlax.html"
+
+        corpus.build(dir_path)
+        inline_size: int = html_path.stat().st_size
+
+        assets: bwyd.StaticAssets = corpus.use_shared_assets(dir_path / "assets")
+        icon_url: str = f"assets/{assets.files['icon']}"
+        style_url: str = f"assets/{assets.files['stylesheet']}"
+
+        # changing the mode rebuilds everything
+        report: bwyd.BuildReport = corpus.build(dir_path)
+        assert len(report.rendered) == len(list(corpus.iter_files(dir_path)))
+
+        html: str = html_path.read_text(encoding = "utf-8")
+        index_html: str = (dir_path / "index.html").read_text(encoding = "utf-8")
+
+        if debug:
+            print(assets, inline_size, html_path.stat().st_size)
+
+        assert html_path.stat().st_size < inline_size
+        assert bwyd.BWYD_SVG not in html and bwyd.BWYD_SVG not in index_html
+        assert icon_url in html and style_url in html and icon_url in index_html
+
+        assert (dir_path / icon_url).read_bytes() == bwyd.ICON_PATH.read_bytes()
+        assert (dir_path / style_url).read_bytes() == bwyd.STYLESHEET_PATH.read_bytes()
+
+        # pages in other directories, or on a CDN
+        module: bwyd.Module = corpus.parse_module(dir_path / "gravlax.bwyd")
+        sub_dir: pathlib.Path = dir_path / "sub"
+        sub_dir.mkdir()
+
+        module.render_to_file(sub_dir / "gravlax.html", assets = assets)
+        assert f"../{icon_url}" in (sub_dir / "gravlax.html").read_text(encoding = "utf-8")
+
+        cdn_assets: bwyd.StaticAssets = bwyd.StaticAssets.write(
+            dir_path / "assets",
+            base_url = "https://cdn.example.com/bwyd/",
+        )
+
+        assert module.get_page_model(assets = cdn_assets).icon == f"https://cdn.example.com/bwyd/{assets.files['icon']}"
+
+
+def test_precompress (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Compressed siblings get written alongside each output, even when
+precompression gets turned on after a build, then only compressed
+again when the output bytes change.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dir_path: pathlib.Path = pathlib.Path(tmp_dir)
+        corpus: bwyd.Corpus = stage_corpus(dir_path)
+
+        html_path: pathlib.Path = dir_path / "gravlax.html"
+        gz_path: pathlib.Path = dir_path / "gravlax.html.gz"
+
+        report: bwyd.BuildReport = corpus.build(dir_path)
+        n_modules: int = len(list(corpus.iter_files(dir_path)))
+        assert report.compressed == []
+
+        corpus.use_precompression(formats = [ ".gz" ], workers = 2)
+        report = corpus.build(dir_path)
+
+        if debug:
+            print(report.compressed)
+
+        assert len(report.compressed) == n_modules + 1
+        assert gzip.decompress(gz_path.read_bytes()) == html_path.read_bytes()
+        assert gzip.decompress((dir_path / "index.html.gz").read_bytes()) == (dir_path / "index.html").read_bytes()
+
+        # an edit which does not change the page bytes, nor the index
+        gravlax_path: pathlib.Path = dir_path / "gravlax.bwyd"
+        text: str = gravlax_path.read_text(encoding = "utf-8")
+        gravlax_path.write_text(text + "\n", encoding = "utf-8")
+        index_mtime: int = (dir_path / "index.html").stat().st_mtime_ns
+
+        report = corpus.build(dir_path)
+        assert report.rendered == [ str(gravlax_path) ]
+        assert report.compressed == []
+        assert (dir_path / "index.html").stat().st_mtime_ns == index_mtime
+
+        # an edit which does
+        gravlax_path.write_text(text.replace("Sauté the skin", "Fry the skin"), encoding = "utf-8")
+
+        report = corpus.build(dir_path)
+        assert report.compressed == [ str(gz_path) ]
+        assert gzip.decompress(gz_path.read_bytes()) == html_path.read_bytes()
+
+        # without precompression, stale siblings get removed
+        corpus.precompressor = None
+        gravlax_path.write_text(text, encoding = "utf-8")
+
+        corpus.build(dir_path)
+        assert not gz_path.exists()
+        assert not (dir_path / "index.html.gz").exists()
+
+        # streamed pages get compressed in the same pass
+        precompressor: bwyd.Precompressor = bwyd.Precompressor(formats = [ ".gz" ])
+        module: bwyd.Module = bwyd.Bwyd().load(gravlax_path)
+        module.render_to_file(html_path, minify = False, precompressor = precompressor)
+
+        assert precompressor.close() == [ str(gz_path) ]
+        assert gz_path.read_bytes() == gzip.compress(html_path.read_bytes(), compresslevel = 9, mtime = 0)
+
+        try:
+            bwyd.Precompressor(formats = [ ".zip" ])
+            assert False, "unknown compressed format"
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_incremental_build(debug = True)
+    test_narrow_glob(debug = True)
+    test_watch(debug = True)
+    test_render_to_file(debug = True)
+    test_shared_assets(debug = True)
+    test_precompress(debug = True)
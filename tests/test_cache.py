@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * module cache
+  * module cache fill
+  * module cache key hashing
+  * metamodel cache
+  * render cache
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import json
+import pathlib
+import shutil
+import tempfile
+import typing
+
+import bwyd  # pylint: disable=C0413,E0401
+import bwyd.cache  # pylint: disable=C0413,E0401
+from bwyd.dsl import MetaModelCache  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def test_module_cache (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Parse a sample file twice through the cache, then invalidate it.
+    """
+    slug: str = "frozen_gnocchi"
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir) / "src"
+        src_dir.mkdir()
+        shutil.copyfile(EXAMPLES_DIR / f"{slug}.bwyd", src_dir / f"{slug}.bwyd")
+
+        cache: bwyd.ModuleCache = corpus.get_module_cache(
+            cache_path = pathlib.Path(tmp_dir) / "cache",
+        )
+
+        first: list = list(corpus.parse_modules(src_dir, cache = cache))
+        second: list = list(corpus.parse_modules(src_dir, cache = cache))
+
+        if debug:
+            print(cache.hits, cache.misses)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second[0].parse_tree is None
+        assert second[0].get_model() == first[0].get_model()
+
+        json_path: pathlib.Path = EXAMPLES_DIR / f"{slug}.json"
+        exp_data: dict = json.load(open(json_path, "r", encoding = "utf-8"))  # pylint: disable=R1732
+        assert sorted(second[0].get_model().items()) == sorted(exp_data.items())
+
+        # an edited source file must miss
+        with open(src_dir / f"{slug}.bwyd", "a", encoding = "utf-8") as fp:
+            fp.write("\n// edited\n")
+
+        list(corpus.parse_modules(src_dir, cache = cache))
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # the stale entry was replaced, then explicit invalidation
+        assert cache.invalidate(src_dir / f"{slug}.bwyd") == 1
+        assert cache.invalidate() == 0
+
+
+def test_module_cache_fill (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Filling the cache must not scan its directory per put, which would
+make a cold fill quadratic in the number of entries.
+    """
+    n_files: int = 300
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir) / "src"
+        src_dir.mkdir()
+
+        module: bwyd.Module = corpus.parse_module(EXAMPLES_DIR / "gravlax.bwyd")
+        paths: typing.List[ pathlib.Path ] = []
+
+        for i in range(n_files):
+            paths.append(src_dir / f"gravlax_{i}.bwyd")
+            shutil.copyfile(EXAMPLES_DIR / "gravlax.bwyd", paths[-1])
+
+        cache: bwyd.ModuleCache = corpus.get_module_cache(
+            cache_path = pathlib.Path(tmp_dir) / "cache",
+        )
+
+        # count the directory scans
+        scans: typing.List[ str ] = []
+        orig_glob: typing.Callable = pathlib.Path.glob
+
+        def counting_glob (
+            self: pathlib.Path,
+            pattern: str,
+            **kwargs: typing.Any,
+            ) -> typing.Iterator[ pathlib.Path ]:
+            """
+Wrap `pathlib.Path.glob` to count its calls.
+            """
+            scans.append(pattern)
+            return orig_glob(self, pattern, **kwargs)
+
+        pathlib.Path.glob = counting_glob  # type: ignore
+
+        try:
+            for bwyd_path in paths:
+                module.path = bwyd_path
+                cache.put(module, corpus.converter)
+        finally:
+            pathlib.Path.glob = orig_glob  # type: ignore
+
+        if debug:
+            print(scans)
+
+        assert len(scans) <= 1
+        assert len(list(cache.cache_dir.glob("*.pkl"))) == n_files
+
+        # replacing entries keeps one per source file
+        module.path = paths[0]
+        cache.put(module, corpus.converter)
+        assert len(list(cache.cache_dir.glob("*.pkl"))) == n_files
+
+        # the running total still triggers eviction
+        entry_size: int = next(cache.cache_dir.glob("*.pkl")).stat().st_size
+        cache.max_bytes = 10 * entry_size
+        cache.put(module, corpus.converter)
+
+        assert len(list(cache.cache_dir.glob("*.pkl"))) <= 10
+
+
+def test_module_cache_digests (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Lookups hash the unit converter once, rather than once per lookup,
+then again after the converter gets extended.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+    gravlax_path: pathlib.Path = EXAMPLES_DIR / "gravlax.bwyd"
+    calls: typing.List[ int ] = []
+    orig_digest: typing.Callable = bwyd.cache.converter_digest
+
+    def counting_digest (
+        converter: bwyd.Converter,
+        ) -> str:
+        """
+Wrap `converter_digest()` to count its calls.
+        """
+        calls.append(len(converter))
+        return orig_digest(converter)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache: bwyd.ModuleCache = bwyd.ModuleCache(pathlib.Path(tmp_dir))
+        bwyd.cache.converter_digest = counting_digest  # type: ignore
+
+        try:
+            cache.put(corpus.parse_module(gravlax_path), corpus.converter)
+
+            for _ in range(5):
+                assert cache.get(gravlax_path, corpus.converter) is not None
+
+            converter: bwyd.Converter = dict(corpus.converter)
+            converter["unobtainium"] = next(iter(converter.values()))
+
+            assert cache.get(gravlax_path, converter) is None
+        finally:
+            bwyd.cache.converter_digest = orig_digest  # type: ignore
+
+    if debug:
+        print(calls)
+
+    assert len(calls) == 2
+
+
+def test_meta_model_cache (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The metamodel gets built once, then rebuilt when the grammar changes.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        grammar_path: pathlib.Path = pathlib.Path(tmp_dir) / "bwyd.tx"
+        shutil.copyfile(bwyd.GRAMMAR_PATH, grammar_path)
+
+        mm_cache: MetaModelCache = MetaModelCache(grammar_path)
+        first: typing.Any = mm_cache.get()
+
+        assert mm_cache.get() is first
+        assert mm_cache.builds == 1
+
+        with open(grammar_path, "a", encoding = "utf-8") as fp:
+            fp.write("\n// grammar edited\n")
+
+        assert mm_cache.get() is not first
+
+        if debug:
+            print(mm_cache.builds)
+
+        assert mm_cache.builds == 2
+
+
+def test_render_cache (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Render a page twice through the cache, then rebuild a module whose
+source changed without changing its page model.
+    """
+    slug: str = "frozen_gnocchi"
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir) / "src"
+        src_dir.mkdir()
+
+        # without its `POST:` lines, building the index needs no network access
+        lines: list = (EXAMPLES_DIR / f"{slug}.bwyd").read_text(encoding = "utf-8").splitlines(keepends = True)
+        bwyd_path: pathlib.Path = src_dir / f"{slug}.bwyd"
+        bwyd_path.write_text("".join([ line for line in lines if not line.startswith("POST:") ]), encoding = "utf-8")
+
+        corpus: bwyd.Corpus = bwyd.Corpus(
+            { "bwyd": { "cache_path": str(pathlib.Path(tmp_dir) / "bwyd.cache"), "cache_expire": 360, }, },
+            dsl.converter,
+        )
+
+        render_cache: bwyd.RenderCache = corpus.get_render_cache(
+            cache_path = pathlib.Path(tmp_dir) / "pages",
+        )
+
+        module: bwyd.Module = corpus.parse_module(bwyd_path)
+        html: str = module.render_template()
+
+        assert module.render_template(render_cache = render_cache) == html
+        assert module.render_template(render_cache = render_cache) == html
+        assert (render_cache.hits, render_cache.misses) == (1, 1)
+
+        # a different model or different options must miss
+        assert module.scale(2.0).render_template(render_cache = render_cache) != html
+        assert module.render_template(minify = False, render_cache = render_cache) != html
+        assert (render_cache.hits, render_cache.misses) == (1, 3)
+
+        # an edited comment rebuilds the module, but its page comes from
+        # the cache and its output file does not get rewritten
+        corpus.build(src_dir, render_cache = render_cache)
+
+        with open(bwyd_path, "a", encoding = "utf-8") as fp:
+            fp.write("\n// edited\n")
+
+        report: bwyd.BuildReport = corpus.build(src_dir, render_cache = render_cache)
+
+        if debug:
+            print(render_cache.hits, render_cache.misses, report)
+
+        assert report.rendered == [ str(bwyd_path) ]
+        assert report.written == []
+        assert bwyd_path.with_suffix(".html").read_text(encoding = "utf-8") == html
+
+        # overwriting an entry does not count its size twice
+        key: str = "0" * 64
+        render_cache.put(key, html)
+        total_bytes: typing.Optional[ int ] = render_cache._total_bytes  # pylint: disable=W0212
+
+        for _ in range(3):
+            render_cache.put(key, html)
+
+        assert render_cache._total_bytes == total_bytes  # pylint: disable=W0212
+
+        assert render_cache.clear() == 4
+
+
+if __name__ == "__main__":
+    test_module_cache(debug = True)
+    test_module_cache_fill(debug = True)
+    test_module_cache_digests(debug = True)
+    test_meta_model_cache(debug = True)
+    test_render_cache(debug = True)
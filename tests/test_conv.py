@@ -5,15 +5,23 @@
 unit tests:
 
   * converter
+  * unit conversion factors
+  * batched conversion
+  * memoized fractions and plurals
+  * unit-normalized totals
 
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
 
 import json
 import pathlib
+from fractions import Fraction
+import math
 import sys
+import typing
 
 import bwyd  # pylint: disable=C0413,E0401
+from bwyd import batch  # pylint: disable=C0413,E0401
 
 
 def test_converter (
@@ -49,5 +57,164 @@ Test example conversions.
     assert obs_conv == exp_conv
 
 
+def test_convert (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Test conversions through the precomputed unit factor tables.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    ## 1 tbsp == 3 tsp, within the same dimension
+
+    obs_tsp: bwyd.Measure = bwyd.Measure(amount = 1.0, units = "tbsp").convert("tsp")
+
+    if debug:
+        print(obs_tsp)
+
+    assert math.isclose(obs_tsp.amount, 3.0)
+
+    ## 1 kg flour == 1000 / 170 cups, across dimensions
+
+    flour: bwyd.Measure = bwyd.Measure(amount = 1.0, units = "kg")
+    obs_cup: bwyd.Measure = flour.convert("cup", conversion = dsl.converter["flour"])
+
+    if debug:
+        print(obs_cup)
+
+    assert math.isclose(obs_cup.amount, 1000.0 / 170.0)
+
+    ## mass and volume do not mix without a conversion
+
+    try:
+        flour.convert("cup")
+        assert False, "converted mass into volume"
+    except ValueError:
+        pass
+
+
+def test_batch (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Test that batched humanization matches the per-measure results, both
+with and without NumPy.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    amounts: typing.List[ float ] = [ 25.0, 0.5, 1173.0, 294.0, 15.0, 0.9, 3.0, 100.0, 2.0, ]
+    units: typing.List[ typing.Optional[ str ] ] = [ "g", "l", "g", "g", "ml", "kg", "g", None, "cup", ]
+    symbols: typing.List[ str ] = [ "sugar", "milk", "flour", "milk", "vanilla_extract", "potato", "salt", "egg", "flour", ]  # pylint: disable=C0301
+
+    exp_conv: typing.List[ str ] = [
+        bwyd.Measure(amount = amount, units = units[i]).humanize_convert(symbols[i], True, dsl.converter)  # pylint: disable=C0301
+        for i, amount in enumerate(amounts)
+    ]
+
+    numpy: typing.Any = batch.np
+
+    try:
+        for np_module in [ numpy, None ]:
+            batch.np = np_module
+            obs_conv: typing.List[ str ] = batch.humanize_convert_batch(
+                amounts,
+                units,
+                symbols,
+                dsl.converter,
+                externals = [ True ] * len(amounts),
+            )
+
+            if debug:
+                print(obs_conv)
+
+            assert obs_conv == exp_conv
+    finally:
+        batch.np = numpy
+
+    ## 1 tbsp == 3 tsp, 1 kg flour == 1000 / 170 cups
+
+    obs_amounts: typing.Sequence[ float ] = batch.convert_batch(
+        [ 1.0, 1.0, ],
+        [ "tbsp", "kg", ],
+        "cup",
+        symbols = [ "sugar", "flour", ],
+        converter = dsl.converter,
+    )
+
+    assert math.isclose(obs_amounts[0], 1.0 / 16.0)
+    assert math.isclose(obs_amounts[1], 1000.0 / 170.0)
+
+
+def test_memo_tables (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Test the precomputed fraction and plural tables against computing
+each value directly.
+    """
+    for i in range(1000):
+        amount: float = i / 997.0
+
+        for digits, denom_limit in [ ( 1, 8, ), ( 2, 8, ), ( 2, 4, ), ]:
+            exp_human: str = str(Fraction(round(amount, digits)).limit_denominator(denom_limit))
+            assert bwyd.measure.humanize_fraction(amount, digits, denom_limit) == exp_human
+
+    engine: typing.Any = bwyd.measure.get_plural_engine()
+
+    for units in [ *bwyd.MeasureUnits, *bwyd.DurationUnits, "pinch", ]:
+        if debug:
+            print(units, bwyd.measure.pluralize(units))
+
+        assert bwyd.measure.pluralize(units) == engine.plural(units)
+
+
+def test_totals (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Test totals which convert mixed units, including between mass and
+volume by density.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    totals: bwyd.measure.MeasureTotals = bwyd.measure.MeasureTotals(dsl.converter)
+
+    assert totals.add("sugar", bwyd.Measure(amount = 100.0, units = "g"))
+    assert totals.add("sugar", bwyd.Measure(amount = 0.5, units = "kg"))
+    assert totals.add("flour", bwyd.Measure(amount = 1.0, units = "cup"))
+    assert totals.add("flour", bwyd.Measure(amount = 170.0, units = "g"))
+    assert totals.add("egg", bwyd.Measure(amount = 2.0, units = None))
+    assert not totals.add("egg", bwyd.Measure(amount = 50.0, units = "g"))
+
+    obs_totals: dict = {
+        symbol: ( measure.amount, measure.units, )
+        for symbol, measure in totals.items()
+    }
+
+    if debug:
+        print(obs_totals)
+
+    assert obs_totals["sugar"] == ( 600.0, "g", )
+    assert math.isclose(obs_totals["flour"][0], 2.0) and obs_totals["flour"][1] == "cup"
+    assert obs_totals["egg"] == ( 2.0, None, )
+
+    # canonical units for corpus-wide rollups
+    canonical: bwyd.measure.MeasureTotals = bwyd.measure.MeasureTotals(dsl.converter, canonical = True)
+    canonical.add("sugar", bwyd.Measure(amount = 0.5, units = "kg"))
+    canonical.add("milk", bwyd.Measure(amount = 250.0, units = "ml"))
+    canonical.add("milk", bwyd.Measure(amount = 245.0, units = "g"))
+
+    assert canonical.totals["sugar"].amount == 500.0 and canonical.totals["sugar"].units == "g"
+    assert math.isclose(canonical.totals["milk"].amount, 0.25 + 1.0 / 4.226753)
+    assert canonical.totals["milk"].units == "l"
+
+
 if __name__ == "__main__":
     test_converter(debug = True)
+    test_convert(debug = True)
+    test_batch(debug = True)
+    test_memo_tables(debug = True)
+    test_totals(debug = True)
@@ -5,6 +5,13 @@
 unit tests:
 
   * parser
+  * releasing the parse tree
+  * memoized aggregates
+  * typed JSON output
+  * trusted construction
+  * trusted construction matches pydantic
+  * op handler registry
+  * op step interface
 
 see copyright/license https://github.com/DerwenAI/bwyd/README.md
 """
@@ -12,10 +19,16 @@ see copyright/license https://github.com/DerwenAI/bwyd/README.md
 import json
 import pathlib
 import sys
+import tempfile
+import typing
+
+import pydantic
 
 EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
 sys.path.insert(0, str(EXAMPLES_DIR))
 import bwyd  # pylint: disable=C0413,E0401
+import bwyd.construct  # pylint: disable=C0413,E0401
+import bwyd.ops  # pylint: disable=C0413,E0401
 
 
 def test_parser (
@@ -52,5 +65,262 @@ Load a sample file to ensure the parser works correctly.
     assert sorted(obs_data.items()) == sorted(exp_data.items())
 
 
+def test_release_parse_tree (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Releasing the parse tree after interpretation drops the references
+to it, while the interpreted model stays the same.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    kept: bwyd.Module = dsl.load(gnoc_path, release_parse_tree = False)
+    released: bwyd.Module = dsl.load(gnoc_path)
+
+    if debug:
+        print(kept.parse_tree, released.parse_tree)
+
+    assert kept.parse_tree is not None
+    assert released.parse_tree is None
+    assert all(closure.obj is None for closure in released.closures.values())
+    assert released.get_model() == kept.get_model()
+
+
+def test_aggregates (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The module-level aggregates get computed once, then recomputed after
+being invalidated, e.g., by replacing the unit converter.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    module: bwyd.Module = dsl.load(gnoc_path)
+
+    aggregates: bwyd.ModuleAggregates = module.get_aggregates()
+
+    if debug:
+        print(aggregates)
+
+    assert module.get_aggregates() is aggregates
+    assert module.total_yields() == aggregates.yields
+    assert module.collect_keywords() == aggregates.keywords
+
+    module.converter = dict(dsl.converter)
+    assert module.get_aggregates() is not aggregates
+    assert module.get_aggregates() == aggregates
+
+
+def test_page_json (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The typed page model serializes straight to JSON bytes, matching the
+dictionary model except that Schema.org metadata gets nested as an
+object rather than encoded twice.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+    module: bwyd.Module = bwyd.Bwyd().load(gnoc_path)
+
+    raw: bytes = module.model_dump_json()
+    obs_data: dict = json.loads(raw)
+
+    if debug:
+        print(raw.decode("utf-8"))
+
+    exp_data: dict = module.get_model()
+    assert obs_data["schema_org"] == json.loads(exp_data.pop("schema_org"))
+    assert obs_data["schema_org"]["@type"] == "Recipe"
+
+    obs_data.pop("schema_org")
+    assert obs_data == exp_data
+
+    corpus: bwyd.Corpus = bwyd.Bwyd().build_corpus()
+    assert json.loads(corpus.export_json([ module ])) == [ json.loads(raw) ]
+
+
+def test_trusted (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Trusted construction of parser-produced values yields the same
+interpreted module as full validation, while a negative amount, which
+the grammar allows, still gets rejected.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+
+    for parser in [ "textx", "fast" ]:
+        dsl: bwyd.Bwyd = bwyd.Bwyd(parser = parser)
+        trusted: bwyd.Module = dsl.load(gnoc_path)
+        validated: bwyd.Module = dsl.load(gnoc_path, trusted = False)
+
+        if debug:
+            print(parser, trusted.closures)
+
+        assert trusted.closures == validated.closures
+        assert trusted.get_model() == validated.get_model()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bad_path: pathlib.Path = pathlib.Path(tmp_dir) / "bad.bwyd"
+            bad_path.write_text(
+                gnoc_path.read_text(encoding = "utf-8").replace("ADD ricotta (250 g)", "ADD ricotta (-250 g)"),
+                encoding = "utf-8",
+            )
+
+            try:
+                dsl.load(bad_path)
+                assert False, "negative amount was accepted"
+            except pydantic.ValidationError:
+                pass
+
+
+def test_trusted_slots (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Trusted construction sets every instance slot of a `pydantic` model
+the same way that `model_validate()` does, so that an upgrade which
+changes those internals fails here rather than in later use.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd(parser = "fast")
+    objs: typing.List[ pydantic.BaseModel ] = []
+
+    for bwyd_path in sorted(EXAMPLES_DIR.glob("*.bwyd")):
+        module: bwyd.Module = dsl.load(bwyd_path, trusted = False)
+
+        for closure in module.closures.values():
+            for focus in closure.foci:
+                objs.append(focus.container)
+
+                for act in focus.activities:
+                    objs.append(act)
+
+                    for op in act.ops:
+                        objs.append(op)
+                        objs.extend([
+                            getattr(op, name)
+                            for name in [ "measure", "duration", "temperature" ]
+                            if isinstance(getattr(op, name, None), pydantic.BaseModel)
+                        ])
+
+    kinds: typing.Set[ str ] = set()
+
+    for obj in objs:
+        cls: typing.Type[ pydantic.BaseModel ] = type(obj)
+        fields: dict = { name: getattr(obj, name) for name in obj.model_fields_set }
+
+        validated: pydantic.BaseModel = cls.model_validate(fields)
+        trusted: pydantic.BaseModel = bwyd.construct.trusted_construct(cls, dict(fields))
+        kinds.add(cls.__name__)
+
+        for slot in pydantic.BaseModel.__slots__:
+            assert getattr(trusted, slot) == getattr(validated, slot), f"{cls.__name__}.{slot}"
+
+        assert trusted == validated
+        assert trusted.model_dump() == validated.model_dump()
+
+    if debug:
+        print(sorted(kinds))
+
+    assert { "Activity", "Dependency", "Measure", "Duration", "OpAdd", "OpBake" } <= kinds
+
+
+def test_register_op (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Registering a handler for a grammar rule replaces how its op gets
+interpreted, without changing the other ops.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+    builtin: typing.Callable = bwyd.Module.OP_HANDLERS["Note"]
+    seen: typing.List[ str ] = []
+
+    @bwyd.Module.register_op("Note")
+    def interpret_note (
+        module: bwyd.Module,
+        closure: bwyd.Closure,
+        op_parse: typing.Any,
+        ) -> bwyd.OpNote:
+        seen.append(op_parse.text)
+        return module.build_op(bwyd.OpNote, op_parse, text = op_parse.text.upper())
+
+    try:
+        module: bwyd.Module = bwyd.Bwyd(parser = "fast").load(gnoc_path)
+    finally:
+        bwyd.Module.register_op("Note", builtin)
+
+    notes: typing.List[ bwyd.OpNote ] = [
+        op
+        for closure in module.closures.values()
+        for focus in closure.foci
+        for act in focus.activities
+        for op in act.ops
+        if isinstance(op, bwyd.OpNote)
+    ]
+
+    if debug:
+        print(seen)
+
+    assert len(seen) == len(notes) > 0
+    assert [ note.text for note in notes ] == [ text.upper() for text in seen ]
+    assert bwyd.Module.OP_HANDLERS["Note"] is builtin
+
+
+def test_op_steps (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Every kind of op provides one step through the same interface, while
+the generic op stays abstract.
+    """
+    gnoc_path: pathlib.Path = EXAMPLES_DIR / "frozen_gnocchi.bwyd"
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    module: bwyd.Module = dsl.load(gnoc_path)
+
+    try:
+        bwyd.ops.OpGeneric(loc = None)  # type: ignore  # pylint: disable=E0110
+        assert False, "abstract op was instantiated"
+    except TypeError:
+        pass
+
+    ops: typing.List[ bwyd.OpsTypes ] = [
+        op
+        for closure in module.closures.values()
+        for focus in closure.foci
+        for act in focus.activities
+        for op in act.ops
+    ]
+
+    for op in ops:
+        step: dict = op.get_step(dsl.converter).model_dump()
+
+        if debug:
+            print(type(op).__name__, step)
+
+        assert len(step) == 1
+
+        if isinstance(op, bwyd.OpAdd):
+            assert step["ingredients"] == [ op.get_model(dsl.converter) ]
+
+    assert any(isinstance(op, bwyd.OpAdd) for op in ops)
+    assert not all(isinstance(op, bwyd.OpAdd) for op in ops)
+
+
 if __name__ == "__main__":
     test_parser(debug = True)
+    test_release_parse_tree(debug = True)
+    test_aggregates(debug = True)
+    test_page_json(debug = True)
+    test_trusted(debug = True)
+    test_trusted_slots(debug = True)
+    test_register_op(debug = True)
+    test_op_steps(debug = True)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * parallel parsing
+  * parallel rendering
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import contextlib
+import io
+import pathlib
+import shutil
+import tempfile
+
+import bwyd  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def test_parallel (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Parse the examples in a process pool, alongside one broken file.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir)
+
+        for bwyd_path in EXAMPLES_DIR.glob("*.bwyd"):
+            shutil.copyfile(bwyd_path, src_dir / bwyd_path.name)
+
+        bad_path: pathlib.Path = src_dir / "broken.bwyd"
+        bad_path.write_text('TITLE: "broken"\nTEXT: "oops"\nCLOSURE\n', encoding = "utf-8")
+
+        serial: dict = {
+            module.slug: module.get_model()
+            for module in corpus.parse_modules(EXAMPLES_DIR)
+        }
+
+        for ordered in [ True, False ]:
+            parallel: list = list(corpus.parse_modules(
+                src_dir,
+                workers = 2,
+                ordered = ordered,
+            ))
+
+            if debug:
+                print(ordered, [ module.slug for module in parallel ], corpus.errors)
+
+            assert list(corpus.errors.keys()) == [ bad_path ]
+
+            assert sorted(module.slug for module in parallel) == sorted(serial.keys())
+
+            for module in parallel:
+                assert module.get_model() == serial[module.slug]
+
+        expected: list = [
+            bwyd_path.stem
+            for bwyd_path in corpus.iter_files(src_dir)
+            if bwyd_path != bad_path
+        ]
+
+        # ordered results follow the file order
+        ordered_slugs: list = [
+            module.slug
+            for module in corpus.parse_modules(src_dir, workers = 2)
+        ]
+
+        assert ordered_slugs == expected
+
+        # workers may also use the `textx` metamodel
+        for module in corpus.parse_modules(src_dir, workers = 2, worker_parser = "textx"):
+            assert module.get_model() == serial[module.slug]
+
+        assert list(corpus.errors.keys()) == [ bad_path ]
+
+        # any other error in a worker also skips only its own file
+        neg_path: pathlib.Path = src_dir / "negative.bwyd"
+        neg_path.write_text(
+            (src_dir / "frozen_gnocchi.bwyd").read_text(encoding = "utf-8").replace("ADD ricotta (250 g)", "ADD ricotta (-250 g)"),
+            encoding = "utf-8",
+        )
+
+        slugs: list = [
+            module.slug
+            for module in corpus.parse_modules(src_dir, workers = 2)
+        ]
+
+        if debug:
+            print(slugs, corpus.errors)
+
+        assert slugs == expected
+        assert sorted(corpus.errors.keys()) == sorted([ bad_path, neg_path ])
+        assert isinstance(corpus.errors[neg_path], ValueError)
+
+
+def test_render_pages (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Render the examples through the thread pool pipeline, which must write
+the same bytes as rendering each module serially.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+    corpus: bwyd.Corpus = dsl.build_corpus()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src_dir: pathlib.Path = pathlib.Path(tmp_dir)
+
+        for bwyd_path in EXAMPLES_DIR.glob("*.bwyd"):
+            shutil.copyfile(bwyd_path, src_dir / bwyd_path.name)
+
+        # validation reports unused tools on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial: dict = {
+                str(module.path.with_suffix(".html")): module.render_template().encode("utf-8")
+                for module in corpus.parse_modules(src_dir)
+            }
+
+            report: bwyd.RenderReport = corpus.render_pages(src_dir, workers = 4, queue_size = 3)
+
+        if debug:
+            print(report.workers, len(report.rendered), report.pages_per_sec())
+
+        assert report.rendered == list(serial.keys())
+        assert report.written == report.rendered
+        assert report.pages_per_sec() > 0.0
+
+        for html_path, html in serial.items():
+            assert pathlib.Path(html_path).read_bytes() == html
+
+        # nothing changed, so nothing gets written again
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = corpus.render_pages(src_dir, workers = 1)
+
+        assert len(report.rendered) == len(serial)
+        assert len(report.written) == 0
+
+
+if __name__ == "__main__":
+    test_parallel(debug = True)
+    test_render_pages(debug = True)
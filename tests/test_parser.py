@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * fast parser conformance with `textx`
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import pathlib
+import random
+import typing
+
+import textx  # type: ignore  # pylint: disable=E0401
+
+import bwyd  # pylint: disable=C0413,E0401
+from bwyd.dsl import META_MODEL_CACHE  # pylint: disable=C0413,E0401
+from bwyd.parser import FastParser, NODE_FIELDS  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def compare_trees (
+    expected: typing.Any,
+    observed: typing.Any,
+    path: str = "Module",
+    ) -> None:
+    """
+Compare a `textx` model with a fast parse tree, node by node,
+including rule names, attributes, and source locations.
+    """
+    assert expected.__class__.__name__ == observed.__class__.__name__, path
+
+    if hasattr(expected, "_tx_position"):
+        assert textx.get_location(expected) == textx.get_location(observed), path
+
+        for field in NODE_FIELDS[expected.__class__.__name__]:
+            compare_trees(getattr(expected, field), getattr(observed, field), f"{path}.{field}")
+
+    elif isinstance(expected, list):
+        assert len(expected) == len(observed), path
+
+        for i, pair in enumerate(zip(expected, observed)):
+            compare_trees(*pair, f"{path}[{i}]")
+
+    else:
+        assert expected == observed, path
+
+
+def synth_module (  # pylint: disable=R0914
+    rng: random.Random,
+    ) -> str:
+    """
+Generate one random module which exercises each rule in the grammar,
+with varied whitespace, comments, quoting, and number formats.
+    """
+    def ws () -> str:
+        return rng.choice([ " ", "\n", "\n  ", "\t", "  // note: 'x' \"y\"\n ", "\r\n" ])
+
+    def string () -> str:
+        return rng.choice([ '"plain"', '"say \\"hi\\""', "'single'", "'it\\'s'", '""', '"http://x.y/z"' ])
+
+    def number () -> str:
+        return rng.choice([ "1", "250", "+3", "1.5", "2.", ".25", "1e2", "3.5E-1" ])
+
+    def op () -> str:
+        mod: str = rng.choice([ "", f":{ws()}{string()}" ])
+        dur: str = f"TIME{ws()}({number()}{ws()}{rng.choice([ 'second', 'minute', 'hour', 'day', 'month', 'year' ])})"  # pylint: disable=C0301
+
+        return rng.choice([
+            f"NOTE:{ws()}{string()}",
+            "TRANSFER pot",
+            f"ADD salt{ws()}({number()}{rng.choice([ '', ' g', ' kg', ' ml', ' l' ])}){rng.choice([ '', ': ' + string() ])}",  # pylint: disable=C0301
+            f"ACTION spoon{mod} UNTIL: {string()} {dur}",
+            f"WAIT{mod} UNTIL:{ws()}{string()} {dur}",
+            f"STORE pot{mod} UPTO ({number()} day)",
+            f"HEAT pot{mod} UNTIL: {string()} {dur}",
+            f"CHILL pot{mod} UNTIL: {string()} {dur}",
+            f"{rng.choice([ 'BAKE', 'BROIL', 'ROAST', 'TOAST' ])} pot{mod} AT: {number()} C UNTIL: {string()} {dur}",  # pylint: disable=C0301
+        ])
+
+    closures: list = []
+
+    for i in range(rng.randint(1, 3)):
+        parts: list = [ f"CLOSURE: {string()}" ]
+
+        if rng.random() < 0.5:
+            parts.append("AS a, b,c")
+
+        if rng.random() < 0.5:
+            parts.append(f"TEXT: {string()}")
+
+        if rng.random() < 0.5:
+            parts.append("KEYWORDS: k1")
+
+        parts.append(f"CONTAINER pot: {string()}")
+        parts.append(f"TOOL spoon :{string()}")
+        parts.append(f"INGREDIENT salt: {string()}")
+
+        if rng.random() < 0.3:
+            parts.append(f"USE other_{i}: {string()}")
+
+        for _ in range(rng.randint(1, 2)):
+            activities: list = [
+                f"ACTIVITY: {string()}{ws()}" + ws().join([ op() for _ in range(rng.randint(1, 4)) ])
+                for _ in range(rng.randint(1, 3))
+            ]
+
+            parts.append("FOCUS pot" + ws() + ws().join(activities))
+
+        if rng.random() < 0.3:
+            parts.append(f"RATIO: {string()} = salt, mix [ a , b ],c")
+
+        parts.append(f"YIELDS prod_{i} ({number()} g){rng.choice([ '', ' INTERMEDIATE' ])}")
+        closures.append(ws().join(parts))
+
+    meta: list = [
+        rng.choice([ "AUTHOR:", "UPDATED:", "LICENSE:", "POST:", "CITE:" ]) + ws() + string()
+        for _ in range(rng.randint(1, 3))
+    ]
+
+    return rng.choice([ "", "// header\n" ]) + ws().join([
+        f"TITLE: {string()}",
+        f"TEXT: {string()}",
+        *meta,
+        *closures,
+    ]) + rng.choice([ "", "\n", "\n// trailer" ])
+
+
+def test_parser_examples (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The fast parser produces the same parse tree and interpreted model as
+`textx` for every example, both in two passes and in a single pass.
+    """
+    fast_dsl: bwyd.Bwyd = bwyd.Bwyd(parser = "fast")
+    textx_dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    for bwyd_path in sorted(EXAMPLES_DIR.glob("*.bwyd")):
+        if debug:
+            print(bwyd_path.name)
+
+        expected: bwyd.Module = textx_dsl.parse(bwyd_path)
+        observed: bwyd.Module = fast_dsl.parse(bwyd_path)
+        compare_trees(expected.parse_tree, observed.parse_tree)
+
+        expected.interpret()
+        observed.interpret()
+        assert observed.get_model() == expected.get_model()
+
+        # single-pass interpretation, without keeping the parse tree
+        single: bwyd.Module = fast_dsl.load(bwyd_path)
+        assert single.parse_tree is None
+        assert single.get_model() == expected.get_model()
+
+
+def test_parser_synthetic (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The fast parser agrees with `textx` on a synthetic corpus, including
+on which truncated inputs get rejected.
+    """
+    meta_model: typing.Any = META_MODEL_CACHE.get()
+    rng: random.Random = random.Random(1234)
+
+    for _ in range(200):
+        text: str = synth_module(rng)
+
+        if debug:
+            print(text)
+
+        compare_trees(meta_model.model_from_str(text), FastParser(text).parse())
+
+        # both parsers must also agree on truncated inputs
+        cut_text: str = text[:rng.randint(0, len(text) - 1)]
+
+        try:
+            expected: typing.Any = meta_model.model_from_str(cut_text)
+        except textx.exceptions.TextXSyntaxError:
+            expected = None
+
+        try:
+            observed: typing.Any = FastParser(cut_text).parse()
+        except bwyd.BwydParserError:
+            observed = None
+
+        assert (expected is None) == (observed is None), cut_text
+
+        if expected is not None:
+            compare_trees(expected, observed)
+
+
+if __name__ == "__main__":
+    test_parser_examples(debug = True)
+    test_parser_synthetic(debug = True)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * ratio storage
+  * ratio solver
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import contextlib
+import io
+import math
+import pathlib
+import tempfile
+
+import bwyd  # pylint: disable=C0413,E0401
+from bwyd import ratio  # pylint: disable=C0413,E0401
+from bwyd.dsl import PARSERS  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def test_ratio (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Parse a ratio with declared weights using each parser, then solve for
+every part given the flour, and check the amounts added against it.
+    """
+    src_text: str = (EXAMPLES_DIR / "applesauce_muffins.bwyd").read_text(encoding = "utf-8")
+
+    # the weights from the comment above this ratio: 2 : 2 : 1 : 1
+    src_text = src_text.replace("flours [", "2 flours [").replace("liquid [", "2 liquid [")
+    src_text = src_text.replace("egg,\n\t   avocado_oil", "1 egg,\n\t   1.0 avocado_oil")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bwyd_path: pathlib.Path = pathlib.Path(tmp_dir) / "muffins.bwyd"
+        bwyd_path.write_text(src_text, encoding = "utf-8")
+
+        for parser in PARSERS:
+            # validation reports unused tools on stdout
+            with contextlib.redirect_stdout(io.StringIO()):
+                module: bwyd.Module = bwyd.Bwyd(parser = parser).load(bwyd_path)
+
+            closure: bwyd.Closure = module.closures["prep batter"]
+            batter: ratio.Ratio = closure.ratio  # type: ignore
+
+            if debug:
+                print(parser, batter)
+
+            assert [ ( part.symbol, part.weight, ) for part in batter.parts ] == [
+                ( "flours", 2.0, ), ( "liquid", 2.0, ), ( "egg", 1.0, ), ( "avocado_oil", 1.0, ),
+            ]
+
+            assert batter.get_part("chia_seeds").symbol == "flours"
+            assert batter.percentages("flour")["egg"] == 50.0
+
+    # one amount, or many amounts at once
+    assert batter.solve("flours", 500.0)["avocado_oil"] == 250.0
+
+    solved: dict = batter.solve("egg", [ 50.0, 100.0, 150.0, ])
+    assert [ float(amount) for amount in solved["liquid"] ] == [ 100.0, 200.0, 300.0, ]
+
+    # the muffins add less flour than the ratio suggests
+    deviations: dict = closure.check_ratio(module.converter)
+
+    if debug:
+        print(closure.get_part_amounts(module.converter), deviations)
+
+    assert deviations["flours"] < 0.0 < deviations["liquid"]
+
+    # scale the batter by its flour
+    scaled: bwyd.Module = module.scale_ratio("prep batter", "flours", 766.0)
+    part_amounts: dict = scaled.closures["prep batter"].get_part_amounts(module.converter)
+
+    assert math.isclose(part_amounts["flours"], 766.0)
+    assert scaled.closures["prep batter"].products[0].amount.amount == 2.0
+
+
+def test_ratio_undeclared (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Without declared weights, the solver uses the amounts which the
+closure adds.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    # validation reports unused tools on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        module: bwyd.Module = dsl.load(EXAMPLES_DIR / "frozen_gnocchi.bwyd")
+
+    closure: bwyd.Closure = module.closures["gnocchi dough"]
+    dough: ratio.Ratio = closure.ratio  # type: ignore
+
+    assert not dough.is_declared()
+
+    weights: dict = dough.get_weights(closure.get_part_amounts(module.converter))
+
+    if debug:
+        print(weights)
+
+    assert weights == { "starch": 590.0 }
+    assert dough.solve("flour", 1180.0, weights = weights) == { "starch": 1180.0 }
+
+
+if __name__ == "__main__":
+    test_ratio(debug = True)
+    test_ratio_undeclared(debug = True)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * recipe scaling
+  * scaling a product which yields nothing
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import contextlib
+import io
+import pathlib
+import tempfile
+
+import bwyd  # pylint: disable=C0413,E0401
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+
+def test_scale (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Scale a module to a different yield, which propagates through `USE`
+to the closure that produces the batter, and shares the unchanged
+structure with the original.
+    """
+    dsl: bwyd.Bwyd = bwyd.Bwyd()
+
+    # validation reports unused tools on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        module: bwyd.Module = dsl.load(EXAMPLES_DIR / "applesauce_muffins.bwyd")
+
+    exp_model: dict = module.get_model()
+    scaled: bwyd.Module = module.scale_to("applesauce_muffins", 22)
+
+    if debug:
+        print(scaled.total_yields())
+        print(list(scaled.get_aggregates().ingredient_amounts))
+
+    assert scaled.total_yields() == [ "22 applesauce muffins" ]
+
+    prep: bwyd.Closure = scaled.closures["prep batter"]
+    assert prep.products[0].amount.amount == 2.0
+
+    ingredients: dict = {
+        entity.symbol: measure.amount
+        for entity, measure in scaled.iter_ingredients()
+    }
+
+    assert ingredients["sugar"] == 122.0
+    assert ingredients["egg"] == 4.0
+
+    # unchanged structure is shared, not copied
+    orig: bwyd.Closure = module.closures["prep batter"]
+    assert prep.containers is orig.containers
+    assert prep.foci[0].container is orig.foci[0].container
+
+    # while the original module stays as it was
+    assert module.get_model() == exp_model
+    assert module.total_yields() == [ "11 applesauce muffins" ]
+
+    try:
+        module.scale(0.0)
+        assert False, "scaled by zero"
+    except ValueError:
+        pass
+
+
+def test_scale_zero_yield (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Scaling to a product which yields an amount of zero fails with an
+error which names the product, rather than dividing by zero.
+    """
+    text: str = (EXAMPLES_DIR / "applesauce_muffins.bwyd").read_text(encoding = "utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bwyd_path: pathlib.Path = pathlib.Path(tmp_dir) / "zero.bwyd"
+        bwyd_path.write_text(
+            text.replace("YIELDS applesauce_muffins (11)", "YIELDS applesauce_muffins (0)"),
+            encoding = "utf-8",
+        )
+
+        # validation reports unused tools on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            module: bwyd.Module = bwyd.Bwyd().load(bwyd_path)
+
+    try:
+        module.scale_to("applesauce_muffins", 22)
+        assert False, "scaled from a zero yield"
+    except ValueError as ex:
+        if debug:
+            print(ex)
+
+        assert "applesauce_muffins" in str(ex)
+
+
+if __name__ == "__main__":
+    test_scale(debug = True)
+    test_scale_zero_yield(debug = True)
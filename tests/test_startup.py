@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+unit tests:
+
+  * modules loaded at startup
+  * template bytecode cache
+
+see copyright/license https://github.com/DerwenAI/bwyd/README.md
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+EXAMPLES_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent / "examples"
+
+# dependencies which only rendering, graphs, or the kernel should load
+DEFERRED_MODULES: list = [
+    "inflect",
+    "ipykernel",
+    "jinja2",
+    "minify_html",
+    "numpy",
+    "PIL",
+    "rdflib",
+    "requests_cache",
+    "spdx_tools",
+]
+
+# dependencies which get loaded intentionally, but only to validate the
+# `LICENSE` of a module
+VALIDATION_MODULES: list = [
+    "spdx_license_list",
+    "spdx_tools",
+]
+
+PROBE: str = """
+import contextlib, io, json, pathlib, sys
+
+from bwyd import Bwyd
+loaded_import = [ name for name in {deferred} if name in sys.modules ]
+
+# validation reports unused tools on stdout
+with contextlib.redirect_stdout(io.StringIO()):
+    module = Bwyd().load(pathlib.Path({path!r}))
+
+loaded_load = [ name for name in {deferred} if name in sys.modules ]
+
+print(json.dumps([ loaded_import, loaded_load, module.spdx_id ]))
+"""
+
+
+def run_probe (
+    ) -> list:
+    """
+Import the package and load one module in a fresh interpreter, with a
+`LICENSE` so that its validation gets exercised too.
+    """
+    code: str = PROBE.format(
+        deferred = DEFERRED_MODULES,
+        path = str(EXAMPLES_DIR / "applesauce_muffins.bwyd"),
+    )
+
+    result: subprocess.CompletedProcess = subprocess.run(
+        [ sys.executable, "-c", code ],
+        capture_output = True,
+        check = True,
+        text = True,
+    )
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_startup (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+Fail if importing the parser or loading a module starts loading the
+dependencies which should stay deferred; see `bench/startup.py` for
+the wall-clock timings.
+    """
+    loaded_import, loaded_load, spdx_id = run_probe()
+
+    if debug:
+        print(loaded_import, loaded_load, spdx_id)
+
+    assert spdx_id is not None
+    assert loaded_import == []
+    assert sorted(loaded_load) == sorted(set(DEFERRED_MODULES) & set(VALIDATION_MODULES))
+
+
+def test_template_cache (
+    *,
+    debug: bool = False,
+    ) -> None:
+    """
+The first process to load the templates compiles them into the
+bytecode cache, and later processes load them from there.
+    """
+    code: str = "from bwyd.resources import get_page_template, get_index_template; get_page_template(); get_index_template()"  # pylint: disable=C0301
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env: dict = { **os.environ, "BWYD_JINJA_CACHE": tmp_dir }
+        subprocess.run([ sys.executable, "-c", code ], env = env, check = True)
+
+        cached: list = sorted(pathlib.Path(tmp_dir).iterdir())
+
+        if debug:
+            print(cached)
+
+        assert len(cached) == 2
+
+        # loading again reuses the same entries
+        subprocess.run([ sys.executable, "-c", code ], env = env, check = True)
+        assert sorted(pathlib.Path(tmp_dir).iterdir()) == cached
+
+
+if __name__ == "__main__":
+    test_startup(debug = True)
+    test_template_cache(debug = True)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Watch a corpus of Bywd modules, re-rendering HTML as sources get edited.
+"""
+
+import pathlib
+
+from icecream import ic
+
+import bwyd
+
+
+if __name__ == "__main__":
+    dsl: bwyd.Bwyd = bwyd.Bwyd(
+        config_path = pathlib.Path("config.toml"),
+    )
+
+    corpus: bwyd.Corpus = dsl.build_corpus()
+    dir_path: pathlib.Path = pathlib.Path("examples")
+
+    try:
+        corpus.watch(
+            dir_path,
+            #glob = "potato*.bwyd",
+            cache = corpus.get_module_cache(),
+            on_build = ic,
+            debug = False, # True
+        )
+    except KeyboardInterrupt:
+        pass